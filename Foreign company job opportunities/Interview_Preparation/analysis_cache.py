@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+分析结果缓存
+以输入内容的稳定哈希为键，把技能分析、技能差距和学习计划的结果缓存到磁盘，
+按总大小做LRU淘汰；岗位按内容分桶缓存部分聚合值，只有变化的桶需要重新计算。
+键中还包含计算逻辑和数据文件（薪资解析、技能分类、学习资源目录等）的指纹，
+这些文件改动后旧缓存自动失效
+"""
+
+import hashlib
+import json
+import os
+import time
+import zlib
+from typing import List, Dict, Set, Tuple
+
+from salary_parser import parse_salary
+from shanghai_data_jobs_scraper import (
+    summarize_skill_analysis, identify_skill_gaps, generate_learning_plan, simulate_job_listings
+)
+from skill_resources import SKILL_RESOURCES_FILE
+
+
+# 缓存格式变化时递增，使旧缓存全部失效
+CACHE_VERSION = 2
+
+_MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+# 缓存结果依赖的代码和数据文件，内容变化时缓存键随之变化
+FINGERPRINT_FILES = [
+    os.path.join(_MODULE_DIR, name)
+    for name in ("salary_parser.py", "skill_taxonomy.py", "skill_resources.py", "shanghai_data_jobs_scraper.py")
+] + [SKILL_RESOURCES_FILE]
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".analysis_cache")
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# 岗位按内容哈希分到的桶数
+DEFAULT_BUCKETS = 64
+
+
+def stable_hash(obj) -> str:
+    """
+    计算对象的稳定哈希（与字典键顺序、集合元素顺序无关）
+
+    Args:
+        obj: 可JSON序列化的对象，集合会先排序
+
+    Returns:
+        十六进制 sha256 摘要
+    """
+    def default(value):
+        if isinstance(value, (set, frozenset)):
+            return sorted(value)
+        raise TypeError(f"无法序列化的类型: {type(value).__name__}")
+
+    payload = json.dumps([CACHE_VERSION, code_fingerprint(), obj], sort_keys=True, ensure_ascii=False, default=default)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+_code_fingerprint = None
+
+
+def code_fingerprint() -> str:
+    """FINGERPRINT_FILES 内容的哈希（每个进程只计算一次），缺失的文件按空内容计"""
+    global _code_fingerprint
+    if _code_fingerprint is None:
+        digest = hashlib.sha256()
+        for path in FINGERPRINT_FILES:
+            digest.update(os.path.basename(path).encode("utf-8") + b"\0")
+            try:
+                with open(path, 'rb') as f:
+                    digest.update(f.read())
+            except FileNotFoundError:
+                pass
+            digest.update(b"\0")
+        _code_fingerprint = digest.hexdigest()[:16]
+    return _code_fingerprint
+
+
+class AnalysisCache:
+    """
+    基于文件的内容寻址缓存
+
+    每个键对应 cache_dir 下的一个JSON文件；读取时更新文件修改时间，
+    写入后总大小超过 max_bytes 时按修改时间从旧到新淘汰。
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(cache_dir, exist_ok=True)
+        self._total_bytes = sum(size for _, _, size in self._entries())
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _entries(self) -> List[Tuple[float, str, int]]:
+        """返回 (修改时间, 路径, 大小) 列表"""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, path, stat.st_size))
+        return entries
+
+    def get(self, key: str):
+        """读取缓存，未命中返回None"""
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                value = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.misses += 1
+            return None
+        os.utime(path)
+        self.hits += 1
+        return value
+
+    def put(self, key: str, value):
+        """写入缓存（先写临时文件再原子替换），必要时淘汰最久未使用的条目"""
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(value, f, ensure_ascii=False)
+        old_size = os.path.getsize(path) if os.path.exists(path) else 0
+        os.replace(tmp_path, path)
+        self._total_bytes += os.path.getsize(path) - old_size
+
+        if self._total_bytes > self.max_bytes:
+            self._evict()
+
+    def _evict(self):
+        """按修改时间从旧到新删除，直到总大小不超过上限"""
+        entries = sorted(self._entries())
+        total = sum(size for _, _, size in entries)
+        for _, path, size in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+        self._total_bytes = total
+
+    def clear(self):
+        """清空缓存"""
+        for _, path, _ in self._entries():
+            os.remove(path)
+        self._total_bytes = 0
+
+
+def _bucket_partial(jobs: List[Dict]) -> Dict:
+    """计算一个桶内岗位的部分聚合值（技能计数 + 薪资聚合）"""
+    skill_count = {}
+    salary = [0, 0, 0, None, None]
+    for job in jobs:
+        for skill in job.get("skills", []):
+            skill_count[skill] = skill_count.get(skill, 0) + 1
+        parsed = parse_salary(job.get("salary_range", ""))
+        if parsed:
+            low, high, _ = parsed
+            salary[0] += 1
+            salary[1] += low
+            salary[2] += high
+            salary[3] = low if salary[3] is None else min(salary[3], low)
+            salary[4] = high if salary[4] is None else max(salary[4], high)
+    return {"jobs": len(jobs), "skills": skill_count, "salary": salary}
+
+
+def _first_appearance_order(jobs: List[Dict], skills: Set[str]) -> Dict[str, int]:
+    """
+    技能在岗位列表中的首次出现顺序
+
+    所有技能都出现过之后立即停止扫描，通常只需要读前面一小部分岗位。
+    """
+    order = {}
+    for job in jobs:
+        for skill in job.get("skills", []):
+            if skill not in order:
+                order[skill] = len(order)
+        if len(order) == len(skills):
+            break
+    return order
+
+
+def cached_skill_analysis(jobs: List[Dict], cache: AnalysisCache, buckets: int = DEFAULT_BUCKETS) -> Dict:
+    """
+    带缓存的 analyze_skill_requirements
+
+    岗位按 (skills, salary_range) 的内容哈希分桶，每个桶的部分聚合值以桶内容的哈希
+    为键缓存。新增/修改少量岗位时只有对应的桶需要重新计算，其余桶直接读缓存；
+    所有桶都未变化时直接返回整体结果。返回值与 analyze_skill_requirements 一致。
+    """
+    # 每个岗位只取参与计算的字段拼成一条记录（\x1f 分隔技能，\x1e 分隔薪资）
+    records = ["\x1f".join(job.get("skills", [])) + "\x1e" + job.get("salary_range", "") for job in jobs]
+
+    # 整体结果的键覆盖全部岗位内容及其顺序（顺序会影响同频技能的排列）
+    version = f"{CACHE_VERSION}-{code_fingerprint()}"
+    result_key = f"skill-analysis-{version}-" + hashlib.sha256("\n".join(records).encode("utf-8")).hexdigest()
+    result = cache.get(result_key)
+    if result is not None:
+        return result
+
+    # 桶的键只取决于桶内岗位内容（与顺序无关）
+    bucket_jobs = [[] for _ in range(buckets)]
+    for record, job in zip(records, jobs):
+        bucket_jobs[zlib.crc32(record.encode("utf-8")) % buckets].append((record, job))
+    bucket_keys = []
+    for bucket in bucket_jobs:
+        bucket.sort(key=lambda item: item[0])
+        digest = hashlib.sha256("\n".join(record for record, _ in bucket).encode("utf-8")).hexdigest()
+        bucket_keys.append(f"skills-bucket-{version}-{digest}")
+
+    total_jobs = 0
+    skill_count = {}
+    salary_n, salary_sum_low, salary_sum_high, salary_min_low, salary_max_high = 0, 0, 0, None, None
+    for key, bucket in zip(bucket_keys, bucket_jobs):
+        partial = cache.get(key)
+        if partial is None:
+            partial = _bucket_partial([job for _, job in bucket])
+            cache.put(key, partial)
+
+        total_jobs += partial["jobs"]
+        for skill, count in partial["skills"].items():
+            skill_count[skill] = skill_count.get(skill, 0) + count
+        n, sum_low, sum_high, min_low, max_high = partial["salary"]
+        if n:
+            salary_n += n
+            salary_sum_low += sum_low
+            salary_sum_high += sum_high
+            salary_min_low = min_low if salary_min_low is None else min(salary_min_low, min_low)
+            salary_max_high = max_high if salary_max_high is None else max(salary_max_high, max_high)
+
+    order = _first_appearance_order(jobs, set(skill_count))
+    skill_count = {skill: skill_count[skill] for skill in sorted(skill_count, key=order.__getitem__)}
+
+    result = summarize_skill_analysis(
+        total_jobs, skill_count,
+        (salary_n, salary_sum_low, salary_sum_high, salary_min_low, salary_max_high)
+    )
+    cache.put(result_key, result)
+    return result
+
+
+def cached_skill_gaps(current_skills: Set[str], target_skills: Dict, cache: AnalysisCache) -> Dict:
+    """带缓存的 identify_skill_gaps"""
+    key = "skill-gaps-" + stable_hash([current_skills, target_skills])
+    gaps = cache.get(key)
+    if gaps is None:
+        gaps = identify_skill_gaps(current_skills, target_skills)
+        cache.put(key, gaps)
+    else:
+        # JSON中的元组读回后是列表，还原成与原函数一致的 (技能, 频率) 元组
+        gaps["have_skills"] = [tuple(item) for item in gaps["have_skills"]]
+        gaps["missing_skills"] = [tuple(item) for item in gaps["missing_skills"]]
+    return gaps
+
+
+def cached_learning_plan(skill_gaps: Dict, timeline_months: int, cache: AnalysisCache) -> Dict:
+    """带缓存的 generate_learning_plan"""
+    key = "learning-plan-" + stable_hash([skill_gaps["missing_skills"], timeline_months])
+    plan = cache.get(key)
+    if plan is None:
+        plan = generate_learning_plan(skill_gaps, timeline_months=timeline_months)
+        cache.put(key, plan)
+    return plan
+
+
+def run_cached_analysis(jobs: List[Dict], current_skills: Set[str], timeline_months: int,
+                        cache: AnalysisCache = None) -> Tuple[Dict, Dict, Dict]:
+    """
+    带缓存地依次执行技能分析、技能差距识别和学习计划生成
+
+    Returns:
+        (skill_analysis, skill_gaps, learning_plan)
+    """
+    cache = cache if cache is not None else AnalysisCache()
+    skill_analysis = cached_skill_analysis(jobs, cache)
+    skill_gaps = cached_skill_gaps(current_skills, skill_analysis["skill_frequency"], cache)
+    learning_plan = cached_learning_plan(skill_gaps, timeline_months, cache)
+    return skill_analysis, skill_gaps, learning_plan
+
+
+# ======================================================================================
+# 性能测试
+# ======================================================================================
+
+def benchmark_cache(n: int = 200_000, cache_dir: str = None) -> Dict:
+    """测量冷启动、完全命中和少量岗位变化三种情况下的耗时"""
+    import tempfile
+    from shanghai_data_jobs_scraper import analyze_skill_requirements
+
+    samples = simulate_job_listings()
+    jobs = [dict(samples[i % len(samples)], skills=samples[i % len(samples)]["skills"] + [f"Skill {i % 500}"])
+            for i in range(n)]
+    current_skills = {"SQL", "Python", "Spark", "ETL"}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = AnalysisCache(cache_dir or tmp)
+        timings = {}
+
+        start = time.perf_counter()
+        analysis = analyze_skill_requirements(jobs)
+        generate_learning_plan(identify_skill_gaps(current_skills, analysis["skill_frequency"]), 6)
+        timings["uncached_seconds"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        run_cached_analysis(jobs, current_skills, 6, cache)
+        timings["cold_seconds"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        run_cached_analysis(jobs, current_skills, 6, cache)
+        timings["warm_seconds"] = time.perf_counter() - start
+
+        jobs[n // 2] = dict(jobs[n // 2], skills=["Kafka", "Flink"])
+        start = time.perf_counter()
+        result, _, _ = run_cached_analysis(jobs, current_skills, 6, cache)
+        timings["one_changed_seconds"] = time.perf_counter() - start
+
+        assert result == analyze_skill_requirements(jobs)
+
+    return {"postings": n, **{k: round(v, 3) for k, v in timings.items()}}
+
+
+def main():
+    """主函数：运行缓存性能测试"""
+    print("⏱️  分析缓存性能测试（200,000个岗位）...")
+    result = benchmark_cache()
+    print(f"  不使用缓存: {result['uncached_seconds']}s")
+    print(f"  冷启动: {result['cold_seconds']}s")
+    print(f"  输入未变化: {result['warm_seconds']}s")
+    print(f"  1个岗位变化: {result['one_changed_seconds']}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+分析报告的流式读写
+报告文件为JSONL格式：第一行是摘要头（生成时间、技能分析、学习计划），
+之后每行一个岗位；写入时逐个岗位编码，读取时可以只读摘要或逐个迭代岗位
+"""
+
+import json
+import os
+import time
+from datetime import datetime
+from typing import Dict, Iterable, Iterator
+
+
+# 报告格式版本，写在摘要头中，用于区分旧版整体JSON报告
+REPORT_FORMAT = "analysis-report/jsonl-v1"
+
+# 复用同一个编码器，避免每条岗位都重新创建
+_encoder = json.JSONEncoder(ensure_ascii=False)
+
+
+def write_analysis_report(filename: str, jobs: Iterable[Dict], skill_analysis: Dict, learning_plan: Dict,
+                          generated_at: str = None) -> int:
+    """
+    流式写入分析报告
+
+    Args:
+        filename: 输出文件路径（建议使用 .jsonl 扩展名）
+        jobs: 岗位的可迭代对象，可以是生成器，写入时逐个编码
+        skill_analysis: 技能分析结果
+        learning_plan: 学习计划
+
+    Returns:
+        写入的岗位数
+    """
+    header = {
+        "report_format": REPORT_FORMAT,
+        "generated_at": generated_at or datetime.now().isoformat(),
+        "location": "Shanghai, China",
+        "focus": "Foreign Company Data Positions",
+        "skill_analysis": skill_analysis,
+        "learning_plan": learning_plan,
+    }
+
+    written = 0
+    with open(filename, 'w', encoding='utf-8') as f:
+        f.write(_encoder.encode(header) + "\n")
+        for job in jobs:
+            f.write(_encoder.encode(job) + "\n")
+            written += 1
+    return written
+
+
+def _is_streaming_report(first_line: str) -> bool:
+    """第一行是否为新版报告的摘要头"""
+    try:
+        header = json.loads(first_line)
+    except json.JSONDecodeError:
+        return False
+    return isinstance(header, dict) and header.get("report_format") == REPORT_FORMAT
+
+
+def read_report_summary(filename: str) -> Dict:
+    """
+    只读取报告的摘要部分（不解析岗位）
+
+    兼容旧版整体JSON报告：此时会整体加载后去掉 job_listings。
+    """
+    with open(filename, 'r', encoding='utf-8') as f:
+        first_line = f.readline()
+        if _is_streaming_report(first_line):
+            return json.loads(first_line)
+        f.seek(0)
+        report = json.load(f)
+    report.pop("job_listings", None)
+    return report
+
+
+def iter_report_postings(filename: str) -> Iterator[Dict]:
+    """
+    逐个读取报告中的岗位，每次只在内存中保留一条
+
+    兼容旧版整体JSON报告（整体加载后逐个返回）。
+    """
+    with open(filename, 'r', encoding='utf-8') as f:
+        first_line = f.readline()
+        if not _is_streaming_report(first_line):
+            f.seek(0)
+            yield from json.load(f).get("job_listings", [])
+            return
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+# ======================================================================================
+# 性能测试
+# ======================================================================================
+
+def _generate_jobs(n: int) -> Iterator[Dict]:
+    """按需生成n个岗位（在模拟岗位基础上改写描述，使每条内容不同）"""
+    from shanghai_data_jobs_scraper import simulate_job_listings
+
+    samples = simulate_job_listings()
+    for i in range(n):
+        job = dict(samples[i % len(samples)])
+        job["job_description"] += f"\nJob ID: {i}"
+        yield job
+
+
+def benchmark_report_writer(n: int = 100_000) -> Dict:
+    """对比 整体 json.dump(indent=2) 与流式写入的耗时和内存峰值（均从岗位生成开始计算）"""
+    import tempfile
+    import tracemalloc
+    from shanghai_data_jobs_scraper import simulate_job_listings, analyze_skill_requirements, identify_skill_gaps
+    from shanghai_data_jobs_scraper import generate_learning_plan
+
+    skill_analysis = analyze_skill_requirements(simulate_job_listings())
+    learning_plan = generate_learning_plan(identify_skill_gaps({"SQL", "Hive"}, skill_analysis["skill_frequency"]))
+    result = {"postings": n}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_file = os.path.join(tmp, "report.json")
+        tracemalloc.start()
+        start = time.perf_counter()
+        report = {
+            "generated_at": datetime.now().isoformat(),
+            "location": "Shanghai, China",
+            "focus": "Foreign Company Data Positions",
+            "job_listings": list(_generate_jobs(n)),
+            "skill_analysis": skill_analysis,
+            "learning_plan": learning_plan
+        }
+        with open(legacy_file, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        result["legacy_seconds"] = round(time.perf_counter() - start, 3)
+        result["legacy_peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 1024 / 1024, 1)
+        tracemalloc.stop()
+        del report
+
+        stream_file = os.path.join(tmp, "report.jsonl")
+        tracemalloc.start()
+        start = time.perf_counter()
+        write_analysis_report(stream_file, _generate_jobs(n), skill_analysis, learning_plan)
+        result["stream_seconds"] = round(time.perf_counter() - start, 3)
+        result["stream_peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 1024 / 1024, 1)
+        tracemalloc.stop()
+
+        start = time.perf_counter()
+        read_report_summary(legacy_file)
+        result["legacy_summary_seconds"] = round(time.perf_counter() - start, 3)
+        start = time.perf_counter()
+        read_report_summary(stream_file)
+        result["stream_summary_seconds"] = round(time.perf_counter() - start, 4)
+
+        assert sum(1 for _ in iter_report_postings(stream_file)) == n
+
+    return result
+
+
+def main():
+    """主函数：运行写入性能测试"""
+    print("⏱️  分析报告写入性能测试（100,000个岗位）...")
+    result = benchmark_report_writer()
+    print(f"  整体写入: {result['legacy_seconds']}s，内存峰值 {result['legacy_peak_mb']} MB")
+    print(f"  流式写入: {result['stream_seconds']}s，内存峰值 {result['stream_peak_mb']} MB")
+    print(f"  只读摘要: 旧格式 {result['legacy_summary_seconds']}s / 新格式 {result['stream_summary_seconds']}s")
+
+
+if __name__ == "__main__":
+    main()
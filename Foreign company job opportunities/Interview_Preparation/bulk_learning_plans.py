@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+批量学习计划生成
+把数千个候选人 × 多个时间线的学习计划分块提交到进程池并行生成，
+生成完成的计划立即以JSONL格式写入磁盘，内存中只保留正在处理的分块
+"""
+
+import json
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import List, Dict, Iterable, Iterator, Tuple
+
+from shanghai_data_jobs_scraper import generate_learning_plan, identify_skill_gaps
+from skill_resources import get_skill_resource_catalog
+
+
+# 每个任务分块包含的 (候选人, 时间线) 数
+DEFAULT_CHUNK_SIZE = 50
+
+
+def _init_worker():
+    """工作进程初始化：加载一次技能资源目录，供该进程内的所有任务共用（任务参数中不携带资源表）"""
+    get_skill_resource_catalog()
+
+
+def _generate_chunk(chunk: List[Tuple[str, Dict, int]]) -> List[str]:
+    """
+    生成一个分块内的学习计划，在工作进程内直接序列化为JSON行
+
+    Args:
+        chunk: [(候选人ID, 技能差距结果, 时间线月数), ...]
+    """
+    lines = []
+    for profile_id, skill_gaps, timeline in chunk:
+        plan = generate_learning_plan(skill_gaps, timeline_months=timeline)
+        lines.append(json.dumps({"profile_id": profile_id, "timeline_months": timeline, "learning_plan": plan},
+                                ensure_ascii=False))
+    return lines
+
+
+def _chunks(profiles: Iterable[Tuple[str, Dict]], timelines: List[int], chunk_size: int) -> Iterator[List]:
+    """按候选人 × 时间线展开任务并切分成固定大小的分块"""
+    chunk = []
+    for profile_id, skill_gaps in profiles:
+        # 只传递生成计划需要的字段，减少进程间序列化的数据量
+        gaps = {"missing_skills": skill_gaps["missing_skills"]}
+        for timeline in timelines:
+            chunk.append((profile_id, gaps, timeline))
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+def generate_learning_plans_bulk(profiles: Iterable[Tuple[str, Dict]],
+                                 output_file: str,
+                                 timelines: List[int] = (3, 6),
+                                 workers: int = None,
+                                 chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """
+    批量生成学习计划并流式写入JSONL文件
+
+    Args:
+        profiles: (候选人ID, identify_skill_gaps 结果) 的可迭代对象
+        output_file: 输出的JSONL文件路径，每行一个 {profile_id, timeline_months, learning_plan}
+        timelines: 需要生成的时间线（月）
+        workers: 工作进程数，默认为CPU核数；1 表示在当前进程内执行
+        chunk_size: 每个任务分块包含的计划数
+
+    Returns:
+        写入的计划数
+    """
+    workers = workers or os.cpu_count() or 1
+    chunks = _chunks(profiles, list(timelines), chunk_size)
+    written = 0
+
+    with open(output_file, 'w', encoding='utf-8') as f:
+        if workers == 1:
+            _init_worker()
+            for chunk in chunks:
+                for line in _generate_chunk(chunk):
+                    f.write(line + "\n")
+                    written += 1
+            return written
+
+        # 同时在途的分块数限制为工作进程数的2倍，输入再大内存也保持平稳
+        max_pending = workers * 2
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+            pending = set()
+            for chunk in chunks:
+                pending.add(executor.submit(_generate_chunk, chunk))
+                if len(pending) >= max_pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        for line in future.result():
+                            f.write(line + "\n")
+                            written += 1
+            for future in pending:
+                for line in future.result():
+                    f.write(line + "\n")
+                    written += 1
+
+    return written
+
+
+# ======================================================================================
+# 性能测试
+# ======================================================================================
+
+def _random_profiles(n: int, seed: int = 42) -> List[Tuple[str, Dict]]:
+    """生成n个随机候选人的技能差距结果"""
+    from shanghai_data_jobs_scraper import simulate_job_listings, analyze_skill_requirements
+
+    rng = random.Random(seed)
+    target = analyze_skill_requirements(simulate_job_listings())["skill_frequency"]
+    vocabulary = list(target) + ["Hive", "Shell", "Linux", "Hadoop", "Excel"]
+    return [(f"candidate_{i}", identify_skill_gaps(set(rng.sample(vocabulary, 6)), target)) for i in range(n)]
+
+
+def benchmark_scaling(n_profiles: int = 2000, worker_counts: List[int] = (1, 2, 4, 8)) -> List[Dict]:
+    """测量不同工作进程数下批量生成的耗时和加速比"""
+    profiles = _random_profiles(n_profiles)
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for workers in worker_counts:
+            start = time.perf_counter()
+            count = generate_learning_plans_bulk(profiles, os.path.join(tmp, f"plans_{workers}.jsonl"),
+                                                 workers=workers)
+            seconds = time.perf_counter() - start
+            results.append({
+                "workers": workers,
+                "plans": count,
+                "seconds": round(seconds, 3),
+                "speedup": round(results[0]["seconds"] / seconds, 2) if results else 1.0,
+            })
+    return results
+
+
+def main():
+    """主函数：运行扩展性测试"""
+    print(f"⏱️  批量学习计划扩展性测试（2,000人 × 2个时间线，CPU核数: {os.cpu_count()}）...")
+    for result in benchmark_scaling():
+        print(f"  {result['workers']}个进程: {result['seconds']}s（{result['plans']}份计划，加速比 {result['speedup']}x）")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+统一命令行入口
+子命令：crawl（抓取岗位）、analyze（岗位分析）、plan（学习计划）、interview-prep（面试准备）、
+side-hustles（副业分析）、samples（样例数据）。
+每个子命令只在执行时才导入对应模块，查看帮助和不需要 pandas/numpy 的子命令都能快速启动
+"""
+
+import argparse
+import os
+import sys
+
+
+SIDE_HUSTLES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "Part time business")
+
+
+def _output_kwargs(args) -> dict:
+    """没有指定 --output-dir 时使用各脚本自己的默认目录"""
+    kwargs = {"output_dir": args.output_dir} if args.output_dir else {}
+    if getattr(args, "metrics", None):
+        kwargs["metrics_file"] = args.metrics
+    return kwargs
+
+
+def cmd_crawl(args):
+    import asyncio
+    from crawl_frontier import crawl_companies
+    from shanghai_data_jobs_scraper import get_target_companies
+
+    kwargs = {"concurrency": args.concurrency, "politeness_delay": args.politeness_delay}
+    if args.url_template:
+        kwargs["url_template"] = args.url_template
+    if not args.no_cache:
+        from http_cache import HttpCache
+        kwargs["cache"] = HttpCache()
+    output_dir = args.output_dir or "crawl_output"
+    postings_path = asyncio.run(crawl_companies(get_target_companies(), output_dir, **kwargs))
+    print(f"✅ 岗位已保存到: {postings_path}")
+    print(f"   分析: python3 cli.py analyze --postings {postings_path}")
+
+
+def cmd_analyze(args):
+    from shanghai_data_jobs_scraper import main
+    main(args.postings, timeline=args.timeline, fmt=args.format, **_output_kwargs(args))
+
+
+def cmd_plan(args):
+    from shanghai_data_jobs_scraper import main
+    main(args.postings, timeline=args.timeline, plan_only=True, fmt=args.format, **_output_kwargs(args))
+
+
+def cmd_interview_prep(args):
+    if args.questions:
+        from python_interview_questions import run_all_tests
+        run_all_tests(include_pandas=not args.skip_pandas)
+        return
+    from interview_preparation_plan import main
+    main(**_output_kwargs(args))
+
+
+def cmd_side_hustles(args):
+    if SIDE_HUSTLES_DIR not in sys.path:
+        sys.path.insert(0, SIDE_HUSTLES_DIR)
+    from claude_side_hustles_scraper import main
+    main(**_output_kwargs(args))
+
+
+def cmd_samples(args):
+    from sample_data_generator import main
+    main(args.output_dir)
+
+
+def cmd_startup(args):
+    for name, seconds in benchmark_cold_start(repeat=args.repeat).items():
+        print(f"  {name:<28} {seconds * 1000:6.1f} ms")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="cli.py", description="上海外企数据岗位求职工具")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    def add_command(name: str, handler, help_text: str, output_help: str = "输出目录（默认为脚本所在目录）"):
+        sub = subparsers.add_parser(name, help=help_text, description=help_text)
+        sub.add_argument("-o", "--output-dir", help=output_help)
+        sub.set_defaults(handler=handler)
+        return sub
+
+    sub = add_command("crawl", cmd_crawl, "抓取目标公司的岗位列表页（可中断后继续），输出 postings.jsonl",
+                      output_help="检查点和输出目录（默认 crawl_output）")
+    sub.add_argument("--url-template", help="列表页地址模板，含 {slug} 和 {page}（默认见 job_fetcher.DEFAULT_URL_TEMPLATE）")
+    sub.add_argument("--concurrency", type=int, default=8, help="同时进行的请求数")
+    sub.add_argument("--politeness-delay", type=float, default=1.0, help="同一域名两次请求的最小间隔秒数")
+    sub.add_argument("--no-cache", action="store_true", help="不使用HTTP条件请求缓存")
+
+    def add_metrics(sub):
+        sub.add_argument("--metrics", metavar="FILE", help="把各阶段的耗时、CPU时间和内存峰值写入该JSON文件")
+
+    for name, handler, help_text in (
+        ("analyze", cmd_analyze, "分析岗位技能要求，保存分析报告和学习计划"),
+        ("plan", cmd_plan, "只生成文本版学习计划"),
+    ):
+        sub = add_command(name, handler, help_text)
+        add_metrics(sub)
+        sub.add_argument("--postings", help="岗位JSONL文件（如 crawl_frontier 的 postings.jsonl），默认使用模拟数据")
+        sub.add_argument("--timeline", type=int, choices=(3, 6), default=6, help="学习计划月数")
+        sub.add_argument("--format", choices=("text", "markdown", "html"), default="text", help="学习计划文件格式")
+
+    sub = add_command("interview-prep", cmd_interview_prep, "生成面试准备材料")
+    sub.add_argument("--questions", action="store_true", help="改为运行 Python 笔试题库的所有题目")
+    sub.add_argument("--skip-pandas", action="store_true", help="配合 --questions：跳过依赖 pandas 的题目")
+    add_metrics(sub)
+
+    add_metrics(add_command("side-hustles", cmd_side_hustles, "生成 Claude 副业机会分析报告"))
+    add_command("samples", cmd_samples, "生成面试练习用的样例数据（需要 pandas）",
+                output_help="导出CSV的目录（默认只打印预览）")
+
+    sub = subparsers.add_parser("startup", help="测量各子命令的冷启动耗时")
+    sub.add_argument("--repeat", type=int, default=5, help="每个命令运行的次数（取中位数）")
+    sub.set_defaults(handler=cmd_startup)
+    return parser
+
+
+# ======================================================================================
+# 性能测试
+# ======================================================================================
+
+def benchmark_cold_start(repeat: int = 5) -> dict:
+    """
+    在新进程中运行 帮助 和不依赖 pandas/numpy 的子命令，返回每个命令耗时的中位数（秒）
+
+    输出写到临时目录，标准输出丢弃；耗时包含解释器启动
+    """
+    import statistics
+    import subprocess
+    import tempfile
+    import time
+
+    script = os.path.abspath(__file__)
+    with tempfile.TemporaryDirectory() as tmp:
+        commands = {
+            "--help": ["--help"],
+            "analyze": ["analyze", "-o", tmp],
+            "plan": ["plan", "-o", tmp],
+            "interview-prep": ["interview-prep", "-o", tmp],
+            "interview-prep --questions": ["interview-prep", "--questions", "--skip-pandas"],
+            "side-hustles": ["side-hustles", "-o", tmp],
+        }
+        results = {}
+        for name, argv in commands.items():
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                subprocess.run([sys.executable, script, *argv], check=True, stdout=subprocess.DEVNULL)
+                timings.append(time.perf_counter() - start)
+            results[name] = statistics.median(timings)
+    return results
+
+
+def main(argv=None):
+    """主函数：解析命令行并执行子命令"""
+    args = build_parser().parse_args(argv)
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
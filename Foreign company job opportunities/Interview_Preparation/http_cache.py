@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+岗位列表页的HTTP条件请求缓存
+以URL为键把响应体（zlib压缩）、ETag / Last-Modified 和解析后的岗位列表保存到磁盘；
+下次抓取时带 If-None-Match / If-Modified-Since 发起条件请求，
+服务器返回304时直接复用缓存中已解析的岗位，不再下载和解析页面。
+总大小超过上限时按最近使用时间淘汰，每次运行统计命中率和节省的下载字节数
+"""
+
+import hashlib
+import json
+import os
+import time
+import zlib
+from typing import Dict, Optional, Tuple
+
+
+DEFAULT_HTTP_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".http_cache")
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+class HttpCache:
+    """
+    基于文件的HTTP响应缓存
+
+    每个URL一个 .entry 文件：第一行是JSON元数据（url、etag、last_modified、各段长度），
+    之后依次是 zlib 压缩的响应体和 zlib 压缩的解析结果（JSON）。
+    读取时更新文件修改时间，写入后总大小超过 max_bytes 时按修改时间从旧到新淘汰。
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_HTTP_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+        self._total_bytes = sum(size for _, _, size in self._entries())
+        # 元数据的内存副本，避免同一次运行中重复读文件头
+        self._meta: Dict[str, Optional[Dict]] = {}
+        self.reset_stats()
+
+    def reset_stats(self):
+        """清零本次运行的统计"""
+        self.stats = {"requests": 0, "hits": 0, "misses": 0, "bytes_saved": 0, "bytes_downloaded": 0,
+                      "evictions": 0}
+
+    def _path(self, url: str) -> str:
+        return os.path.join(self.cache_dir, hashlib.sha256(url.encode("utf-8")).hexdigest() + ".entry")
+
+    def _entries(self):
+        """返回 (修改时间, 路径, 大小) 列表"""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".entry"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, path, stat.st_size))
+        return entries
+
+    def _read_meta(self, url: str) -> Optional[Dict]:
+        if url not in self._meta:
+            try:
+                with open(self._path(url), 'rb') as f:
+                    meta = json.loads(f.readline())
+                self._meta[url] = meta if meta.get("url") == url else None
+            except (FileNotFoundError, json.JSONDecodeError):
+                self._meta[url] = None
+        return self._meta[url]
+
+    def _read_payload(self, url: str) -> Optional[Tuple[bytes, object]]:
+        """读取 (响应体, 解析结果)，条目不存在或已损坏时返回None"""
+        path = self._path(url)
+        try:
+            with open(path, 'rb') as f:
+                meta = json.loads(f.readline())
+                body = zlib.decompress(f.read(meta["body_compressed"]))
+                parsed_bytes = f.read(meta["parsed_compressed"])
+        except (FileNotFoundError, json.JSONDecodeError, zlib.error, KeyError):
+            return None
+        parsed = json.loads(zlib.decompress(parsed_bytes)) if parsed_bytes else None
+        os.utime(path)
+        return body, parsed
+
+    def validators(self, url: str) -> Dict[str, str]:
+        """条件请求头：If-None-Match / If-Modified-Since（没有缓存时为空）"""
+        meta = self._read_meta(url)
+        headers = {}
+        if meta:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def revalidated(self, url: str) -> Optional[Tuple[bytes, object]]:
+        """
+        服务器返回304：返回缓存的 (响应体, 解析结果) 并计为命中
+
+        缓存条目在请求期间被淘汰时返回None，调用方应重新发起非条件请求。
+        """
+        payload = self._read_payload(url)
+        self.stats["requests"] += 1
+        if payload is None:
+            self._meta.pop(url, None)
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits"] += 1
+        self.stats["bytes_saved"] += len(payload[0])
+        return payload
+
+    def store(self, url: str, headers: Dict[str, str], body: bytes, parsed=None):
+        """
+        保存200响应（headers 为小写键的响应头）并计为未命中
+
+        没有 ETag 和 Last-Modified 的响应无法做条件请求，不缓存。
+        """
+        self.stats["requests"] += 1
+        self.stats["misses"] += 1
+        self.stats["bytes_downloaded"] += len(body)
+        etag, last_modified = headers.get("etag"), headers.get("last-modified")
+        if not etag and not last_modified:
+            return
+
+        body_compressed = zlib.compress(body, 6)
+        parsed_compressed = zlib.compress(json.dumps(parsed, ensure_ascii=False).encode("utf-8"), 6) \
+            if parsed is not None else b""
+        meta = {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "fetched_at": time.time(),
+            "body_bytes": len(body),
+            "body_compressed": len(body_compressed),
+            "parsed_compressed": len(parsed_compressed),
+        }
+
+        path = self._path(url)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(json.dumps(meta, ensure_ascii=False).encode("utf-8") + b"\n")
+            f.write(body_compressed)
+            f.write(parsed_compressed)
+        old_size = os.path.getsize(path) if os.path.exists(path) else 0
+        os.replace(tmp_path, path)
+        self._total_bytes += os.path.getsize(path) - old_size
+        self._meta[url] = meta
+
+        if self._total_bytes > self.max_bytes:
+            self._evict()
+
+    def _evict(self):
+        """按修改时间从旧到新删除，直到总大小降到上限的90%（留出余量，避免每次写入都触发淘汰）"""
+        entries = sorted(self._entries())
+        total = sum(size for _, _, size in entries)
+        target = self.max_bytes * 0.9
+        for _, path, size in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                self.stats["evictions"] += 1
+            except FileNotFoundError:
+                pass
+            total -= size
+        self._total_bytes = total
+        self._meta = {}
+
+    def clear(self):
+        """清空缓存"""
+        for _, path, _ in self._entries():
+            os.remove(path)
+        self._total_bytes = 0
+        self._meta = {}
+
+    def report(self) -> Dict:
+        """本次运行的统计：请求数、命中数、命中率、节省/下载的字节数、淘汰数、缓存总大小"""
+        requests = self.stats["requests"]
+        return {
+            **self.stats,
+            "hit_rate": round(self.stats["hits"] / requests * 100, 1) if requests else 0.0,
+            "cache_bytes": self._total_bytes,
+        }
+
+
+# ======================================================================================
+# 性能测试
+# ======================================================================================
+
+def benchmark_http_cache(changed_fraction: float = 0.1, pages: int = 5, latency: float = 0.02) -> list:
+    """
+    对本地桩服务器连续抓取三次：冷缓存、页面全部未变化、部分公司页面发生变化，
+    返回每次运行的耗时和缓存统计
+    """
+    import asyncio
+    import random
+    import tempfile
+    from job_fetcher import JobSourceFetcher, StubJobServer, company_slug
+    from shanghai_data_jobs_scraper import get_target_companies
+
+    companies = get_target_companies()
+
+    async def run_all(cache_dir: str):
+        server = await StubJobServer(latency=latency, pages=pages).start()
+        cache = HttpCache(cache_dir)
+        runs = []
+        try:
+            for name in ("冷缓存", "页面未变化", f"{changed_fraction:.0%}公司有更新"):
+                if runs and changed_fraction and name != "页面未变化":
+                    for company in random.Random(1).sample(companies, max(1, int(len(companies) * changed_fraction))):
+                        server.touch(company_slug(company["name"]))
+                cache.reset_stats()
+                fetcher = JobSourceFetcher(server.url_template, concurrency=16, per_host=16, rate_per_host=10_000,
+                                           cache=cache)
+                start = time.perf_counter()
+                results = await fetcher.fetch_all(companies)
+                runs.append({
+                    "run": name,
+                    "seconds": round(time.perf_counter() - start, 2),
+                    "jobs": sum(len(result["jobs"]) for result in results),
+                    **cache.report(),
+                })
+        finally:
+            await server.close()
+        return runs
+
+    with tempfile.TemporaryDirectory() as tmp:
+        return asyncio.run(run_all(tmp))
+
+
+def main():
+    """主函数：运行条件请求缓存测试"""
+    print("⏱️  HTTP条件请求缓存测试（本地桩服务器）...")
+    for run in benchmark_http_cache():
+        print(f"  {run['run']}: {run['seconds']}s，{run['jobs']}个岗位，命中率 {run['hit_rate']}%，"
+              f"下载 {run['bytes_downloaded'] / 1024:.0f} KB，节省 {run['bytes_saved'] / 1024:.0f} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,9 +6,17 @@
 """
 
 import json
+import os
 from datetime import datetime
 from typing import List, Dict
 
+from report_renderer import Report
+from stage_metrics import instrumented_run, stage
+
+
+# 默认输出目录：脚本所在目录
+OUTPUT_DIR = os.path.dirname(os.path.abspath(__file__))
+
 
 def get_interview_process() -> Dict:
     """
@@ -1260,26 +1268,28 @@ def generate_interview_study_plan(weeks: int = 8) -> Dict:
     }
 
 
-def save_interview_prep_materials():
+def save_interview_prep_materials(output_dir: str = OUTPUT_DIR):
     """
-    保存所有面试准备材料
+    保存所有面试准备材料到 output_dir/interview_prep_complete.json
     """
-    materials = {
-        "generated_at": datetime.now().isoformat(),
-        "target": "上海外企数据岗位面试",
-        "interview_process": get_interview_process(),
-        "technical_prep": get_technical_interview_prep(),
-        "behavioral_prep": get_behavioral_interview_prep(),
-        "english_prep": get_english_interview_prep(),
-        "study_plans": {
-            "8_week_plan": generate_interview_study_plan(8),
-            "4_week_plan": generate_interview_study_plan(4)
+    with stage("generate"):
+        materials = {
+            "generated_at": datetime.now().isoformat(),
+            "target": "上海外企数据岗位面试",
+            "interview_process": get_interview_process(),
+            "technical_prep": get_technical_interview_prep(),
+            "behavioral_prep": get_behavioral_interview_prep(),
+            "english_prep": get_english_interview_prep(),
+            "study_plans": {
+                "8_week_plan": generate_interview_study_plan(8),
+                "4_week_plan": generate_interview_study_plan(4)
+            }
         }
-    }
 
     # 保存JSON
-    filename = "/Users/boom/Desktop/my_bussiness/Foreign company job opportunities/interview_prep_complete.json"
-    with open(filename, 'w', encoding='utf-8') as f:
+    os.makedirs(output_dir, exist_ok=True)
+    filename = os.path.join(output_dir, "interview_prep_complete.json")
+    with stage("save"), open(filename, 'w', encoding='utf-8') as f:
         json.dump(materials, f, ensure_ascii=False, indent=2)
 
     print(f"✅ 完整面试准备材料已保存到: {filename}")
@@ -1287,81 +1297,82 @@ def save_interview_prep_materials():
     return materials
 
 
-def print_interview_prep_summary(materials: Dict):
+def build_interview_prep_summary(materials: Dict) -> Report:
     """
-    打印面试准备摘要
+    构建面试准备摘要报告（可渲染为 text / Markdown / HTML）
     """
-    print("\n" + "="*100)
-    print("🎯 外企数据岗位面试准备计划 - 上海地区")
-    print("="*100)
-    print(f"生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+    report = Report()
+    report.blank().rule("=")
+    report.heading("🎯 外企数据岗位面试准备计划 - 上海地区", 1)
+    report.rule("=")
+    report.text(f"生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}").blank()
 
     # 面试流程概述
     process = materials['interview_process']
-    print("📋 面试流程概览")
-    print("-"*100)
-    for stage in process['stages'][:3]:  # 显示前3个关键阶段
-        print(f"\n{stage['stage']}")
-        print(f"  时长: {stage['duration']}")
-        print(f"  通过率: {stage.get('pass_rate', 'N/A')}")
-        if 'interview_language' in stage:
-            print(f"  语言: {stage['interview_language']}")
-        print(f"  关键点:")
-        for point in stage['key_points'][:3]:
-            print(f"    • {point}")
+    report.heading("📋 面试流程概览", 2)
+    report.rule("-")
+    for step in process['stages'][:3]:  # 显示前3个关键阶段
+        report.blank().heading(step['stage'], 3)
+        report.text(f"  时长: {step['duration']}")
+        report.text(f"  通过率: {step.get('pass_rate', 'N/A')}")
+        if 'interview_language' in step:
+            report.text(f"  语言: {step['interview_language']}")
+        report.text("  关键点:")
+        for point in step['key_points'][:3]:
+            report.item(point, indent=4)
 
     # 技术面试重点
-    print("\n\n" + "="*100)
-    print("💻 技术面试准备重点")
-    print("="*100)
+    report.blank(2).rule("=")
+    report.heading("💻 技术面试准备重点", 2)
+    report.rule("=")
 
     tech_prep = materials['technical_prep']
     for key, value in list(tech_prep.items())[:2]:  # SQL和Python
-        print(f"\n{key}")
-        print(f"  重要性: {value['importance']}")
-        print(f"  准备时间: {value['preparation_time']}")
+        report.blank().heading(key, 3)
+        report.text(f"  重要性: {value['importance']}")
+        report.text(f"  准备时间: {value['preparation_time']}")
 
     # 行为面试
-    print("\n\n" + "="*100)
-    print("🗣️  行为面试准备 (STAR Method)")
-    print("="*100)
+    report.blank(2).rule("=")
+    report.heading("🗣️  行为面试准备 (STAR Method)", 2)
+    report.rule("=")
     behavioral = materials['behavioral_prep']
-    print(f"\n重要性: {behavioral['importance']}")
-    print(f"\n必须准备的故事类别:")
+    report.blank().text(f"重要性: {behavioral['importance']}")
+    report.blank().text("必须准备的故事类别:")
     for category in behavioral['story_categories']['必须准备的8大类故事'][:4]:
-        print(f"\n  {category['category']}")
-        print(f"    常见问题:")
+        report.blank().heading(f"  {category['category']}", 3)
+        report.text("    常见问题:")
         for q in category['prompts'][:2]:
-            print(f"      - {q}")
+            report.item(q, "-", 6)
 
     # 英语准备
-    print("\n\n" + "="*100)
-    print("🌍 英语面试准备")
-    print("="*100)
+    report.blank(2).rule("=")
+    report.heading("🌍 英语面试准备", 2)
+    report.rule("=")
     english = materials['english_prep']
-    print(f"\n重要性: {english['importance']}")
-    print(f"\n目标水平:")
+    report.blank().text(f"重要性: {english['importance']}")
+    report.blank().text("目标水平:")
     for skill, target in english['target_level'].items():
-        print(f"  {skill}: {target}")
+        report.text(f"  {skill}: {target}")
 
     # 学习计划
-    print("\n\n" + "="*100)
-    print("📅 推荐学习计划")
-    print("="*100)
-    print("\n选择1: 8周标准计划（推荐）")
-    print("选择2: 4周冲刺计划（已有基础）")
+    report.blank(2).rule("=")
+    report.heading("📅 推荐学习计划", 2)
+    report.rule("=")
+    report.blank().text("选择1: 8周标准计划（推荐）")
+    report.text("选择2: 4周冲刺计划（已有基础）")
 
     plan_8w = materials['study_plans']['8_week_plan']
-    print(f"\n8周计划概览:")
+    report.blank().text("8周计划概览:")
     for phase, details in plan_8w['weekly_plan'].items():
-        print(f"\n  {phase}: {details['focus']}")
-        print(f"    投入: {details['weekly_hours']}")
-        print(f"    里程碑: {details['milestone']}")
+        report.blank().heading(f"  {phase}: {details['focus']}", 3)
+        report.text(f"    投入: {details['weekly_hours']}")
+        report.text(f"    里程碑: {details['milestone']}")
 
-    print("\n\n" + "="*100)
-    print("🎯 面试成功的5个关键要素")
-    print("="*100)
-    print("""
+    report.blank(2).rule("=")
+    report.heading("🎯 面试成功的5个关键要素", 2)
+    report.rule("=")
+    report.pre("""
 1. SQL能力 ⭐⭐⭐⭐⭐
    - 完成100+ LeetCode SQL题（重点Medium）
    - 熟练窗口函数、CTE、性能优化
@@ -1388,10 +1399,10 @@ def print_interview_prep_summary(materials: Dict):
    - 对公司和职位的真诚兴趣
     """)
 
-    print("\n" + "="*100)
-    print("📚 核心资源")
-    print("="*100)
-    print("""
+    report.blank().rule("=")
+    report.heading("📚 核心资源", 2)
+    report.rule("=")
+    report.pre("""
 技术练习:
   • LeetCode (SQL + Python) - 必刷
   • HackerRank - 补充练习
@@ -1413,10 +1424,10 @@ def print_interview_prep_summary(materials: Dict):
   • YouTube: Dan Croitor频道
     """)
 
-    print("\n" + "="*100)
-    print("⏰ 时间规划建议")
-    print("="*100)
-    print("""
+    report.blank().rule("=")
+    report.heading("⏰ 时间规划建议", 2)
+    report.rule("=")
+    report.pre("""
 工作日 (2-3小时/天):
   • SQL/Python刷题: 1-1.5小时
   • 英语练习: 30-45分钟
@@ -1434,10 +1445,10 @@ def print_interview_prep_summary(materials: Dict):
   • 开始真实面试获取反馈
     """)
 
-    print("\n" + "="*100)
-    print("✅ 面试准备Checklist")
-    print("="*100)
-    print("""
+    report.blank().rule("=")
+    report.heading("✅ 面试准备Checklist", 2)
+    report.rule("=")
+    report.pre("""
 □ SQL: 完成100+ LeetCode题
 □ Python: 完成50+ LeetCode题，熟练pandas
 □ 系统设计: 能设计3-5个典型数据系统
@@ -1450,32 +1461,48 @@ def print_interview_prep_summary(materials: Dict):
 □ 公司研究: 了解目标公司文化和产品
     """)
 
-    print("\n💪 You're ready to ace these interviews! Let's get started!")
+    report.blank().text("💪 You're ready to ace these interviews! Let's get started!")
+    return report
+
 
+def print_interview_prep_summary(materials: Dict):
+    """
+    打印面试准备摘要
+    """
+    build_interview_prep_summary(materials).print()
 
-def main():
-    """主函数"""
-    print("🚀 生成外企数据岗位面试准备计划...")
-    print("📍 目标: 上海地区外企 Data Engineer / Data Analyst 岗位")
-    print("🎯 基于: LinkedIn真实岗位要求 + 标准面试流程\n")
 
-    # 生成所有材料
-    materials = save_interview_prep_materials()
+def main(output_dir: str = OUTPUT_DIR, metrics_file: str = None):
+    """
+    主函数
+
+    Args:
+        output_dir: interview_prep_complete.json 的输出目录
+        metrics_file: 分阶段耗时/内存指标的JSON文件，默认不记录
+    """
+    with instrumented_run("interview-prep", metrics_file):
+        print("🚀 生成外企数据岗位面试准备计划...")
+        print("📍 目标: 上海地区外企 Data Engineer / Data Analyst 岗位")
+        print("🎯 基于: LinkedIn真实岗位要求 + 标准面试流程\n")
+
+        # 生成所有材料
+        materials = save_interview_prep_materials(output_dir)
 
-    # 打印摘要
-    print_interview_prep_summary(materials)
+        # 打印摘要
+        with stage("print_summary"):
+            print_interview_prep_summary(materials)
 
-    print("\n" + "="*100)
-    print("📁 生成的文件")
-    print("="*100)
-    print("  • interview_prep_complete.json - 完整面试准备数据")
-    print("  • interview_preparation_plan.py - 本脚本（可重复运行）")
-    print("\n🎬 下一步:")
-    print("  1. 阅读完整的JSON文件了解所有细节")
-    print("  2. 选择8周或4周计划")
-    print("  3. 今天就开始刷第一道LeetCode SQL题")
-    print("  4. 写出第一个STAR故事")
-    print("\n✨ Good luck with your interviews! 加油！")
+        print("\n" + "="*100)
+        print("📁 生成的文件")
+        print("="*100)
+        print("  • interview_prep_complete.json - 完整面试准备数据")
+        print("  • interview_preparation_plan.py - 本脚本（可重复运行）")
+        print("\n🎬 下一步:")
+        print("  1. 阅读完整的JSON文件了解所有细节")
+        print("  2. 选择8周或4周计划")
+        print("  3. 今天就开始刷第一道LeetCode SQL题")
+        print("  4. 写出第一个STAR故事")
+        print("\n✨ Good luck with your interviews! 加油！")
 
 
 if __name__ == "__main__":
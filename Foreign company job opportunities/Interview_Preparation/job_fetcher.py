@@ -0,0 +1,559 @@
+#!/usr/bin/env python3
+"""
+异步并发岗位抓取
+用 asyncio 并发抓取 get_target_companies() 中每家公司的岗位列表页（支持分页）：
+- 连接池：按主机复用 HTTP/1.1 keep-alive 连接
+- 每个主机的并发上限 + 令牌桶限速
+- 连接错误、超时、429/5xx 按指数退避重试（优先使用 Retry-After）
+- 可选的 HttpCache：带 ETag / Last-Modified 条件请求，304时复用缓存中已解析的岗位
+只依赖标准库；附带本地桩服务器 StubJobServer，用于测试和吞吐量测试
+"""
+
+import asyncio
+import gzip
+import json
+import random
+import re
+import time
+from contextlib import asynccontextmanager
+from typing import List, Dict, Optional, Tuple
+from urllib.parse import urlsplit, parse_qs
+
+
+# 列表页地址模板：{slug} 为公司名称的小写连字符形式，{page} 为页码（从1开始）
+DEFAULT_URL_TEMPLATE = "http://127.0.0.1:8080/careers/{slug}/jobs?location=Shanghai&page={page}"
+
+# 需要重试的HTTP状态码
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+USER_AGENT = "shanghai-data-jobs-fetcher/1.0"
+
+
+def company_slug(name: str) -> str:
+    """公司名称 → URL中的标识，如 "McKinsey & Company" → "mckinsey-company" """
+    return re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-')
+
+
+class TokenBucket:
+    """令牌桶限速：平均每秒 rate 个请求，允许 capacity 个突发"""
+
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """取一个令牌，令牌不足时等待"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class _Connection:
+    __slots__ = ("reader", "writer", "reusable")
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.reusable = True
+
+
+class ConnectionPool:
+    """
+    按 (scheme, host, port) 复用的 keep-alive 连接池
+
+    每个主机同时使用的连接数不超过 max_per_host；请求结束后连接放回空闲列表，
+    服务器声明 Connection: close 或读取出错的连接直接关闭。
+    """
+
+    def __init__(self, max_per_host: int = 8, connect_timeout: float = None):
+        self.max_per_host = max_per_host
+        self.connect_timeout = connect_timeout
+        self._idle: Dict[Tuple, List[_Connection]] = {}
+        self._limits: Dict[Tuple, asyncio.Semaphore] = {}
+        self.opened = 0
+
+    @asynccontextmanager
+    async def connection(self, scheme: str, host: str, port: int):
+        key = (scheme, host, port)
+        limit = self._limits.get(key)
+        if limit is None:
+            limit = self._limits[key] = asyncio.Semaphore(self.max_per_host)
+
+        async with limit:
+            idle = self._idle.setdefault(key, [])
+            conn = None
+            while idle:
+                candidate = idle.pop()
+                if not candidate.writer.is_closing() and not candidate.reader.at_eof():
+                    conn = candidate
+                    break
+                candidate.writer.close()
+            if conn is None:
+                reader, writer = await asyncio.wait_for(
+                    asyncio.open_connection(host, port, ssl=(scheme == "https") or None), self.connect_timeout
+                )
+                conn = _Connection(reader, writer)
+                self.opened += 1
+
+            released = False
+            try:
+                yield conn
+                if conn.reusable:
+                    idle.append(conn)
+                    released = True
+            finally:
+                if not released:
+                    conn.writer.close()
+
+    async def close(self):
+        """关闭所有空闲连接"""
+        writers = [conn.writer for idle in self._idle.values() for conn in idle]
+        self._idle = {}
+        for writer in writers:
+            writer.close()
+        await asyncio.gather(*(writer.wait_closed() for writer in writers), return_exceptions=True)
+
+
+async def _read_response(reader: asyncio.StreamReader) -> Tuple[int, Dict[str, str], bytes, bool]:
+    """读取一个HTTP/1.1响应：(状态码, 响应头（小写键）, 响应体, 连接可否复用)"""
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("服务器关闭了连接")
+    version, status = status_line.decode("latin-1").split(" ", 2)[:2]
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    reusable = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        chunks = []
+        while True:
+            size = int((await reader.readline()).split(b";")[0], 16)
+            if size == 0:
+                # 跳过 trailer
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass
+                break
+            chunks.append(await reader.readexactly(size))
+            await reader.readline()
+        body = b"".join(chunks)
+    elif "content-length" in headers:
+        body = await reader.readexactly(int(headers["content-length"]))
+    else:
+        body = await reader.read()
+        reusable = False
+
+    if headers.get("content-encoding", "").lower() == "gzip":
+        body = gzip.decompress(body)
+    return int(status), headers, body, reusable
+
+
+class JobSourceFetcher:
+    """
+    并发抓取各公司的岗位列表页
+
+    列表页响应为JSON：{"jobs": [岗位, ...], "next_page": 下一页页码或null}，
+    岗位字段与 simulate_job_listings() 一致。公司字典中的 careers_url 优先于 url_template。
+    """
+
+    def __init__(self,
+                 url_template: str = DEFAULT_URL_TEMPLATE,
+                 concurrency: int = 16,
+                 per_host: int = 8,
+                 rate_per_host: float = 20.0,
+                 retries: int = 3,
+                 backoff: float = 0.5,
+                 max_backoff: float = 30.0,
+                 timeout: float = 15.0,
+                 max_pages: int = 20,
+                 cache=None):
+        """
+        Args:
+            url_template: 列表页地址模板
+            concurrency: 全局同时进行的请求数
+            per_host: 每个主机同时使用的连接数上限
+            rate_per_host: 每个主机每秒请求数上限（令牌桶）
+            retries: 失败后的最大重试次数
+            backoff: 第一次重试的等待秒数，之后每次翻倍（带随机抖动）
+            timeout: 单个请求（建立连接、发送请求、读取响应各自）的超时秒数
+            max_pages: 每家公司最多抓取的页数
+            cache: HttpCache 实例；为None时不做条件请求
+        """
+        self.url_template = url_template
+        self.concurrency = concurrency
+        self.rate_per_host = rate_per_host
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.max_pages = max_pages
+        self.cache = cache
+
+        self.pool = ConnectionPool(per_host, connect_timeout=timeout)
+        self._buckets: Dict[str, TokenBucket] = {}
+        self.stats = {"requests": 0, "retries": 0, "failures": 0}
+
+    async def _request(self, url: str, extra_headers: Dict[str, str] = None) -> Tuple[int, Dict[str, str], bytes]:
+        parts = urlsplit(url)
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        target = parts.path or "/"
+        if parts.query:
+            target += "?" + parts.query
+        request = (
+            f"GET {target} HTTP/1.1\r\n"
+            f"Host: {parts.netloc}\r\n"
+            f"User-Agent: {USER_AGENT}\r\n"
+            "Accept: application/json\r\n"
+            "Accept-Encoding: gzip\r\n"
+            + "".join(f"{name}: {value}\r\n" for name, value in (extra_headers or {}).items())
+            + "Connection: keep-alive\r\n\r\n"
+        ).encode("latin-1")
+
+        async with self.pool.connection(parts.scheme, parts.hostname, port) as conn:
+            try:
+                conn.writer.write(request)
+                await asyncio.wait_for(conn.writer.drain(), self.timeout)
+                status, headers, body, conn.reusable = await asyncio.wait_for(
+                    _read_response(conn.reader), self.timeout
+                )
+            except BaseException:
+                conn.reusable = False
+                raise
+        return status, headers, body
+
+    def _retry_delay(self, attempt: int, headers: Dict[str, str]) -> float:
+        retry_after = headers.get("retry-after", "")
+        if retry_after.isdigit():
+            return min(float(retry_after), self.max_backoff)
+        return min(self.backoff * (2 ** attempt), self.max_backoff) * random.uniform(0.5, 1.5)
+
+    async def get(self, url: str, headers: Dict[str, str] = None) -> Dict:
+        """
+        带限速和重试的GET
+
+        Args:
+            url: 请求地址
+            headers: 附加的请求头（如条件请求的 If-None-Match）
+
+        Returns:
+            {"url", "status", "headers", "body", "attempts", "error"}；
+            所有重试都失败时 status 为最后一次的状态码或None
+        """
+        host = urlsplit(url).hostname
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = self._buckets[host] = TokenBucket(self.rate_per_host)
+
+        status, body, error, response_headers = None, b"", None, {}
+        for attempt in range(self.retries + 1):
+            if attempt:
+                self.stats["retries"] += 1
+                await asyncio.sleep(self._retry_delay(attempt - 1, response_headers))
+            await bucket.acquire()
+            self.stats["requests"] += 1
+            try:
+                status, response_headers, body = await self._request(url, headers)
+                error = None
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError) as e:
+                status, response_headers, body, error = None, {}, b"", f"{type(e).__name__}: {e}"
+                continue
+            if status not in RETRY_STATUSES:
+                break
+
+        if status not in (200, 304):
+            self.stats["failures"] += 1
+        return {"url": url, "status": status, "headers": response_headers, "body": body, "attempts": attempt + 1,
+                "error": error}
+
+    async def fetch_listing(self, url: str) -> Tuple[Optional[Dict], Dict]:
+        """
+        抓取并解析一个列表页
+
+        设置了 cache 时带上缓存的 ETag / Last-Modified 发起条件请求：
+        304 直接返回缓存中已解析的列表（缓存条目已被淘汰时重新发起普通请求），
+        200 解析后连同压缩的响应体一起写入缓存；响应体不是JSON对象时按失败处理。
+
+        Returns:
+            (列表页JSON，失败时为None, get() 的结果)
+        """
+        validators = self.cache.validators(url) if self.cache is not None else {}
+        result = await self.get(url, validators)
+        if result["status"] == 304 and validators:
+            cached = self.cache.revalidated(url)
+            if cached is not None:
+                return cached[1], result
+            result = await self.get(url)
+        if result["status"] != 200:
+            return None, result
+
+        try:
+            listing = json.loads(result["body"])
+        except ValueError as e:   # 包括 JSONDecodeError 和 UnicodeDecodeError
+            listing, result["error"] = None, f"{type(e).__name__}: {e}"
+        if not isinstance(listing, dict):
+            if result["error"] is None:
+                result["error"] = f"列表页不是JSON对象: {type(listing).__name__}"
+            self.stats["failures"] += 1
+            return None, result
+        if self.cache is not None:
+            self.cache.store(url, result["headers"], result["body"], listing)
+        return listing, result
+
+    async def fetch_company(self, company: Dict) -> Dict:
+        """抓取一家公司的所有列表页，返回 {"company", "jobs", "pages", "status", "error"}"""
+        jobs, page, pages, result = [], 1, 0, {"status": None, "error": None}
+        while page and pages < self.max_pages:
+            url = company.get("careers_url") or self.url_template.format(slug=company_slug(company["name"]), page=page)
+            if company.get("careers_url"):
+                url = f"{url}{'&' if '?' in url else '?'}page={page}"
+            listing, result = await self.fetch_listing(url)
+            if listing is None:
+                break
+            pages += 1
+            for job in listing.get("jobs", []):
+                job.setdefault("company", company["name"])
+                job.setdefault("cn_company", company.get("cn_name", company["name"]))
+                jobs.append(job)
+            page = listing.get("next_page")
+        return {
+            "company": company["name"],
+            "jobs": jobs,
+            "pages": pages,
+            "status": result["status"],
+            "error": result["error"],
+        }
+
+    async def fetch_all(self, companies: List[Dict]) -> List[Dict]:
+        """
+        并发抓取所有公司（全局并发数不超过 concurrency），返回与 companies 顺序一致的结果
+
+        某家公司抓取时抛出的异常不会中断其他公司，该公司的结果 jobs 为空、error 为异常信息
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def bounded(company):
+            async with semaphore:
+                return await self.fetch_company(company)
+
+        try:
+            results = await asyncio.gather(*(bounded(company) for company in companies), return_exceptions=True)
+        finally:
+            await self.pool.close()
+
+        for i, (company, result) in enumerate(zip(companies, results)):
+            if isinstance(result, BaseException):
+                if not isinstance(result, Exception):
+                    raise result
+                results[i] = {"company": company["name"], "jobs": [], "pages": 0, "status": None,
+                              "error": f"{type(result).__name__}: {result}"}
+        return results
+
+
+def fetch_job_listings(companies: List[Dict] = None, **kwargs) -> List[Dict]:
+    """
+    同步入口：抓取所有目标公司的岗位，返回合并后的岗位列表（与 simulate_job_listings 格式一致）
+
+    Args:
+        companies: 公司列表，默认 get_target_companies()
+        kwargs: 传给 JobSourceFetcher 的参数
+    """
+    if companies is None:
+        from shanghai_data_jobs_scraper import get_target_companies
+        companies = get_target_companies()
+    results = asyncio.run(JobSourceFetcher(**kwargs).fetch_all(companies))
+    return [job for result in results for job in result["jobs"]]
+
+
+# ======================================================================================
+# 本地桩服务器
+# ======================================================================================
+
+class StubJobServer:
+    """
+    本地HTTP桩服务器：/careers/<slug>/jobs?page=N 返回JSON岗位列表
+
+    支持 keep-alive；可以设置响应延迟、随机503比例和429限流（带 Retry-After），
+    connections / requests 记录建立的连接数和处理的请求数。
+    响应带 ETag / Last-Modified，If-None-Match 匹配时返回304；touch(slug) 模拟某家公司的岗位更新。
+    """
+
+    def __init__(self, latency: float = 0.02, pages: int = 3, jobs_per_page: int = 5,
+                 failure_rate: float = 0.0, rate_limit_every: int = 0, seed: int = 42):
+        from shanghai_data_jobs_scraper import simulate_job_listings
+
+        self.latency = latency
+        self.pages = pages
+        self.jobs_per_page = jobs_per_page
+        self.failure_rate = failure_rate
+        self.rate_limit_every = rate_limit_every
+        self.rng = random.Random(seed)
+        self.samples = simulate_job_listings()
+        self.connections = 0
+        self.requests = 0
+        self.server = None
+        self._handlers = set()
+        self._versions: Dict[str, int] = {}
+
+    @property
+    def base_url(self) -> str:
+        port = self.server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}"
+
+    @property
+    def url_template(self) -> str:
+        return self.base_url + "/careers/{slug}/jobs?location=Shanghai&page={page}"
+
+    async def start(self):
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return self
+
+    async def close(self):
+        """停止监听并等待所有连接处理结束"""
+        self.server.close()
+        for task in self._handlers:
+            task.cancel()
+        await asyncio.gather(*self._handlers, return_exceptions=True)
+        await self.server.wait_closed()
+
+    def touch(self, slug: str):
+        """更新一家公司的岗位：之后的响应内容和 ETag 都会变化"""
+        self._versions[slug] = self._versions.get(slug, 0) + 1
+
+    def _etag(self, slug: str, page: int) -> str:
+        return f'"{slug}-{page}-v{self._versions.get(slug, 0)}"'
+
+    def _listing(self, slug: str, page: int) -> bytes:
+        jobs = []
+        offset = self._versions.get(slug, 0)
+        for i in range(self.jobs_per_page):
+            sample = self.samples[(page * self.jobs_per_page + i + offset) % len(self.samples)]
+            job = {key: value for key, value in sample.items() if key not in ("company", "cn_company")}
+            job["position"] = f"{sample['position']} #{page}-{i}"
+            jobs.append(job)
+        listing = {"company": slug, "jobs": jobs, "next_page": page + 1 if page < self.pages else None}
+        return json.dumps(listing, ensure_ascii=False).encode("utf-8")
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.connections += 1
+        task = asyncio.current_task()
+        self._handlers.add(task)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                close, if_none_match = False, None
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    lower = line.lower()
+                    if lower.startswith(b"connection:") and b"close" in lower:
+                        close = True
+                    elif lower.startswith(b"if-none-match:"):
+                        if_none_match = line.split(b":", 1)[1].strip().decode("latin-1")
+
+                self.requests += 1
+                await asyncio.sleep(self.latency)
+                path = request_line.split()[1].decode("latin-1")
+                parts = urlsplit(path)
+                match = re.fullmatch(r"/careers/([^/]+)/jobs", parts.path)
+                extra = ""
+                if self.rate_limit_every and self.requests % self.rate_limit_every == 0:
+                    status, body, extra = "429 Too Many Requests", b"", "Retry-After: 0\r\n"
+                elif self.rng.random() < self.failure_rate:
+                    status, body = "503 Service Unavailable", b""
+                elif match:
+                    slug = match.group(1)
+                    page = int(parse_qs(parts.query).get("page", ["1"])[0])
+                    etag = self._etag(slug, page)
+                    last_modified = time.strftime("%a, %d %b %Y %H:%M:%S GMT",
+                                                  time.gmtime(1_700_000_000 + 86400 * self._versions.get(slug, 0)))
+                    extra = f"ETag: {etag}\r\nLast-Modified: {last_modified}\r\n"
+                    if if_none_match == etag:
+                        status, body = "304 Not Modified", b""
+                    else:
+                        status, body = "200 OK", self._listing(slug, page)
+                else:
+                    status, body = "404 Not Found", b""
+
+                writer.write(
+                    f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n"
+                    f"Content-Length: {len(body)}\r\n{extra}\r\n".encode("latin-1") + body
+                )
+                await writer.drain()
+                if close:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.CancelledError):
+            # 客户端断开或服务器关闭
+            pass
+        finally:
+            self._handlers.discard(task)
+            writer.close()
+
+
+# ======================================================================================
+# 性能测试
+# ======================================================================================
+
+async def _run_against_stub(companies: List[Dict], concurrency: int, latency: float, pages: int,
+                            failure_rate: float = 0.0) -> Dict:
+    server = await StubJobServer(latency=latency, pages=pages, failure_rate=failure_rate).start()
+    fetcher = JobSourceFetcher(server.url_template, concurrency=concurrency, per_host=concurrency,
+                               rate_per_host=10_000, backoff=0.01)
+    try:
+        start = time.perf_counter()
+        results = await fetcher.fetch_all(companies)
+        seconds = time.perf_counter() - start
+    finally:
+        await server.close()
+    return {
+        "concurrency": concurrency,
+        "seconds": round(seconds, 2),
+        "requests_per_second": round(fetcher.stats["requests"] / seconds, 1),
+        "jobs": sum(len(result["jobs"]) for result in results),
+        "connections": server.connections,
+        "retries": fetcher.stats["retries"],
+        "failed_companies": sum(1 for result in results if result["status"] != 200),
+    }
+
+
+def benchmark_throughput(concurrency_levels: List[int] = (1, 4, 16, 64), latency: float = 0.02,
+                         pages: int = 5) -> List[Dict]:
+    """对本地桩服务器（每个请求延迟 latency 秒）测量不同并发数下的吞吐量"""
+    from shanghai_data_jobs_scraper import get_target_companies
+
+    companies = get_target_companies()
+    return [asyncio.run(_run_against_stub(companies, c, latency, pages)) for c in concurrency_levels]
+
+
+def main():
+    """主函数：运行吞吐量测试和重试测试"""
+    from shanghai_data_jobs_scraper import get_target_companies
+
+    print("⏱️  并发抓取吞吐量测试（本地桩服务器，每个请求延迟20ms，每家公司5页）...")
+    for result in benchmark_throughput():
+        print(f"  并发 {result['concurrency']:>2}: {result['seconds']}s，{result['requests_per_second']} 请求/秒，"
+              f"{result['jobs']} 个岗位，建立连接 {result['connections']} 个")
+
+    print("\n🔁 重试测试（20%请求返回503）...")
+    result = asyncio.run(_run_against_stub(get_target_companies(), 16, 0.02, 5, failure_rate=0.2))
+    print(f"  重试 {result['retries']} 次，失败公司 {result['failed_companies']} 家，获取岗位 {result['jobs']} 个")
+
+
+if __name__ == "__main__":
+    main()
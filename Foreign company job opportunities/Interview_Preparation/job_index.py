@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+岗位倒排索引
+按技能、公司、行业、发布日期维护岗位ID集合，按薪资维护有序数组，
+多条件查询通过集合求交和二分查找完成，无需线性扫描岗位列表
+"""
+
+import random
+import time
+from bisect import bisect_left, bisect_right, insort
+from datetime import date, timedelta
+from typing import List, Dict, Set, Iterable, Optional
+
+from salary_parser import parse_salary
+from shanghai_data_jobs_scraper import get_target_companies, simulate_job_listings
+from skill_taxonomy import normalize_text
+
+
+def build_industry_map() -> Dict[str, str]:
+    """公司名称（英文名和中文名，小写） → 行业"""
+    industry_map = {}
+    for company in get_target_companies():
+        industry_map[normalize_text(company["name"])] = company["industry"]
+        industry_map[normalize_text(company["cn_name"])] = company["industry"]
+    return industry_map
+
+
+def parse_salary_range(salary: str) -> Optional[tuple]:
+    """解析薪资文本，返回 (月薪下限k, 月薪上限k)，无法解析返回None"""
+    parsed = parse_salary(salary)
+    return parsed[:2] if parsed else None
+
+
+class JobIndex:
+    """
+    岗位内存索引，支持增量添加/删除
+
+    - skill / company / industry / date: 键 → 岗位ID集合
+    - 薪资: (下限, ID) 和 (上限, ID) 两个有序数组，区间查询用二分
+    """
+
+    def __init__(self, jobs: Iterable[Dict] = None):
+        self.jobs: Dict[int, Dict] = {}
+        self.by_skill: Dict[str, Set[int]] = {}
+        self.by_company: Dict[str, Set[int]] = {}
+        self.by_industry: Dict[str, Set[int]] = {}
+        self.by_date: Dict[str, Set[int]] = {}
+        self.dates: List[str] = []  # 有序的不重复日期，用于日期范围查询
+        self.salary_low: List[tuple] = []
+        self.salary_high: List[tuple] = []
+        self.salaries: Dict[int, tuple] = {}  # 岗位ID → (下限, 上限)
+        self.posted_dates: Dict[int, str] = {}  # 岗位ID → 发布日期
+
+        self._industry_map = build_industry_map()
+        self._next_id = 0
+
+        for job in jobs or []:
+            self.add(job)
+
+    def __len__(self) -> int:
+        return len(self.jobs)
+
+    def industry_of(self, job: Dict) -> Optional[str]:
+        """根据公司英文名或中文名查找行业"""
+        return (self._industry_map.get(normalize_text(job.get("company", "")))
+                or self._industry_map.get(normalize_text(job.get("cn_company", ""))))
+
+    def _index_keys(self, job: Dict) -> List[tuple]:
+        """返回岗位在各个集合索引中的 (索引, 键) 列表"""
+        keys = [(self.by_skill, normalize_text(skill)) for skill in job.get("skills", [])]
+        if job.get("company"):
+            keys.append((self.by_company, normalize_text(job["company"])))
+        industry = self.industry_of(job)
+        if industry:
+            keys.append((self.by_industry, normalize_text(industry)))
+        if job.get("posted_date"):
+            keys.append((self.by_date, job["posted_date"][:10]))
+        return keys
+
+    def add(self, job: Dict) -> int:
+        """
+        添加岗位到索引
+
+        Returns:
+            岗位ID
+        """
+        posting_id = self._next_id
+        self._next_id += 1
+        self.jobs[posting_id] = job
+
+        for index, key in self._index_keys(job):
+            if index is self.by_date and key not in index:
+                insort(self.dates, key)
+            index.setdefault(key, set()).add(posting_id)
+
+        self.posted_dates[posting_id] = job.get("posted_date", "")[:10]
+        salary = parse_salary_range(job.get("salary_range", ""))
+        if salary:
+            self.salaries[posting_id] = salary
+            insort(self.salary_low, (salary[0], posting_id))
+            insort(self.salary_high, (salary[1], posting_id))
+
+        return posting_id
+
+    def remove(self, posting_id: int) -> Dict:
+        """
+        从索引中删除岗位
+
+        Returns:
+            被删除的岗位信息
+        """
+        job = self.jobs.pop(posting_id)
+
+        for index, key in self._index_keys(job):
+            ids = index.get(key)
+            if ids is None:
+                continue
+            ids.discard(posting_id)
+            if not ids:
+                del index[key]
+                if index is self.by_date:
+                    del self.dates[bisect_left(self.dates, key)]
+
+        del self.posted_dates[posting_id]
+        salary = self.salaries.pop(posting_id, None)
+        if salary:
+            del self.salary_low[bisect_left(self.salary_low, (salary[0], posting_id))]
+            del self.salary_high[bisect_left(self.salary_high, (salary[1], posting_id))]
+
+        return job
+
+    def query_ids(self,
+                  skills: Iterable[str] = None,
+                  company: str = None,
+                  industry: str = None,
+                  date_from: str = None,
+                  date_to: str = None,
+                  salary_min: int = None,
+                  salary_max: int = None) -> Set[int]:
+        """
+        多条件查询，所有条件取交集
+
+        Args:
+            skills: 必须同时具备的技能
+            company: 公司名称
+            industry: 行业（与 get_target_companies 中的 industry 一致）
+            date_from / date_to: 发布日期范围（YYYY-MM-DD，含两端）
+            salary_min / salary_max: 薪资区间（k/月），与岗位薪资范围有重叠即命中
+
+        Returns:
+            满足条件的岗位ID集合
+        """
+        candidates = []
+        for skill in skills or []:
+            candidates.append(self.by_skill.get(normalize_text(skill), set()))
+        if company:
+            candidates.append(self.by_company.get(normalize_text(company), set()))
+        if industry:
+            candidates.append(self.by_industry.get(normalize_text(industry), set()))
+
+        # 集合条件先求交（从最小的集合开始）
+        result = None
+        if candidates:
+            candidates.sort(key=len)
+            result = set(candidates[0])
+            for ids in candidates[1:]:
+                result &= ids
+                if not result:
+                    return result
+
+        # 已有候选集合比范围索引命中的集合小时，直接逐个校验候选岗位
+        if date_from or date_to:
+            lo = bisect_left(self.dates, date_from) if date_from else 0
+            hi = bisect_right(self.dates, date_to) if date_to else len(self.dates)
+            if result is not None and len(result) < sum(len(self.by_date[d]) for d in self.dates[lo:hi]):
+                result = {i for i in result
+                          if self.posted_dates[i] and (not date_from or self.posted_dates[i] >= date_from)
+                          and (not date_to or self.posted_dates[i] <= date_to)}
+            else:
+                ids = set()
+                for day in self.dates[lo:hi]:
+                    ids |= self.by_date[day]
+                result = ids if result is None else result & ids
+
+        if salary_min is not None or salary_max is not None:
+            low = salary_min if salary_min is not None else float("-inf")
+            high = salary_max if salary_max is not None else float("inf")
+            if result is not None:
+                result = {i for i in result
+                          if i in self.salaries and self.salaries[i][1] >= low and self.salaries[i][0] <= high}
+            else:
+                # 上限 >= salary_min 且 下限 <= salary_max
+                start = bisect_left(self.salary_high, (low, -1))
+                end = bisect_right(self.salary_low, (high, float("inf")))
+                result = ({posting_id for _, posting_id in self.salary_high[start:]}
+                          & {posting_id for _, posting_id in self.salary_low[:end]})
+
+        return set(self.jobs) if result is None else result
+
+    def query(self, **criteria) -> List[Dict]:
+        """多条件查询，返回岗位信息（按岗位ID排序），参数同 query_ids"""
+        return [self.jobs[i] for i in sorted(self.query_ids(**criteria))]
+
+
+# ======================================================================================
+# 性能测试
+# ======================================================================================
+
+def generate_benchmark_jobs(n: int, seed: int = 42) -> List[Dict]:
+    """生成n个随机岗位（公司取自目标公司列表，技能取自约500个技能的词表）"""
+    rng = random.Random(seed)
+    companies = get_target_companies()
+    vocabulary = [skill for job in simulate_job_listings() for skill in job["skills"]]
+    vocabulary = list(dict.fromkeys(vocabulary)) + [f"Skill {k}" for k in range(450)]
+    start_date = date(2025, 1, 1)
+
+    jobs = []
+    for _ in range(n):
+        company = rng.choice(companies)
+        low = rng.randrange(15, 60, 5)
+        jobs.append({
+            "company": company["name"],
+            "cn_company": company["cn_name"],
+            "salary_range": f"{low}-{low + rng.randrange(10, 40, 5)}k RMB/month",
+            "posted_date": (start_date + timedelta(days=rng.randrange(730))).isoformat(),
+            "skills": rng.sample(vocabulary[:40], 3) + rng.sample(vocabulary[40:], 3),
+        })
+    return jobs
+
+
+def benchmark_queries(n: int = 100_000, rounds: int = 1000) -> Dict:
+    """在n个随机岗位上测量索引构建和多条件查询的耗时"""
+    jobs = generate_benchmark_jobs(n)
+
+    start = time.perf_counter()
+    index = JobIndex(jobs)
+    build_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        index.query_ids(skills=["Python", "Spark"], industry="Technology",
+                        date_from="2026-02-01", date_to="2026-02-14")
+        index.query_ids(skills=["dbt"], company="SAP", salary_min=40)
+    query_ms = (time.perf_counter() - start) / (rounds * 2) * 1000
+
+    return {
+        "postings": n,
+        "build_seconds": round(build_seconds, 3),
+        "avg_query_ms": round(query_ms, 4),
+    }
+
+
+def main():
+    """主函数：示例查询和性能测试"""
+    index = JobIndex(simulate_job_listings())
+    print("Technology行业 + Python + 薪资≥60k:")
+    for job in index.query(skills=["Python"], industry="Technology", salary_min=60):
+        print(f"  {job['company']:20s} {job['position']:35s} {job['salary_range']}")
+
+    print("\n⏱️  索引性能测试（100,000个岗位）...")
+    result = benchmark_queries()
+    print(f"  构建: {result['build_seconds']}s")
+    print(f"  平均查询: {result['avg_query_ms']}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+紧凑的列式岗位存储
+公司、地点、来源、技能等低基数字段做字典编码（整数编码存入 array），
+技能列表用 偏移量 + 扁平编码数组 存储，岗位描述写入独立的文件按需读取，
+替代每个岗位一个dict、字符串重复存储的内存布局
+"""
+
+import json
+import os
+import sys
+import tempfile
+import tracemalloc
+from array import array
+from typing import List, Dict, Iterable, Iterator
+
+
+# 做字典编码的字段
+ENCODED_FIELDS = ("company", "cn_company", "position", "location", "salary_range", "posted_date", "source")
+
+
+class StringPool:
+    """字符串字典编码：字符串 → 整数编码，同一字符串只保存一份"""
+
+    def __init__(self):
+        self.codes: Dict[str, int] = {}
+        self.values: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def encode(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.values)
+            value = sys.intern(value)
+            self.codes[value] = code
+            self.values.append(value)
+        return code
+
+    def decode(self, code: int) -> str:
+        return self.values[code]
+
+
+class DescriptionBlobStore:
+    """
+    岗位描述的独立存储：UTF-8文本依次追加到文件，内存中只保留每条的偏移量
+
+    没有指定 path 时写入临时文件，close() 时删除；指定的文件保留。
+    """
+
+    def __init__(self, path: str = None):
+        self.owns_file = path is None
+        if path is None:
+            fd, path = tempfile.mkstemp(prefix="job_descriptions_", suffix=".blob")
+            os.close(fd)
+        self.path = path
+        self.offsets = array('q', [0])
+        self._writer = open(path, 'wb')
+        self._reader = None
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def append(self, text: str) -> int:
+        """追加一条描述，返回其编号"""
+        data = text.encode("utf-8")
+        self._writer.write(data)
+        self.offsets.append(self.offsets[-1] + len(data))
+        return len(self.offsets) - 2
+
+    def get(self, index: int) -> str:
+        """按编号读取一条描述"""
+        if self._reader is None:
+            self._reader = open(self.path, 'rb')
+        self._writer.flush()
+        start, end = self.offsets[index], self.offsets[index + 1]
+        self._reader.seek(start)
+        return self._reader.read(end - start).decode("utf-8")
+
+    def close(self):
+        """关闭文件；临时文件同时删除（可重复调用）"""
+        self._writer.close()
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+        if self.owns_file:
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+            self.owns_file = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class JobRecord:
+    """单个岗位的轻量视图（只保存存储引用和行号，字段按需解码）"""
+
+    __slots__ = ("store", "row")
+
+    def __init__(self, store: "JobStore", row: int):
+        self.store = store
+        self.row = row
+
+    def __getitem__(self, field: str):
+        return self.store.get_field(self.row, field)
+
+    def get(self, field: str, default=None):
+        try:
+            return self[field]
+        except KeyError:
+            return default
+
+    @property
+    def job_description(self) -> str:
+        return self.store.descriptions.get(self.row)
+
+    def to_dict(self, with_description: bool = False) -> Dict:
+        return self.store.to_dict(self.row, with_description=with_description)
+
+
+class JobStore:
+    """
+    列式岗位存储
+
+    - ENCODED_FIELDS 中的每个字段：一个 array('i') 编码列 + 对应的 StringPool
+    - skills：skill_offsets[i]:skill_offsets[i+1] 是第i个岗位在 skill_codes 中的技能编码
+    - job_description：DescriptionBlobStore，按需读取
+    """
+
+    def __init__(self, jobs: Iterable[Dict] = None, description_path: str = None):
+        self.pools = {field: StringPool() for field in ENCODED_FIELDS}
+        self.columns = {field: array('i') for field in ENCODED_FIELDS}
+        self.skill_pool = StringPool()
+        self.skill_codes = array('i')
+        self.skill_offsets = array('q', [0])
+        self.descriptions = DescriptionBlobStore(description_path)
+
+        for job in jobs or []:
+            self.append(job)
+
+    def __len__(self) -> int:
+        return len(self.skill_offsets) - 1
+
+    def __getitem__(self, row: int) -> JobRecord:
+        if not 0 <= row < len(self):
+            raise IndexError(row)
+        return JobRecord(self, row)
+
+    def append(self, job: Dict) -> int:
+        """追加一个岗位，返回行号"""
+        for field in ENCODED_FIELDS:
+            self.columns[field].append(self.pools[field].encode(job.get(field, "")))
+        self.skill_codes.extend(self.skill_pool.encode(skill) for skill in job.get("skills", []))
+        self.skill_offsets.append(len(self.skill_codes))
+        self.descriptions.append(job.get("job_description", ""))
+        return len(self) - 1
+
+    def skills(self, row: int) -> List[str]:
+        start, end = self.skill_offsets[row], self.skill_offsets[row + 1]
+        decode = self.skill_pool.values
+        return [decode[code] for code in self.skill_codes[start:end]]
+
+    def get_field(self, row: int, field: str):
+        """读取单个字段"""
+        if field in self.columns:
+            return self.pools[field].values[self.columns[field][row]]
+        if field == "skills":
+            return self.skills(row)
+        if field == "job_description":
+            return self.descriptions.get(row)
+        raise KeyError(field)
+
+    def to_dict(self, row: int, with_description: bool = False) -> Dict:
+        """还原成与 simulate_job_listings 相同结构的岗位字典"""
+        job = {field: self.pools[field].values[self.columns[field][row]] for field in ENCODED_FIELDS}
+        job["skills"] = self.skills(row)
+        if with_description:
+            job["job_description"] = self.descriptions.get(row)
+        return job
+
+    def iter_jobs(self, with_description: bool = False) -> Iterator[Dict]:
+        """
+        逐个产出岗位字典，可直接交给 analyze_skill_requirements_stream 等流式分析；
+        默认不读取描述
+        """
+        for row in range(len(self)):
+            yield self.to_dict(row, with_description=with_description)
+
+    def nbytes(self) -> int:
+        """编码列和技能数组占用的字节数（不含字符串池和描述文件）"""
+        total = sum(column.buffer_info()[1] * column.itemsize for column in self.columns.values())
+        total += self.skill_codes.buffer_info()[1] * self.skill_codes.itemsize
+        total += self.skill_offsets.buffer_info()[1] * self.skill_offsets.itemsize
+        total += self.descriptions.offsets.buffer_info()[1] * self.descriptions.offsets.itemsize
+        return total
+
+    def close(self):
+        self.descriptions.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ======================================================================================
+# 内存测试
+# ======================================================================================
+
+def _generate_jobs(n: int) -> Iterator[Dict]:
+    """模拟从JSON加载的岗位：每个岗位的字符串都是独立对象（与真实抓取/读取一致）"""
+    from shanghai_data_jobs_scraper import simulate_job_listings
+
+    samples = [json.dumps(job, ensure_ascii=False) for job in simulate_job_listings()]
+    for i in range(n):
+        job = json.loads(samples[i % len(samples)])
+        job["job_description"] += f"\nJob ID: {i}"
+        yield job
+
+
+def measure_memory(n: int = 100_000) -> Dict:
+    """对比 list-of-dicts 与 JobStore 在n个岗位上的内存占用（tracemalloc）"""
+    tracemalloc.start()
+    jobs = list(_generate_jobs(n))
+    dict_bytes = tracemalloc.get_traced_memory()[0]
+    del jobs
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    with JobStore(_generate_jobs(n)) as store:
+        store_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        description_file_bytes = os.path.getsize(store.descriptions.path)
+
+    return {
+        "postings": n,
+        "list_of_dicts_mb": round(dict_bytes / 1024 / 1024, 1),
+        "job_store_mb": round(store_bytes / 1024 / 1024, 1),
+        "description_file_mb": round(description_file_bytes / 1024 / 1024, 1),
+    }
+
+
+def main():
+    """主函数：内存对比"""
+    print("📦 内存占用对比（100,000个岗位）...")
+    result = measure_memory()
+    print(f"  list-of-dicts: {result['list_of_dicts_mb']} MB")
+    print(f"  JobStore:      {result['job_store_mb']} MB（描述另存于磁盘 {result['description_file_mb']} MB）")
+
+
+if __name__ == "__main__":
+    main()
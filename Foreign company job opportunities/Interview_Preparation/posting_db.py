@@ -0,0 +1,483 @@
+#!/usr/bin/env python3
+"""
+基于SQLite的岗位库
+岗位、公司（get_target_companies）、技能和 岗位-技能 关联表持久化在本地数据库中：
+- company、posted_date、skill 上建索引，按公司/日期/技能筛选不必扫描全部岗位
+- job_description 建 FTS5 全文索引（trigram 分词，中英文都可以按子串检索；
+  区分大小写且不保存词位置，检索结果与 Python 的 `in` 一致，索引体积和写入耗时约减半）
+- 批量导入用 executemany，每批一个事务；(公司, 职位, 发布日期, 来源, 描述哈希) 唯一，
+  重复导入同一批岗位（如再次导入同一个 JSONL）不会产生重复记录
+- analyze_skill_requirements 可以直接接收数据库或查询，技能计数和薪资聚合在SQL中完成
+"""
+
+import hashlib
+import json
+import os
+import random
+import sqlite3
+import time
+from typing import List, Dict, Iterable, Iterator, Tuple
+
+from salary_parser import parse_salary
+
+
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "postings.db")
+
+# 每个事务写入的岗位数
+DEFAULT_BATCH_SIZE = 5000
+
+# 技能首次出现顺序的排序键：岗位id * _POSITION_BASE + 技能在岗位中的位置
+_POSITION_BASE = 1 << 16
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS companies (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE,
+    cn_name TEXT,
+    industry TEXT
+);
+CREATE TABLE IF NOT EXISTS postings (
+    id INTEGER PRIMARY KEY,
+    company_id INTEGER NOT NULL REFERENCES companies(id),
+    position TEXT,
+    location TEXT,
+    salary_range TEXT,
+    salary_low REAL,
+    salary_high REAL,
+    posted_date TEXT,
+    source TEXT,
+    job_description TEXT,
+    description_hash INTEGER
+);
+CREATE TABLE IF NOT EXISTS skills (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS posting_skill (
+    posting_id INTEGER NOT NULL REFERENCES postings(id),
+    position INTEGER NOT NULL,
+    skill_id INTEGER NOT NULL REFERENCES skills(id),
+    PRIMARY KEY (posting_id, position)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_postings_company ON postings(company_id);
+CREATE INDEX IF NOT EXISTS idx_postings_posted_date ON postings(posted_date);
+CREATE INDEX IF NOT EXISTS idx_posting_skill_skill ON posting_skill(skill_id);
+CREATE VIRTUAL TABLE IF NOT EXISTS postings_fts USING fts5(
+    job_description, content='postings', content_rowid='id',
+    tokenize='trigram case_sensitive 1', detail=none
+);
+"""
+
+# 岗位的自然键；旧版本创建的库先补齐 description_hash 并删除重复岗位再建索引
+_UNIQUE_INDEX = (
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_postings_natural_key "
+    "ON postings(company_id, position, posted_date, source, description_hash)"
+)
+
+
+def _description_hash(description: str) -> int:
+    """岗位描述的64位哈希（有符号，可直接存入SQLite INTEGER）"""
+    return int.from_bytes(hashlib.blake2b(description.encode("utf-8"), digest_size=8).digest(), "little", signed=True)
+
+
+def _glob_pattern(text: str) -> str:
+    """子串检索的 GLOB 模式（转义通配符）；FTS5 trigram 索引直接支持 GLOB，少于3个字符时退化为逐行匹配"""
+    return "*" + "".join(f"[{ch}]" if ch in "*?[" else ch for ch in text) + "*"
+
+
+class PostingQuery:
+    """
+    岗位库上的筛选条件（惰性执行）
+
+    可以直接迭代得到岗位字典，也可以交给 analyze_skill_requirements，
+    由 skill_analysis_stats() 在SQL中完成计数。
+    """
+
+    def __init__(self, db: "PostingDatabase", company: str = None, since: str = None, until: str = None,
+                 skill: str = None, text: str = None):
+        self.db = db
+        conditions, params = [], []
+        if company is not None:
+            conditions.append("p.company_id = (SELECT id FROM companies WHERE name = ?)")
+            params.append(company)
+        if since is not None:
+            conditions.append("p.posted_date >= ?")
+            params.append(since)
+        if until is not None:
+            conditions.append("p.posted_date <= ?")
+            params.append(until)
+        if skill is not None:
+            conditions.append("p.id IN (SELECT posting_id FROM posting_skill "
+                              "WHERE skill_id = (SELECT id FROM skills WHERE name = ?))")
+            params.append(skill)
+        if text is not None:
+            conditions.append("p.id IN (SELECT rowid FROM postings_fts WHERE job_description GLOB ?)")
+            params.append(_glob_pattern(text))
+        self.where = " AND ".join(conditions)
+        self.params = params
+
+    def _sql(self, select: str, suffix: str = "") -> str:
+        sql = f"SELECT {select} FROM postings p"
+        if self.where:
+            sql += f" WHERE {self.where}"
+        return sql + suffix
+
+    def __iter__(self) -> Iterator[Dict]:
+        return self.iter_jobs()
+
+    def iter_jobs(self, with_description: bool = True) -> Iterator[Dict]:
+        """按导入顺序逐个产出岗位字典（与 simulate_job_listings 结构一致）"""
+        return self.db._iter_rows(self._sql("p.id", " ORDER BY p.id"), self.params, with_description)
+
+    def count(self) -> int:
+        return self.db.conn.execute(self._sql("COUNT(*)"), self.params).fetchone()[0]
+
+    def skill_counts(self) -> Dict[str, int]:
+        """技能 → 出现次数，按技能在筛选结果中首次出现的顺序排列（与逐个岗位计数的插入顺序一致）"""
+        sql = (
+            "SELECT s.name, COUNT(*) FROM posting_skill ps JOIN skills s ON s.id = ps.skill_id"
+            + (f" WHERE ps.posting_id IN ({self._sql('p.id')})" if self.where else "")
+            + f" GROUP BY ps.skill_id ORDER BY MIN(ps.posting_id * {_POSITION_BASE} + ps.position)"
+        )
+        return dict(self.db.conn.execute(sql, self.params))
+
+    def salary_stats(self) -> Tuple:
+        """(可解析薪资的岗位数, 下限之和, 上限之和, 最低下限, 最高上限)"""
+        where = " AND ".join(filter(None, [self.where, "p.salary_low IS NOT NULL"]))
+        sql = ("SELECT COUNT(*), TOTAL(p.salary_low), TOTAL(p.salary_high), MIN(p.salary_low), MAX(p.salary_high) "
+               f"FROM postings p WHERE {where}")
+        n, sum_low, sum_high, min_low, max_high = self.db.conn.execute(sql, self.params).fetchone()
+        return n, sum_low, sum_high, min_low, max_high
+
+    def skill_analysis_stats(self) -> Tuple[int, Dict[str, int], Tuple]:
+        """summarize_skill_analysis 的参数：(岗位数, 技能计数, 薪资聚合值)"""
+        return self.count(), self.skill_counts(), self.salary_stats()
+
+
+class PostingDatabase:
+    """
+    SQLite 岗位库
+
+    公司和技能的名称 → id 映射缓存在内存中，导入时为新岗位、新公司、新技能直接分配id，
+    每批岗位只需几次 executemany。已存在的岗位（自然键相同）导入时跳过。
+    """
+
+    def __init__(self, path: str = DEFAULT_DB_PATH):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.execute("PRAGMA synchronous = NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._ensure_unique_index()
+
+        self._company_ids: Dict[str, int] = dict(self.conn.execute("SELECT name, id FROM companies"))
+        self._skill_ids: Dict[str, int] = dict(self.conn.execute("SELECT name, id FROM skills"))
+        self._next_posting_id = self.conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM postings").fetchone()[0]
+        if not self._company_ids:
+            from shanghai_data_jobs_scraper import get_target_companies
+            self.add_companies(get_target_companies())
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM postings").fetchone()[0]
+
+    # ---------------------------------------------------------------- 写入
+
+    def _ensure_unique_index(self):
+        """创建自然键唯一索引；旧版本的库（没有 description_hash 或已有重复岗位）先迁移"""
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(postings)")]
+        with self.conn:
+            if "description_hash" not in columns:
+                self.conn.execute("ALTER TABLE postings ADD COLUMN description_hash INTEGER")
+                rows = self.conn.execute("SELECT id, job_description FROM postings").fetchall()
+                self.conn.executemany("UPDATE postings SET description_hash = ? WHERE id = ?",
+                                      [(_description_hash(description or ""), posting_id)
+                                       for posting_id, description in rows])
+            try:
+                self.conn.execute(_UNIQUE_INDEX)
+                return
+            except sqlite3.IntegrityError:
+                pass
+            # 每个自然键只保留最先导入的岗位
+            duplicates = self.conn.execute(
+                "SELECT id, job_description FROM postings WHERE id NOT IN ("
+                "SELECT MIN(id) FROM postings GROUP BY company_id, position, posted_date, source, description_hash)"
+            ).fetchall()
+            self.conn.executemany(
+                "INSERT INTO postings_fts (postings_fts, rowid, job_description) VALUES ('delete', ?, ?)", duplicates
+            )
+            self.conn.executemany("DELETE FROM posting_skill WHERE posting_id = ?", [(row[0],) for row in duplicates])
+            self.conn.executemany("DELETE FROM postings WHERE id = ?", [(row[0],) for row in duplicates])
+            self.conn.execute(_UNIQUE_INDEX)
+
+    def add_companies(self, companies: Iterable[Dict]):
+        """导入公司（get_target_companies 格式），已存在的公司更新中文名和行业"""
+        rows = []
+        for company in companies:
+            company_id = self._company_ids.setdefault(company["name"], len(self._company_ids) + 1)
+            rows.append((company_id, company["name"], company.get("cn_name"), company.get("industry")))
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO companies (id, name, cn_name, industry) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET cn_name = excluded.cn_name, industry = excluded.industry",
+                rows,
+            )
+
+    def add_jobs(self, jobs: Iterable[Dict], batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+        """
+        批量导入岗位：每 batch_size 个岗位一个事务，岗位、岗位-技能、全文索引各一次 executemany
+
+        岗位表用 INSERT OR IGNORE 写入，已存在的岗位（公司、职位、发布日期、来源和描述都相同）被跳过，
+        再只为实际写入的岗位写技能和全文索引。
+
+        Returns:
+            新导入的岗位数（不含跳过的重复岗位）
+        """
+        total = 0
+        batch = []
+        for job in jobs:
+            batch.append(job)
+            if len(batch) >= batch_size:
+                total += self._insert_batch(batch)
+                batch = []
+        if batch:
+            total += self._insert_batch(batch)
+        return total
+
+    def _insert_batch(self, jobs: List[Dict]) -> int:
+        new_companies, new_skills = [], []
+        posting_rows, skill_rows, fts_rows = [], [], []
+        company_ids, skill_ids = self._company_ids, self._skill_ids
+        first_id = posting_id = self._next_posting_id
+
+        for job in jobs:
+            company = job.get("company", "")
+            company_id = company_ids.get(company)
+            if company_id is None:
+                company_id = company_ids[company] = len(company_ids) + 1
+                new_companies.append((company_id, company, job.get("cn_company", company)))
+
+            parsed = parse_salary(job.get("salary_range", ""))
+            low, high = (parsed[0], parsed[1]) if parsed else (None, None)
+            description = job.get("job_description", "")
+            posting_rows.append((posting_id, company_id, job.get("position", ""), job.get("location", ""),
+                                 job.get("salary_range", ""), low, high, job.get("posted_date", ""),
+                                 job.get("source", ""), description, _description_hash(description)))
+            fts_rows.append((posting_id, description))
+
+            for position, skill in enumerate(job.get("skills", [])):
+                skill_id = skill_ids.get(skill)
+                if skill_id is None:
+                    skill_id = skill_ids[skill] = len(skill_ids) + 1
+                    new_skills.append((skill_id, skill))
+                skill_rows.append((posting_id, position, skill_id))
+            posting_id += 1
+
+        with self.conn:
+            self.conn.executemany("INSERT INTO companies (id, name, cn_name) VALUES (?, ?, ?)", new_companies)
+            self.conn.executemany("INSERT INTO skills (id, name) VALUES (?, ?)", new_skills)
+            cursor = self.conn.executemany(
+                "INSERT OR IGNORE INTO postings VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", posting_rows
+            )
+            if cursor.rowcount < len(posting_rows):
+                inserted = {row[0] for row in self.conn.execute(
+                    "SELECT id FROM postings WHERE id >= ? AND id < ?", (first_id, posting_id))}
+                skill_rows = [row for row in skill_rows if row[0] in inserted]
+                fts_rows = [row for row in fts_rows if row[0] in inserted]
+            self.conn.executemany("INSERT INTO posting_skill VALUES (?, ?, ?)", skill_rows)
+            self.conn.executemany("INSERT INTO postings_fts (rowid, job_description) VALUES (?, ?)", fts_rows)
+        self._next_posting_id = posting_id
+        return len(fts_rows)
+
+    # ---------------------------------------------------------------- 查询
+
+    def query(self, company: str = None, since: str = None, until: str = None, skill: str = None,
+              text: str = None) -> PostingQuery:
+        """
+        按条件筛选岗位（条件之间为 AND）
+
+        Args:
+            company: 公司名称
+            since / until: posted_date 范围（含两端，YYYY-MM-DD）
+            skill: 要求的技能
+            text: 岗位描述中包含的文本（FTS5全文检索）
+        """
+        return PostingQuery(self, company, since, until, skill, text)
+
+    def __iter__(self) -> Iterator[Dict]:
+        return iter(self.query())
+
+    def skill_analysis_stats(self) -> Tuple[int, Dict[str, int], Tuple]:
+        """全部岗位的 summarize_skill_analysis 参数"""
+        return self.query().skill_analysis_stats()
+
+    def search(self, text: str, limit: int = 20) -> List[Dict]:
+        """全文检索岗位描述，按导入顺序返回前 limit 个包含 text 的岗位"""
+        sql = "SELECT rowid FROM postings_fts WHERE job_description GLOB ? ORDER BY rowid LIMIT ?"
+        ids = [row[0] for row in self.conn.execute(sql, (_glob_pattern(text), limit))]
+        return [job for _, job in self._fetch(ids, with_description=True)]
+
+    def company_counts(self) -> Dict[str, int]:
+        """各公司的岗位数（按岗位数从多到少）"""
+        sql = ("SELECT c.name, COUNT(*) AS n FROM postings p JOIN companies c ON c.id = p.company_id "
+               "GROUP BY p.company_id ORDER BY n DESC, c.id")
+        return dict(self.conn.execute(sql))
+
+    def _fetch(self, ids: List[int], with_description: bool) -> Iterator[Tuple[int, Dict]]:
+        """读取一组岗位（含技能），产出 (岗位id, 岗位字典)"""
+        if not ids:
+            return
+        placeholders = ",".join("?" * len(ids))
+        skills: Dict[int, List[str]] = {}
+        for posting_id, name in self.conn.execute(
+                "SELECT ps.posting_id, s.name FROM posting_skill ps JOIN skills s ON s.id = ps.skill_id "
+                f"WHERE ps.posting_id IN ({placeholders}) ORDER BY ps.posting_id, ps.position", ids):
+            skills.setdefault(posting_id, []).append(name)
+
+        description = "p.job_description" if with_description else "NULL"
+        sql = ("SELECT p.id, c.name, c.cn_name, p.position, p.location, p.salary_range, p.posted_date, "
+               f"{description}, p.source FROM postings p JOIN companies c ON c.id = p.company_id "
+               f"WHERE p.id IN ({placeholders}) ORDER BY p.id")
+        for row in self.conn.execute(sql, ids):
+            job = {
+                "company": row[1],
+                "cn_company": row[2],
+                "position": row[3],
+                "location": row[4],
+                "salary_range": row[5],
+                "posted_date": row[6],
+            }
+            if with_description:
+                job["job_description"] = row[7]
+            job["skills"] = skills.get(row[0], [])
+            job["source"] = row[8]
+            yield row[0], job
+
+    def _iter_rows(self, id_sql: str, params: List, with_description: bool,
+                   chunk_size: int = 500) -> Iterator[Dict]:
+        """按 id_sql 选出的岗位id分块读取岗位"""
+        cursor = self.conn.execute(id_sql, params)
+        while True:
+            ids = [row[0] for row in cursor.fetchmany(chunk_size)]
+            if not ids:
+                return
+            for _, job in self._fetch(ids, with_description):
+                yield job
+
+
+def open_posting_database(path: str = DEFAULT_DB_PATH) -> PostingDatabase:
+    """打开（不存在时创建）岗位库"""
+    return PostingDatabase(path)
+
+
+# ======================================================================================
+# 性能测试
+# ======================================================================================
+
+def _generate_jobs(n: int, seed: int = 42) -> Iterator[Dict]:
+    """在模拟岗位的基础上生成n个岗位（公司、日期、技能、描述各不相同）"""
+    from datetime import date, timedelta
+    from shanghai_data_jobs_scraper import simulate_job_listings, get_target_companies
+
+    rng = random.Random(seed)
+    samples = simulate_job_listings()
+    companies = get_target_companies()
+    extra_skills = [f"Skill {i}" for i in range(2000)]
+    first = date(2025, 1, 1)
+    for i in range(n):
+        sample = samples[i % len(samples)]
+        company = companies[rng.randrange(len(companies))]
+        yield dict(
+            sample,
+            company=company["name"],
+            cn_company=company["cn_name"],
+            posted_date=(first + timedelta(days=rng.randrange(400))).isoformat(),
+            skills=sample["skills"] + rng.sample(extra_skills, 4),
+            job_description=sample["job_description"] + f"\nRequisition {i}: {' '.join(rng.sample(extra_skills, 5))}",
+        )
+
+
+def benchmark_posting_db(n: int = 100_000) -> Dict:
+    """
+    测量：批量导入耗时；全量技能分析（读JSONL重新扫描 vs SQL计数）；
+    按公司 + 日期筛选后的技能分析；全文检索（Python子串扫描 vs FTS5）
+    """
+    import tempfile
+    from shanghai_data_jobs_scraper import analyze_skill_requirements, iter_job_listings_jsonl
+
+    result = {"postings": n}
+    with tempfile.TemporaryDirectory() as tmp:
+        jsonl_path = os.path.join(tmp, "postings.jsonl")
+        with open(jsonl_path, 'w', encoding='utf-8') as f:
+            for job in _generate_jobs(n):
+                f.write(json.dumps(job, ensure_ascii=False) + "\n")
+
+        with PostingDatabase(os.path.join(tmp, "postings.db")) as db:
+            start = time.perf_counter()
+            db.add_jobs(iter_job_listings_jsonl(jsonl_path))
+            result["ingest_seconds"] = round(time.perf_counter() - start, 2)
+            # 重复导入同一个文件：全部跳过，计数不变
+            start = time.perf_counter()
+            assert db.add_jobs(iter_job_listings_jsonl(jsonl_path)) == 0 and len(db) == n
+            result["reingest_seconds"] = round(time.perf_counter() - start, 2)
+
+            start = time.perf_counter()
+            scanned = analyze_skill_requirements(list(iter_job_listings_jsonl(jsonl_path)))
+            result["rescan_seconds"] = round(time.perf_counter() - start, 2)
+
+            start = time.perf_counter()
+            pushed = analyze_skill_requirements(db)
+            result["sql_seconds"] = round(time.perf_counter() - start, 2)
+            assert pushed == scanned
+
+            query = db.query(company="Microsoft", since="2025-06-01", until="2025-08-31")
+            start = time.perf_counter()
+            filtered = analyze_skill_requirements(query)
+            result["filtered_ms"] = round((time.perf_counter() - start) * 1000, 1)
+            assert filtered == analyze_skill_requirements(list(query))
+            result["filtered_postings"] = filtered["total_jobs"]
+
+            needle = "Skill 1234"
+            start = time.perf_counter()
+            expected = sum(1 for job in iter_job_listings_jsonl(jsonl_path) if needle in job["job_description"])
+            result["scan_search_ms"] = round((time.perf_counter() - start) * 1000, 1)
+            start = time.perf_counter()
+            matched = db.query(text=needle).count()
+            result["fts_search_ms"] = round((time.perf_counter() - start) * 1000, 1)
+            assert matched == expected
+            result["search_matches"] = matched
+    return result
+
+
+def main():
+    """主函数：导入模拟岗位并运行性能测试"""
+    import tempfile
+    from shanghai_data_jobs_scraper import simulate_job_listings, analyze_skill_requirements
+
+    with tempfile.TemporaryDirectory() as tmp, PostingDatabase(os.path.join(tmp, "postings.db")) as db:
+        db.add_jobs(simulate_job_listings())
+        print(f"🗄️  已导入 {len(db)} 个岗位")
+        top = list(analyze_skill_requirements(db)["skill_frequency"].items())[:5]
+        print(f"  Top 5 技能: {', '.join(f'{skill}({count})' for skill, count in top)}")
+        for job in db.search("Airflow", limit=3):
+            print(f"  🔍 Airflow: {job['company']} - {job['position']}")
+
+    print("\n⏱️  SQLite岗位库性能测试（100,000个岗位）...")
+    result = benchmark_posting_db()
+    print(f"  批量导入: {result['ingest_seconds']}s（重复导入同一文件: {result['reingest_seconds']}s，全部跳过）")
+    print(f"  全量技能分析: 读取JSONL重新扫描 {result['rescan_seconds']}s，SQL计数 {result['sql_seconds']}s")
+    print(f"  按公司+日期筛选后分析（{result['filtered_postings']}个岗位）: {result['filtered_ms']}ms")
+    print(f"  全文检索（{result['search_matches']}个匹配）: 逐条扫描 {result['scan_search_ms']}ms，"
+          f"FTS5 {result['fts_search_ms']}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -59,9 +59,6 @@ Output:
 4  David  35.0  NaN
 """
 
-import pandas as pd
-import numpy as np
-
 def clean_dataframe(df):
     """
     Solution 1: 数据清洗
@@ -83,6 +80,9 @@ def clean_dataframe(df):
 
 # Test
 def test_clean_dataframe():
+    import pandas as pd
+    import numpy as np
+
     data = {
         'name': ['Alice', 'Bob', 'Alice', None, 'David'],
         'age': [25.0, np.nan, 25.0, 30.0, 35.0],
@@ -147,6 +147,8 @@ def analyze_sales(df):
 
 # Test
 def test_analyze_sales():
+    import pandas as pd
+
     data = {
         'product': ['iPhone', 'MacBook', 'iPhone', 'AirPods', 'Desk'],
         'category': ['Electronics', 'Electronics', 'Electronics', 'Electronics', 'Furniture'],
@@ -194,6 +196,8 @@ def pivot_sales_data(df):
 
 # Test
 def test_pivot_sales():
+    import pandas as pd
+
     data = {
         'date': ['2024-01-01', '2024-01-01', '2024-01-02', '2024-01-02'],
         'product': ['A', 'B', 'A', 'B'],
@@ -233,6 +237,8 @@ def analyze_timeseries(df):
     """
     Solution 4: 时间序列分析
     """
+    import pandas as pd
+
     # Convert to datetime
     df['timestamp'] = pd.to_datetime(df['timestamp'])
     df = df.set_index('timestamp')
@@ -251,6 +257,9 @@ def analyze_timeseries(df):
 
 # Test
 def test_timeseries():
+    import pandas as pd
+    import numpy as np
+
     dates = pd.date_range('2024-01-01', periods=30, freq='12H')
     data = {
         'timestamp': dates,
@@ -296,6 +305,8 @@ def merge_order_data(orders, customers, products):
 
 # Test
 def test_merge_data():
+    import pandas as pd
+
     orders = pd.DataFrame({
         'order_id': [1, 2, 3],
         'customer_id': [101, 102, 101],
@@ -1000,6 +1011,8 @@ def parse_json_to_dataframe(json_strings):
     Time Complexity: O(n*m) where n is number of records, m is avg fields
     Space Complexity: O(n*m)
     """
+    import pandas as pd
+
     data = []
 
     for json_str in json_strings:
@@ -1066,6 +1079,8 @@ def validate_data(df):
     Time Complexity: O(n*m) where n is rows, m is columns
     Space Complexity: O(k) where k is number of errors
     """
+    import pandas as pd
+
     errors = {
         'null_values': {},
         'invalid_email': [],
@@ -1096,6 +1111,8 @@ def validate_data(df):
 
 # Test
 def test_validate_data():
+    import pandas as pd
+
     data = {
         'id': [1, 2, 3],
         'name': ['Alice', None, 'Charlie'],
@@ -1135,6 +1152,8 @@ def process_csv_file(input_file, output_file):
 
     This would be a complete ETL pipeline in real scenario
     """
+    import pandas as pd
+
     # Read CSV
     df = pd.read_csv(input_file)
 
@@ -1244,9 +1263,12 @@ def test_convert_sql():
 # 运行所有测试
 # ======================================================================================
 
-def run_all_tests():
+def run_all_tests(include_pandas: bool = True):
     """
     Run all test cases
+
+    include_pandas=False 时跳过依赖 pandas 的题目（第一部分和第五部分的前两题），
+    其余纯 Python 题目不需要安装 pandas
     """
     print("="*80)
     print("外企数据岗位 Python 笔试题库 - 测试运行")
@@ -1254,13 +1276,14 @@ def run_all_tests():
     print()
 
     # Part 1: Pandas/Numpy
-    print("第一部分：数据处理 (Pandas)")
-    print("-"*80)
-    test_clean_dataframe()
-    test_analyze_sales()
-    test_pivot_sales()
-    test_timeseries()
-    test_merge_data()
+    if include_pandas:
+        print("第一部分：数据处理 (Pandas)")
+        print("-"*80)
+        test_clean_dataframe()
+        test_analyze_sales()
+        test_pivot_sales()
+        test_timeseries()
+        test_merge_data()
 
     # Part 2: Strings and Lists
     print("\n第二部分：字符串和列表")
@@ -1290,8 +1313,9 @@ def run_all_tests():
     # Part 5: Real-world scenarios
     print("\n第五部分：实际场景")
     print("-"*80)
-    test_parse_json()
-    test_validate_data()
+    if include_pandas:
+        test_parse_json()
+        test_validate_data()
     test_convert_sql()
 
     print("="*80)
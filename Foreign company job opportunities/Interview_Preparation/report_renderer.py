@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+报告渲染
+报告先按顺序记录为块（标题、分隔线、文本、列表项、预排版文本），
+再按模板一次渲染成完整字符串，整体写入终端或文件，不再逐行 print / write。
+支持 text（与原来逐行输出的内容完全一致）、Markdown 和 HTML 三种格式
+"""
+
+import html
+import re
+import sys
+import time
+from typing import List, Dict, Tuple
+
+
+FORMATS = ("text", "markdown", "html")
+
+# 各格式对应的文件扩展名
+EXTENSIONS = {"text": ".txt", "markdown": ".md", "html": ".html"}
+
+# Markdown / HTML 的模板；列表和预排版文本需要把连续的块合并成一组，在 _render_markup 中处理。
+# text 格式直接输出块的原文（列表项为 缩进 + 标记 + 空格 + 文本），不经过模板
+TEMPLATES = {
+    "markdown": {
+        "heading": "{hashes} {text}\n",
+        "text": "{text}\n",
+        "item": "{indent}- {marker}{text}",
+        "pre": "{text}",
+        "pre_open": "```",
+        "pre_close": "```\n",
+    },
+    "html": {
+        "heading": "<h{level}>{text}</h{level}>",
+        "text": "<p>{text}</p>",
+        "item": "{indent}<li>{marker}{text}",
+        "item_close": "</li>",
+        "pre": "{text}",
+        "list_open": "{indent}<ul>",
+        "list_close": "{indent}</ul>",
+        "pre_open": "<pre>",
+        "pre_close": "</pre>",
+    },
+}
+
+# 列表标记在 Markdown / HTML 中的写法（• 和 - 为普通列表项，不保留标记）
+_MARKERS = {
+    "markdown": {"•": "", "-": "", "□": "[ ] "},
+    "html": {"•": "", "-": "", "□": "☐ "},
+}
+
+# Markdown 中任意位置都有含义的字符，以及只在行首有含义的写法（标题、引用、列表、有序列表）
+_MARKDOWN_INLINE = re.compile(r'[\\`*_\[\]<>|~]')
+_MARKDOWN_LINE_START = re.compile(r'^(\s*)(#|>|[-+](?=\s)|\d+(?=[.)](?:\s|$)))', re.MULTILINE)
+_LINE_START_CHARS = frozenset("#>-+0123456789")
+
+
+def escape_markdown(text: str) -> str:
+    """转义 Markdown 元字符，使技能名、里程碑等文本原样显示（如 *、_、行首的 "#"、"1."）"""
+    # 大多数文本不含元字符：先 search 一次，命中时才替换
+    if _MARKDOWN_INLINE.search(text):
+        text = _MARKDOWN_INLINE.sub(r'\\\g<0>', text)
+    if "\n" not in text and text.lstrip()[:1] not in _LINE_START_CHARS:
+        return text
+    # 有序列表在数字后面的 . 或 ) 前加反斜杠，其他写法在符号前加
+    return _MARKDOWN_LINE_START.sub(
+        lambda m: m.group(1) + (m.group(2) + "\\" if m.group(2)[0].isdigit() else "\\" + m.group(2)), text
+    )
+
+
+class Report:
+    """
+    报告文档
+
+    text 格式下每个块对应原来的一次 print（多行文本块对应一次多行 print），
+    Markdown / HTML 下分隔线和空行省略，结构由标题层级和列表表达。
+    """
+
+    def __init__(self):
+        # (类型, 文本, 参数)
+        self.blocks: List[Tuple[str, str, Dict]] = []
+
+    def rule(self, char: str = "=", width: int = 100):
+        """分隔线"""
+        self.blocks.append(("rule", char * width, {}))
+        return self
+
+    def heading(self, text: str, level: int = 2):
+        """标题；text 格式下原样输出一行"""
+        self.blocks.append(("heading", text, {"level": level}))
+        return self
+
+    def text(self, text: str):
+        """普通文本行"""
+        self.blocks.append(("text", text, {}))
+        return self
+
+    def item(self, text: str, marker: str = "•", indent: int = 2):
+        """列表项；text 格式下输出为 缩进 + 标记 + 空格 + 文本"""
+        self.blocks.append(("item", text, {"marker": marker, "indent": indent}))
+        return self
+
+    def pre(self, text: str):
+        """预排版文本（如多行说明、对齐的表格行），各格式下都保持原有换行和空格"""
+        self.blocks.append(("pre", text, {}))
+        return self
+
+    def blank(self, count: int = 1):
+        """空行"""
+        for _ in range(count):
+            self.blocks.append(("blank", "", {}))
+        return self
+
+    # ---------------------------------------------------------------- 渲染
+
+    def render(self, fmt: str = "text") -> str:
+        """把整个报告渲染为一个字符串"""
+        if fmt == "text":
+            return self._render_text()
+        if fmt in ("markdown", "html"):
+            return self._render_markup(fmt)
+        raise ValueError(f"不支持的格式: {fmt}（可选: {', '.join(FORMATS)}）")
+
+    def _render_text(self) -> str:
+        chunks = [text if kind != "item" else f"{' ' * params['indent']}{params['marker']} {text}"
+                  for kind, text, params in self.blocks]
+        chunks.append("")
+        return "\n".join(chunks)
+
+    def _render_markup(self, fmt: str) -> str:
+        templates, markers = TEMPLATES[fmt], _MARKERS[fmt]
+        escape = html.escape if fmt == "html" else escape_markdown
+        chunks = []
+        open_lists: List[int] = []   # 当前打开的列表的缩进
+        # HTML：每个打开的列表中最后一个 <li> 是否还未关闭，以及其中是否嵌套了子列表
+        open_items: List[bool] = []
+        nested_items: List[bool] = []
+        in_pre = False
+
+        def close_item():
+            """关闭当前列表中最后一个 <li>（嵌套的子列表放在 <li> 里面）"""
+            if open_items and open_items[-1]:
+                if nested_items[-1]:
+                    chunks.append("  " * (len(open_lists) - 1) + templates["item_close"])
+                else:
+                    chunks[-1] += templates["item_close"]
+                open_items[-1] = nested_items[-1] = False
+
+        def close_lists(down_to: int = -1):
+            """关闭缩进大于 down_to 的列表；Markdown 列表结束时空一行"""
+            closed = False
+            while open_lists and open_lists[-1] > down_to:
+                if fmt == "html":
+                    close_item()
+                open_lists.pop()
+                open_items.pop()
+                nested_items.pop()
+                closed = True
+                if fmt == "html":
+                    chunks.append(templates["list_close"].format(indent="  " * len(open_lists)))
+            if closed and not open_lists and fmt == "markdown":
+                chunks.append("")
+
+        for kind, text, params in self.blocks:
+            if kind in ("rule", "blank"):
+                continue
+            if kind != "pre" and in_pre:
+                chunks.append(templates["pre_close"])
+                in_pre = False
+            if kind != "item" and open_lists:
+                close_lists()
+
+            if kind == "item":
+                indent = params["indent"]
+                close_lists(indent)
+                if not open_lists or open_lists[-1] < indent:
+                    if fmt == "html":
+                        if open_items and open_items[-1]:
+                            nested_items[-1] = True
+                        chunks.append(templates["list_open"].format(indent="  " * len(open_lists)))
+                    open_lists.append(indent)
+                    open_items.append(False)
+                    nested_items.append(False)
+                elif fmt == "html":
+                    close_item()
+                marker = params["marker"]
+                # 预定义的标记是目标格式的语法（如 Markdown 任务列表 "[ ] "），其他标记按文本转义
+                marker = markers[marker] if marker in markers else escape(marker + " ")
+                chunks.append(templates["item"].format(indent="  " * (len(open_lists) - 1), marker=marker,
+                                                       text=escape(text)))
+                open_items[-1] = True
+            elif kind == "heading":
+                level = params["level"]
+                chunks.append(templates["heading"].format(hashes="#" * level, level=level, text=escape(text.strip())))
+            elif kind == "text":
+                chunks.append(templates["text"].format(text=escape(text.strip())))
+            elif kind == "pre":
+                if not in_pre:
+                    chunks.append(templates["pre_open"])
+                    in_pre = True
+                chunks.append(templates["pre"].format(text=escape(text.strip("\n"))))
+
+        if in_pre:
+            chunks.append(templates["pre_close"])
+        if open_lists:
+            close_lists()
+        body = "\n".join(chunks).strip("\n") + "\n"
+        if fmt == "html":
+            return ('<!DOCTYPE html>\n<html lang="zh-CN">\n<head><meta charset="utf-8"></head>\n<body>\n'
+                    + body + "</body>\n</html>\n")
+        return body
+
+    # ---------------------------------------------------------------- 输出
+
+    def print(self, fmt: str = "text", stream=None):
+        """一次写入终端（或 stream）"""
+        (stream or sys.stdout).write(self.render(fmt))
+
+    def save(self, filename: str, fmt: str = "text"):
+        """一次写入文件"""
+        with open(filename, 'w', encoding='utf-8') as f:
+            f.write(self.render(fmt))
+
+
+# ======================================================================================
+# 性能测试
+# ======================================================================================
+
+def _large_learning_plan(months: int = 60, skills_per_month: int = 40) -> Dict:
+    """生成一个很大的学习计划（结构与 generate_learning_plan 的结果一致）"""
+    from shanghai_data_jobs_scraper import simulate_job_listings, analyze_skill_requirements, identify_skill_gaps
+    from shanghai_data_jobs_scraper import generate_learning_plan
+
+    skill_analysis = analyze_skill_requirements(simulate_job_listings())
+    plan = generate_learning_plan(identify_skill_gaps({"SQL"}, skill_analysis["skill_frequency"]), 6)
+    template = next(details for details in plan["monthly_plan"].values() if details["skills"])
+    skills = [dict(template["skills"][i % len(template["skills"])], skill=f"Skill {i}")
+              for i in range(skills_per_month)]
+    plan["monthly_plan"] = {
+        f"第{m}个月": dict(template, skills=skills, milestones=[f"里程碑 {m}-{k}" for k in range(5)])
+        for m in range(1, months + 1)
+    }
+    return plan
+
+
+def benchmark_rendering(months: int = 60, skills_per_month: int = 40, repeat: int = 5) -> Dict:
+    """
+    对一个大学习计划比较原来的逐行输出与 构建 + 一次渲染 + 一次写入 的耗时：
+    - 终端：逐行 print 到行缓冲流 vs Report.print
+    - 文件：逐行 f.write vs Report.save
+    逐行输出的耗时只包含输出已经生成好的行，不含拼接每行文本；
+    并分别测量 text / Markdown / HTML 的渲染耗时
+    """
+    import os
+    import tempfile
+    from shanghai_data_jobs_scraper import build_learning_plan_text
+
+    plan = _large_learning_plan(months, skills_per_month)
+    report = build_learning_plan_text(plan, months)
+    lines = report.render("text").split("\n")[:-1]
+    result = {"blocks": len(report.blocks), "lines": len(lines)}
+
+    def best(func) -> float:
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+        return min(timings)
+
+    with open(os.devnull, 'w', encoding='utf-8', buffering=1) as stream:
+        def print_per_line():
+            for line in lines:
+                print(line, file=stream)
+
+        result["print_per_line_ms"] = round(best(print_per_line) * 1000, 2)
+        result["print_single_buffer_ms"] = round(
+            best(lambda: build_learning_plan_text(plan, months).print(stream=stream)) * 1000, 2)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, "plan.txt")
+
+        def write_per_line():
+            with open(filename, 'w', encoding='utf-8') as f:
+                for line in lines:
+                    f.write(line + "\n")
+
+        result["write_per_line_ms"] = round(best(write_per_line) * 1000, 2)
+        result["write_single_buffer_ms"] = round(
+            best(lambda: build_learning_plan_text(plan, months).save(filename)) * 1000, 2)
+
+    for fmt in FORMATS:
+        result[f"render_{fmt}_ms"] = round(best(lambda: report.render(fmt)) * 1000, 2)
+    return result
+
+
+def main():
+    """主函数：运行渲染性能测试"""
+    print("⏱️  报告渲染性能测试（60个月 × 每月40项技能的学习计划）...")
+    result = benchmark_rendering()
+    print(f"  {result['blocks']} 个块，{result['lines']} 行")
+    print(f"  终端: 逐行 print（不含拼接）{result['print_per_line_ms']}ms，"
+          f"构建 + 一次写入 {result['print_single_buffer_ms']}ms")
+    print(f"  文件: 逐行 write（不含拼接）{result['write_per_line_ms']}ms，"
+          f"构建 + 一次写入 {result['write_single_buffer_ms']}ms")
+    for fmt in FORMATS:
+        print(f"  渲染 {fmt}: {result[f'render_{fmt}_ms']}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+简历与岗位的批量匹配打分
+每份简历（resume/resume_template.md 和 resume/versions/*.docx）只解析一次，提取为技能和关键词向量；
+岗位索引为 岗位 × 技能、岗位 × 关键词 的稀疏（CSR）矩阵，所有简历对所有岗位的得分按块一次算出，
+再返回每份简历排名靠前的岗位及其已匹配/缺失技能
+"""
+
+import glob
+import os
+import random
+import re
+import time
+import zipfile
+from typing import List, Dict, Iterable, Optional, Tuple
+from xml.etree import ElementTree
+
+import numpy as np
+
+from skill_extractor import get_skill_extractor
+from skill_taxonomy import KeywordMatcher, get_skill_taxonomy, normalize_text
+
+
+RESUME_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "resume")
+
+_WORD_NAMESPACE = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+
+def read_docx_text(path: str) -> str:
+    """读取 .docx 的正文文本（每个段落一行），只依赖标准库 zipfile + xml"""
+    with zipfile.ZipFile(path) as docx:
+        root = ElementTree.fromstring(docx.read("word/document.xml"))
+    paragraphs = []
+    for paragraph in root.iter(f"{_WORD_NAMESPACE}p"):
+        paragraphs.append("".join(node.text or "" for node in paragraph.iter(f"{_WORD_NAMESPACE}t")))
+    return "\n".join(paragraphs)
+
+
+def load_resumes(resume_dir: str = RESUME_DIR) -> Dict[str, str]:
+    """
+    读取简历目录中的所有简历
+
+    Returns:
+        简历名称（文件名，不含扩展名） → 文本
+    """
+    resumes = {}
+    template = os.path.join(resume_dir, "resume_template.md")
+    if os.path.exists(template):
+        with open(template, 'r', encoding='utf-8') as f:
+            resumes["resume_template"] = f.read()
+    for path in sorted(glob.glob(os.path.join(resume_dir, "versions", "*.docx"))):
+        resumes[os.path.splitext(os.path.basename(path))[0]] = read_docx_text(path)
+    return resumes
+
+
+# 岗位名称中的资历/连接词不作为关键词
+_TITLE_STOPWORDS = {"senior", "junior", "sr", "jr", "lead", "principal", "staff", "intern", "associate",
+                    "and", "or", "of", "the", "for", "in", "i", "ii", "iii", "iv"}
+_KEYWORD_PATTERN = re.compile(r"[a-z][a-z0-9+#]*")
+
+
+def _keyword_terms(text: str) -> List[str]:
+    """岗位名称/简历文本 → 小写英文关键词（去掉资历词和连接词）"""
+    return [word for word in _KEYWORD_PATTERN.findall(text.lower()) if word not in _TITLE_STOPWORDS]
+
+
+class ResumeMatcher:
+    """
+    简历 × 岗位 技能与关键词匹配
+
+    技能统一为技能分类索引中的标准名称；岗位的技能为 skills 字段与描述中提取到的技能之并集。
+    简历的技能为技能提取器的结果，加上在简历文本中出现的岗位技能（skills 字段里不在提取器词典中的技能，
+    如 Excel、FMCG 也能匹配）；关键词为岗位名称中的词（如 data、engineer、analyst）。
+    得分 = 技能覆盖率 × (1 - keyword_weight) + 关键词覆盖率 × keyword_weight，
+    技能覆盖率与 identify_skill_gaps 的覆盖率含义一致。
+    """
+
+    def __init__(self, resumes: Dict[str, str], keyword_weight: float = 0.2):
+        """
+        Args:
+            resumes: 简历名称 → 简历文本（每份只解析一次）
+            keyword_weight: 岗位名称关键词在得分中的权重
+        """
+        self.extractor = get_skill_extractor()
+        self.taxonomy = get_skill_taxonomy()
+        self.keyword_weight = keyword_weight
+
+        # 技能词表：小写标准名 → 列号；names 为对应的展示名称
+        self.vocabulary: Dict[str, int] = {}
+        self.names: List[str] = []
+        # 尚未在简历文本中查找过的技能写法（小写） → 列号
+        self._pending_terms: Dict[str, int] = {}
+        # 关键词表：关键词 → 列号
+        self.keywords: Dict[str, int] = {}
+        self.keyword_names: List[str] = []
+
+        self.resume_names = list(resumes)
+        self._resume_texts = [normalize_text(text) for text in resumes.values()]
+        self._resume_words = [set(_keyword_terms(text)) for text in self._resume_texts]
+        self.resume_skills = [set(self._encode(self.extractor.extract(text), from_resume=True))
+                              for text in resumes.values()]
+
+        self.jobs: List[Dict] = []
+        self.job_skills: List[List[int]] = []
+        self.job_keywords: List[List[int]] = []
+        # 岗位 × 技能、岗位 × 关键词的 CSR 矩阵：(indptr, indices, 列数)
+        self._posting_matrix: Optional[Tuple[np.ndarray, np.ndarray, int]] = None
+        self._posting_keyword_matrix: Optional[Tuple[np.ndarray, np.ndarray, int]] = None
+
+    def _encode(self, skills: Iterable[str], from_resume: bool = False) -> List[int]:
+        """技能名列表 → 去重的列号列表（保持顺序）；岗位技能的写法记入待查找词表"""
+        columns = {}
+        for skill in skills:
+            name = self.taxonomy.canonical_name(skill)
+            key = normalize_text(name)
+            column = self.vocabulary.get(key)
+            if column is None:
+                column = self.vocabulary[key] = len(self.names)
+                self.names.append(name)
+                if not from_resume:
+                    self._pending_terms[key] = column
+            if not from_resume:
+                term = normalize_text(skill)
+                if term != key and term not in self._pending_terms:
+                    self._pending_terms[term] = column
+            columns[column] = None
+        return list(columns)
+
+    def _encode_keywords(self, title: str) -> List[int]:
+        columns = {}
+        for word in _keyword_terms(title):
+            column = self.keywords.get(word)
+            if column is None:
+                column = self.keywords[word] = len(self.keyword_names)
+                self.keyword_names.append(word)
+            columns[column] = None
+        return list(columns)
+
+    def index_postings(self, jobs: Iterable[Dict], extract_from_description: bool = True):
+        """
+        建立岗位索引（可多次调用追加岗位）
+
+        Args:
+            jobs: 岗位列表（simulate_job_listings 或抓取结果）
+            extract_from_description: 是否同时从 job_description 中提取技能
+        """
+        for job in jobs:
+            skills = list(job.get("skills", []))
+            if extract_from_description:
+                skills.extend(self.extractor.extract(job.get("job_description", "")))
+            self.jobs.append(job)
+            self.job_skills.append(self._encode(skills))
+            self.job_keywords.append(self._encode_keywords(job.get("position", "")))
+        self._posting_matrix = None
+        self._posting_keyword_matrix = None
+
+    def _match_pending_terms(self):
+        """在每份简历中查找新出现的岗位技能写法（Aho-Corasick 一次扫描，英文词要求单词边界）"""
+        if not self._pending_terms:
+            return
+        matcher = KeywordMatcher(self._pending_terms)
+        for text, columns in zip(self._resume_texts, self.resume_skills):
+            columns.update(column for _, _, column in matcher.iter_matches(text, normalized=True))
+        self._pending_terms = {}
+
+    def _matrices(self):
+        """
+        (简历 × 技能, 岗位 × 技能, 简历 × 关键词, 岗位 × 关键词)
+
+        简历一侧为 float32 0/1 稠密矩阵（简历数很少）；岗位一侧为 CSR (indptr, indices)，
+        内存随非零项数增长，而不是岗位数 × 词表大小。技能词表随岗位增长，按需重建。
+        """
+        self._match_pending_terms()
+        if self._posting_matrix is None or self._posting_matrix[2] != len(self.names):
+            self._posting_matrix = self._csr(self.job_skills) + (len(self.names),)
+        if self._posting_keyword_matrix is None:
+            self._posting_keyword_matrix = self._csr(self.job_keywords) + (len(self.keyword_names),)
+        resume_keywords = [[column for word, column in self.keywords.items() if word in words]
+                           for words in self._resume_words]
+        return (self._one_hot(self.resume_skills, len(self.names)), self._posting_matrix[:2],
+                self._one_hot(resume_keywords, len(self.keyword_names)), self._posting_keyword_matrix[:2])
+
+    @staticmethod
+    def _one_hot(rows: List[Iterable[int]], width: int) -> np.ndarray:
+        rows = [list(columns) for columns in rows]
+        matrix = np.zeros((len(rows), width), dtype=np.float32)
+        lengths = [len(columns) for columns in rows]
+        matrix[np.repeat(np.arange(len(rows)), lengths), [c for columns in rows for c in columns]] = 1
+        return matrix
+
+    @staticmethod
+    def _csr(rows: List[List[int]]) -> Tuple[np.ndarray, np.ndarray]:
+        """每行的列号列表 → (indptr, indices)"""
+        indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum([len(columns) for columns in rows], out=indptr[1:])
+        indices = np.fromiter((c for columns in rows for c in columns), dtype=np.int32, count=int(indptr[-1]))
+        return indptr, indices
+
+    @staticmethod
+    def _coverage(resume_matrix: np.ndarray, posting_csr: Tuple[np.ndarray, np.ndarray],
+                  block: int = 8192) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (覆盖率矩阵, 每个岗位是否有要求)
+
+        等价于 resume_matrix @ posting_matrix.T：按岗位分块取出简历矩阵中对应的列，
+        再用 reduceat 按岗位求和，临时数组大小为 简历数 × 块内非零项数。
+        """
+        indptr, indices = posting_csr
+        required = np.diff(indptr)
+        matched = np.zeros((resume_matrix.shape[0], len(required)), dtype=np.float32)
+        for start in range(0, len(required), block):
+            stop = min(start + block, len(required))
+            lo, hi = int(indptr[start]), int(indptr[stop])
+            if lo == hi:
+                continue
+            # 只对非空行求和（reduceat 对空行返回下一个元素而不是0）
+            rows = start + np.flatnonzero(required[start:stop])
+            gathered = resume_matrix[:, indices[lo:hi]]
+            matched[:, rows] = np.add.reduceat(gathered, indptr[rows] - lo, axis=1)
+        return np.divide(matched, required, out=np.zeros_like(matched), where=required > 0), required > 0
+
+    def score_matrix(self) -> np.ndarray:
+        """所有简历 × 所有岗位的得分矩阵（百分比），技能和关键词各一次稀疏矩阵乘法"""
+        resume_skills, posting_skills, resume_keywords, posting_keywords = self._matrices()
+        skill_score, has_skills = self._coverage(resume_skills, posting_skills)
+        keyword_score, has_keywords = self._coverage(resume_keywords, posting_keywords)
+        # 岗位没有技能或没有关键词时，只按另一项计分
+        weight = np.where(has_keywords, self.keyword_weight, 0.0).astype(np.float32)
+        weight = np.where(has_skills, weight, np.float32(1.0))
+        return (skill_score * (1 - weight) + keyword_score * weight) * 100
+
+    def rank(self, top_k: int = 10, scores: np.ndarray = None) -> Dict[str, List[Dict]]:
+        """
+        每份简历得分最高的 top_k 个岗位
+
+        Returns:
+            简历名称 → [{job_index, company, position, score, matched_skills, missing_skills,
+                         matched_keywords}, ...]
+        """
+        scores = self.score_matrix() if scores is None else scores
+        top_k = min(top_k, len(self.jobs))
+        results = {}
+        for i, name in enumerate(self.resume_names):
+            if not top_k:
+                results[name] = []
+                continue
+            top = np.argpartition(-scores[i], top_k - 1)[:top_k]
+            top = top[np.argsort(-scores[i, top], kind="stable")]
+            have = self.resume_skills[i]
+            words = self._resume_words[i]
+            ranked = []
+            for j in top.tolist():
+                job = self.jobs[j]
+                ranked.append({
+                    "job_index": j,
+                    "company": job.get("company", ""),
+                    "position": job.get("position", ""),
+                    "score": round(float(scores[i, j]), 1),
+                    "matched_skills": [self.names[c] for c in self.job_skills[j] if c in have],
+                    "missing_skills": [self.names[c] for c in self.job_skills[j] if c not in have],
+                    "matched_keywords": [self.keyword_names[c] for c in self.job_keywords[j]
+                                         if self.keyword_names[c] in words],
+                })
+            results[name] = ranked
+        return results
+
+
+def match_resumes(jobs: List[Dict], resume_dir: str = RESUME_DIR, top_k: int = 10) -> Dict[str, List[Dict]]:
+    """读取简历目录中的所有简历，返回每份简历最匹配的岗位"""
+    matcher = ResumeMatcher(load_resumes(resume_dir))
+    matcher.index_postings(jobs)
+    return matcher.rank(top_k)
+
+
+# ======================================================================================
+# 性能测试
+# ======================================================================================
+
+def benchmark_matching(n_postings: int = 50_000, n_resumes: int = 48, seed: int = 42) -> Dict:
+    """测量岗位索引耗时，以及索引后所有简历 × 所有岗位打分并排序的耗时"""
+    from shanghai_data_jobs_scraper import simulate_job_listings
+
+    rng = random.Random(seed)
+    samples = simulate_job_listings()
+    vocabulary = sorted(set(get_skill_extractor().dictionary.values()))
+
+    resumes = load_resumes()
+    base = list(resumes.values())
+    for i in range(n_resumes - len(resumes)):
+        resumes[f"variant_{i}"] = base[i % len(base)] + "\n" + ", ".join(rng.sample(vocabulary, 8))
+
+    jobs = []
+    for i in range(n_postings):
+        job = samples[i % len(samples)]
+        jobs.append(dict(job, skills=job["skills"] + rng.sample(vocabulary, 3)))
+
+    start = time.perf_counter()
+    matcher = ResumeMatcher(resumes)
+    matcher.index_postings(jobs)
+    matcher.score_matrix()
+    index_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    ranked = matcher.rank(top_k=10)
+    score_seconds = time.perf_counter() - start
+
+    return {
+        "postings": n_postings,
+        "resumes": len(resumes),
+        "index_seconds": round(index_seconds, 2),
+        "score_and_rank_seconds": round(score_seconds, 3),
+        "best_score": max(matches[0]["score"] for matches in ranked.values()),
+    }
+
+
+def main():
+    """主函数：对简历目录中的简历打分并运行性能测试"""
+    from shanghai_data_jobs_scraper import simulate_job_listings
+
+    for name, matches in match_resumes(simulate_job_listings(), top_k=3).items():
+        print(f"\n📄 {name}")
+        for match in matches:
+            print(f"  {match['score']:5.1f}  {match['company']} - {match['position']}")
+            print(f"         缺失: {', '.join(match['missing_skills'][:6])}")
+
+    print("\n⏱️  简历匹配性能测试（50,000个岗位 × 48份简历）...")
+    result = benchmark_matching()
+    print(f"  建立索引: {result['index_seconds']}s")
+    print(f"  打分 + 排序: {result['score_and_rank_seconds']}s")
+
+
+if __name__ == "__main__":
+    main()
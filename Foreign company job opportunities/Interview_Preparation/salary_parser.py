@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+薪资解析与分布统计
+支持 k/月、万/年、M/年、年薪数字、"N薪" 等多种写法，统一换算为 k RMB/月；
+整列解析结果存入 NumPy 数组，分位数、直方图和按公司/职位的分组统计一次完成
+"""
+
+import re
+import time
+from typing import List, Dict, Sequence, Optional, Tuple
+
+
+# 单位：k / 千 / 万(w) / M（百万；m 后面不能紧跟字母，避免把 month 当成单位）
+_UNIT = r'([kK千万wW]|[mM](?![a-zA-Z]))'
+# 数值后面紧跟 "年"（年薪除外）或 years 时是工作年限，不是薪资（"2-4年经验 20-30k"）
+_NOT_YEARS = r'(?![\d.])(?!\s*(?:年(?!薪)|years?\b|yrs?\b))'
+# 区间：40-70k / 40k-70k / 30~50万 / 300,000 - 500,000
+_RANGE_PATTERN = re.compile(
+    r'(\d+(?:\.\d+)?)\s*' + _UNIT + r'?\s*(?:-|~|–|—|to|至|到)\s*(\d+(?:\.\d+)?)\s*' + _UNIT + '?' + _NOT_YEARS
+)
+# 单个数值：50k / 40万 / 1.2M / 400000元
+_SINGLE_PATTERN = re.compile(r'(\d+(?:\.\d+)?)\s*' + _UNIT + '?' + _NOT_YEARS)
+# 没有单位的单个数值只有在出现这些薪资标记时才当作薪资（避免 "5 days/week" 被解析成5k）
+_SALARY_CONTEXT_PATTERN = re.compile(r'元|RMB|CNY|¥|￥|年薪|月薪', re.IGNORECASE)
+# 年终奖月数：14薪 / 13-16薪（取下限）
+_MONTHS_PATTERN = re.compile(r'(\d+)(?:\s*-\s*\d+)?\s*薪')
+# 年薪标记（不含单独的 "年"，避免 年终奖 / 年底双薪 / 年经验 被当成年薪；annual bonus 也不算）
+_ANNUAL_PATTERN = re.compile(
+    r'年薪|/\s*年|annual(?!\s*bonus)|annum|/\s*y(?:ea)?r|per\s+year|p\.a\.', re.IGNORECASE
+)
+# 月薪标记，优先于年薪标记（万、M 为单位时默认按年薪处理，除非明确是月薪）
+_MONTHLY_PATTERN = re.compile(r'月|month|/\s*mo\b|per\s+month', re.IGNORECASE)
+# 千分位逗号
+_THOUSANDS_PATTERN = re.compile(r'(?<=\d),(?=\d{3})')
+
+# 单位 → 换算成k的倍数
+_UNIT_TO_K = {"k": 1.0, "K": 1.0, "千": 1.0, "万": 10.0, "w": 10.0, "W": 10.0, "m": 1000.0, "M": 1000.0}
+# 这些单位的数额通常是年薪
+_ANNUAL_UNITS = {"万", "w", "W", "m", "M"}
+
+DEFAULT_MONTHS = 12
+
+# 回归用例：文本 → 期望的 (月薪下限k, 月薪上限k, 发薪月数)
+REGRESSION_CASES = {
+    "30-45k RMB/month + annual bonus": (30.0, 45.0, 12),
+    "25-40k/月 + 年终奖": (25.0, 40.0, 12),
+    "20-30k·13薪 (年底双薪)": (20.0, 30.0, 13),
+    "2-4年经验 20-30k": (20.0, 30.0, 12),
+}
+
+
+def _to_k(value: str, unit: Optional[str]) -> float:
+    """把数字和单位换算成k；无单位时 >= 1000 视为元，否则视为k"""
+    number = float(value)
+    if unit:
+        return number * _UNIT_TO_K[unit]
+    return number / 1000 if number >= 1000 else number
+
+
+def parse_salary(salary: str) -> Optional[Tuple[float, float, int]]:
+    """
+    解析单条薪资文本
+
+    Args:
+        salary: 薪资文本，如 "40-70k RMB/month"、"30-50万/年"、"25-40k·14薪"
+
+    Returns:
+        (月薪下限k, 月薪上限k, 每年发薪月数)，无法解析返回None
+
+    没有单位的单个数值需要有 元/RMB/年薪/月薪 等薪资标记；
+    有月薪标记时一律按月薪处理（"25-40k/月 + 年终奖"）；否则有年薪标记，
+    或以万或M为单位时按年薪处理（"30万-50万" 即 30-50万/年）。
+    """
+    if not salary:
+        return None
+
+    text = _THOUSANDS_PATTERN.sub("", salary)
+    months = DEFAULT_MONTHS
+    match = _MONTHS_PATTERN.search(text)
+    if match:
+        months = int(match.group(1))
+        text = text[:match.start()] + text[match.end():]
+
+    match = _RANGE_PATTERN.search(text)
+    if match:
+        low_value, low_unit, high_value, high_unit = match.groups()
+        # "30-50万" 中下限省略单位，沿用上限的单位
+        low = _to_k(low_value, low_unit or high_unit)
+        high = _to_k(high_value, high_unit or low_unit)
+        units = {low_unit, high_unit}
+    else:
+        match = _SINGLE_PATTERN.search(text)
+        if not match or (not match.group(2) and not _SALARY_CONTEXT_PATTERN.search(text)):
+            return None
+        low = high = _to_k(match.group(1), match.group(2))
+        units = {match.group(2)}
+
+    if not _MONTHLY_PATTERN.search(text) and (_ANNUAL_PATTERN.search(text) or units & _ANNUAL_UNITS):
+        low, high = low / months, high / months
+
+    if low > high:
+        low, high = high, low
+    return low, high, months
+
+
+def parse_salary_column(salaries: Sequence[str]) -> Dict:
+    """
+    整列解析薪资文本
+
+    薪资写法的种类远少于岗位数，先对整列做字典编码，只解析每种不同的写法一次，
+    再用编码数组一次性展开成列。
+
+    Args:
+        salaries: salary_range 列
+
+    Returns:
+        {"low", "high": 月薪k（float64，无法解析为NaN）,
+         "months": 发薪月数（int16）, "annual_low", "annual_high": 年薪k,
+         "valid": 是否解析成功（bool）}
+    """
+    import numpy as np
+
+    codes_of = {}
+    codes = np.fromiter((codes_of.setdefault(s or "", len(codes_of)) for s in salaries),
+                        dtype=np.int64, count=len(salaries))
+
+    unique_low = np.full(len(codes_of), np.nan)
+    unique_high = np.full(len(codes_of), np.nan)
+    unique_months = np.full(len(codes_of), DEFAULT_MONTHS, dtype=np.int16)
+    for text, code in codes_of.items():
+        parsed = parse_salary(text)
+        if parsed:
+            unique_low[code], unique_high[code], unique_months[code] = parsed
+
+    low = unique_low[codes]
+    high = unique_high[codes]
+    months = unique_months[codes]
+    return {
+        "low": low,
+        "high": high,
+        "months": months,
+        "annual_low": low * months,
+        "annual_high": high * months,
+        "valid": ~np.isnan(low),
+    }
+
+
+def _group_stats(keys: Sequence[str], low, high) -> Dict[str, Dict]:
+    """按分组键用 bincount 一次性计算每组的数量、平均值和最值"""
+    import numpy as np
+
+    codes_of = {}
+    codes = np.fromiter((codes_of.setdefault(k, len(codes_of)) for k in keys), dtype=np.int64, count=len(keys))
+    size = len(codes_of)
+
+    counts = np.bincount(codes, minlength=size)
+    sum_low = np.bincount(codes, weights=low, minlength=size)
+    sum_high = np.bincount(codes, weights=high, minlength=size)
+    min_low = np.full(size, np.inf)
+    max_high = np.full(size, -np.inf)
+    np.minimum.at(min_low, codes, low)
+    np.maximum.at(max_high, codes, high)
+
+    stats = {}
+    for key, code in codes_of.items():
+        stats[key] = {
+            "count": int(counts[code]),
+            "average_low": round(float(sum_low[code] / counts[code]), 1),
+            "average_high": round(float(sum_high[code] / counts[code]), 1),
+            "min_low": round(float(min_low[code]), 1),
+            "max_high": round(float(max_high[code]), 1),
+        }
+    return stats
+
+
+def salary_distribution(jobs: List[Dict],
+                        group_by: Sequence[str] = ("company", "position"),
+                        percentiles: Sequence[int] = (10, 25, 50, 75, 90),
+                        bins: int = 10) -> Dict:
+    """
+    薪资分布统计（单位：k RMB/月）
+
+    Args:
+        jobs: 岗位列表
+        group_by: 需要分组统计的字段
+        percentiles: 需要计算的分位数（基于薪资区间中位数）
+        bins: 直方图分箱数
+
+    Returns:
+        整体统计、分位数、直方图和各字段的分组统计
+    """
+    import numpy as np
+
+    column = parse_salary_column([job.get("salary_range", "") for job in jobs])
+    valid = column["valid"]
+    low = column["low"][valid]
+    high = column["high"][valid]
+    mid = (low + high) / 2
+
+    result = {
+        "total_jobs": len(jobs),
+        "parsed_jobs": int(valid.sum()),
+        "unit": "k RMB/month",
+    }
+    if not len(mid):
+        return result
+
+    counts, edges = np.histogram(mid, bins=bins)
+    result.update({
+        "average_low": round(float(low.mean()), 1),
+        "average_high": round(float(high.mean()), 1),
+        "min_low": round(float(low.min()), 1),
+        "max_high": round(float(high.max()), 1),
+        "percentiles": {f"p{p}": round(float(v), 1) for p, v in zip(percentiles, np.percentile(mid, percentiles))},
+        "histogram": {
+            "counts": counts.tolist(),
+            "edges": [round(float(e), 1) for e in edges],
+        },
+        "by_field": {},
+    })
+
+    valid_jobs = [job for job, ok in zip(jobs, valid) if ok]
+    for field in group_by:
+        keys = [job.get(field, "") for job in valid_jobs]
+        result["by_field"][field] = _group_stats(keys, low, high)
+
+    return result
+
+
+# ======================================================================================
+# 性能测试
+# ======================================================================================
+
+def benchmark_salary_parsing(n: int = 1_000_000) -> Dict:
+    """对比逐条正则解析和整列解析在n条薪资文本上的耗时"""
+    formats = [
+        "40-70k RMB/month", "35-60k RMB/month", "25-45k RMB/month",
+        "30-50万/年", "25-40k·14薪", "400,000-600,000 RMB/year", "50k", "面议",
+    ]
+    salaries = [formats[i % len(formats)] for i in range(n)]
+
+    start = time.perf_counter()
+    for salary in salaries:
+        re.findall(r'(\d+)-(\d+)k', salary)
+    per_row_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    parse_salary_column(salaries)
+    column_seconds = time.perf_counter() - start
+
+    return {
+        "rows": n,
+        "per_row_regex_seconds": round(per_row_seconds, 3),
+        "column_parse_seconds": round(column_seconds, 3),
+    }
+
+
+def main():
+    """主函数：示例解析和性能测试"""
+    for text in ["40-70k RMB/month", "30-50万/年", "30万-50万", "1.2M/year", "25-40k·14薪",
+                 "400,000-600,000 RMB/year", "Negotiable, 5 days/week", "面议"]:
+        print(f"  {text:28s} → {parse_salary(text)}")
+
+    failed = {text: parse_salary(text) for text, expected in REGRESSION_CASES.items()
+              if parse_salary(text) != expected}
+    print(f"\n  回归用例: {len(REGRESSION_CASES) - len(failed)}/{len(REGRESSION_CASES)} 通过")
+    for text, parsed in failed.items():
+        print(f"  ❌ {text} → {parsed}，期望 {REGRESSION_CASES[text]}")
+
+    print("\n⏱️  薪资解析性能测试（1,000,000条）...")
+    result = benchmark_salary_parsing()
+    print(f"  逐条正则: {result['per_row_regex_seconds']}s")
+    print(f"  整列解析: {result['column_parse_seconds']}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,11 +4,10 @@
 用于Python面试题练习和测试
 """
 
-import pandas as pd
-import numpy as np
 from datetime import datetime, timedelta
 import random
 import json
+import os
 
 
 # ======================================================================================
@@ -20,6 +19,9 @@ def generate_dirty_dataframe():
     生成包含缺失值和重复值的DataFrame
     用于练习数据清洗
     """
+    import pandas as pd
+    import numpy as np
+
     data = {
         'name': ['Alice', 'Bob', 'Alice', None, 'David'],
         'age': [25.0, np.nan, 25.0, 30.0, 35.0],
@@ -38,6 +40,8 @@ def generate_sales_data():
     生成销售数据
     用于groupby和聚合练习
     """
+    import pandas as pd
+
     data = {
         'product': ['iPhone', 'MacBook', 'iPhone', 'AirPods', 'Desk'],
         'category': ['Electronics', 'Electronics', 'Electronics', 'Electronics', 'Furniture'],
@@ -60,6 +64,9 @@ def generate_timeseries_data(days=30):
     Args:
         days: 生成多少天的数据
     """
+    import pandas as pd
+    import numpy as np
+
     dates = pd.date_range('2024-01-01', periods=days, freq='12H')
     data = {
         'timestamp': dates,
@@ -81,6 +88,8 @@ def generate_relational_data():
     Returns:
         orders, customers, products: 三个DataFrame
     """
+    import pandas as pd
+
     # 订单表
     orders = pd.DataFrame({
         'order_id': [1, 2, 3, 4, 5],
@@ -117,6 +126,8 @@ def generate_pivot_data():
     生成适合透视的长格式数据
     用于pivot练习
     """
+    import pandas as pd
+
     data = {
         'date': ['2024-01-01', '2024-01-01', '2024-01-02', '2024-01-02', '2024-01-03', '2024-01-03'],
         'product': ['A', 'B', 'A', 'B', 'A', 'B'],
@@ -139,6 +150,8 @@ def generate_user_behavior_data(num_users=100, num_days=30):
         num_users: 用户数量
         num_days: 天数
     """
+    import pandas as pd
+
     data = []
     start_date = datetime(2024, 1, 1)
 
@@ -170,6 +183,9 @@ def generate_transaction_data(num_transactions=1000):
     Args:
         num_transactions: 交易数量
     """
+    import pandas as pd
+    import numpy as np
+
     np.random.seed(42)
 
     data = {
@@ -200,6 +216,9 @@ def generate_data_with_outliers(num_rows=200):
     Args:
         num_rows: 行数
     """
+    import pandas as pd
+    import numpy as np
+
     np.random.seed(42)
 
     # 正常数据
@@ -248,6 +267,8 @@ def generate_invalid_data():
     生成包含各种错误的数据
     用于数据验证练习
     """
+    import pandas as pd
+
     data = {
         'id': [1, 2, 3, 4, 5],
         'name': ['Alice', None, 'Charlie', 'David', 'Eve'],
@@ -269,6 +290,9 @@ def generate_ecommerce_data():
     生成完整的电商数据场景
     包含用户、订单、商品、评价等多个表
     """
+    import pandas as pd
+    import numpy as np
+
     # 用户表
     users = pd.DataFrame({
         'user_id': range(1, 51),
@@ -492,13 +516,46 @@ def quick_generate_sales_df():
     return pd.DataFrame(data)
 
 
+def save_samples(all_data: dict, output_dir: str) -> list:
+    """
+    把 generate_all_samples() 的结果导出到 output_dir：DataFrame 保存为CSV，JSON样例保存为 .jsonl
+
+    Returns:
+        写入的文件路径列表
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    frames = dict(all_data)
+    frames.update(zip(('orders', 'customers', 'products'), frames.pop('relational')))
+    json_list = frames.pop('json')
+
+    paths = []
+    for name, df in frames.items():
+        path = os.path.join(output_dir, f"{name}_sample.csv")
+        df.to_csv(path, index=False)
+        paths.append(path)
+    path = os.path.join(output_dir, "json_sample.jsonl")
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("\n".join(json_list) + "\n")
+    paths.append(path)
+    return paths
+
+
 # ======================================================================================
 # 主程序入口
 # ======================================================================================
 
-if __name__ == "__main__":
+def main(output_dir: str = None):
+    """
+    主函数
+
+    Args:
+        output_dir: 导出CSV的目录；为None时只打印预览
+    """
     # 生成所有样例数据
     all_data = generate_all_samples()
+    if output_dir:
+        paths = save_samples(all_data, output_dir)
+        print(f"\n✅ {len(paths)} 个样例文件已保存到: {output_dir}")
 
     # 显示使用示例
     example_usage()
@@ -516,3 +573,7 @@ if __name__ == "__main__":
     print("  df = generate_sales_data()       # 生成销售数据")
     print("  df = generate_transaction_data(1000)  # 生成1000条交易数据")
     print()
+
+
+if __name__ == "__main__":
+    main()
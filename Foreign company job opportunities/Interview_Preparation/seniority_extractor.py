@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+岗位级别与工作年限提取
+整列职位名称 / 岗位描述先转小写、拼接成一个字符串：描述中先用 str.find 定位 year / yr / 年，
+只在其附近运行预编译的年限正则；职位名称去重后用级别正则扫描一遍。
+匹配位置用二分查找映射回岗位序号，再用 NumPy 按岗位归并：
+- 最低/最高工作年限（"5+ years"、"3-5 years"、"at least 4 years"、"3年以上" 等）
+- 级别（junior / mid / senior / lead）：职位名称中的 Senior、II、Lead 等优先，
+  没有时按最低年限推断
+结果存成紧凑数组（年限 float32，级别 int8），10万个岗位只占约1MB
+"""
+
+import re
+import time
+from typing import List, Dict, Iterable, Sequence
+
+import numpy as np
+
+
+LEVELS = ("junior", "mid", "senior", "lead")
+JUNIOR, MID, SENIOR, LEAD = range(len(LEVELS))
+
+# 拼接整列文本时的分隔符；匹配位置按每段的起始偏移映射回岗位，描述内部的换行不影响映射，
+# 同时作为要点（bullet）之间的边界
+_SEPARATOR = "\n"
+
+# 年限：区间（3-5 years / 3至5年）、下限（5+ years / 3年以上 / 前面有 at least），
+# 或后面不远处出现 experience / 经验 的单个年数（2 years of experience）。
+# 数字前面不能紧跟数字或小数点，在匹配后检查
+_YEARS_PATTERN = re.compile(r"""
+    (?P<low>\d{1,2}(?:\.\d)?)\s*
+    (?:(?P<plus>\+)|(?:-|–|—|~|to|至|到)\s*(?P<high>\d{1,2}(?:\.\d)?)\s*\+?)?
+    \s*(?:years?|yrs?|年)(?![a-z])
+    (?P<tail>以上|及以上)?
+    (?P<experience>(?:\s*of)?[^\n.;。；]{0,40}?(?:experience|经验))?
+""", re.VERBOSE)
+
+_NUMBER_CHARS = frozenset("0123456789.")
+
+# 每个年限匹配都包含的单位词；先用 str.find 定位单位词，只在其附近的窗口内运行正则，
+# 不必让 re 逐个字符扫描整列描述
+_UNITS = ("year", "yr", "年")
+# 窗口：单位词前（数字、区间、空白）和单位词后（"of ... experience"）的最大字符数
+_WINDOW_BEFORE, _WINDOW_AFTER = 24, 72
+
+# 单个年数前面的 "at least" 等下限写法（只在没有其他证据时检查）；
+# 这类匹配以及没有 experience/经验 的 "5+ years"、"3年以上" 只在同一岗位没有
+# 带 experience/经验 或区间的年限时才采用，避免 "over 10 years in China" 被当作年限要求
+_AT_LEAST_PATTERN = re.compile(r'(?:at least|minimum(?: of)?|min\.|more than|over|不少于|至少)\s*$')
+
+# 职位名称中的级别关键词（同一名称匹配多个时取最高级别，如 Associate Director → lead）
+_TITLE_PATTERN = re.compile(r"""
+    (?P<lead>\b(?:lead|principal|head|staff|director|manager|architect)\b|负责人|总监|经理|架构师
+        |\biv\b(?=\s*(?:[\n\-,(|/]|$)))
+    |(?P<senior>\b(?:senior|sr)\b|高级|资深|\biii\b(?=\s*(?:[\n\-,(|/]|$)))
+    |(?P<mid>\b(?:intermediate|mid[- ]level)\b|中级|\bii\b(?=\s*(?:[\n\-,(|/]|$)))
+    |(?P<junior>\b(?:junior|jr|graduate|intern|entry[- ]level|associate)\b|初级|助理|实习|应届
+        |\bi\b(?=\s*(?:[\n\-,(|/]|$)))
+""", re.VERBOSE)
+
+_TITLE_LEVELS = {"lead": LEAD, "senior": SENIOR, "mid": MID, "junior": JUNIOR}
+
+# 按最低年限推断级别的分界：< 2 年 junior，< 5 年 mid，< 8 年 senior，其余 lead
+YEARS_THRESHOLDS = (2, 5, 8)
+
+# 年限超过该值视为误匹配（如 "20 years of history"）
+MAX_YEARS = 30
+
+
+class SeniorityColumns:
+    """
+    每个岗位的年限和级别（与输入顺序一致）
+
+    - min_years / max_years：float32，未提到年限或只有下限时为 NaN
+    - level：int8，LEVELS 中的下标
+    - level_from_title：bool，级别是否来自职位名称（否则来自年限或默认 mid）
+    """
+
+    def __init__(self, min_years: np.ndarray, max_years: np.ndarray, level: np.ndarray, level_from_title: np.ndarray):
+        self.min_years = min_years
+        self.max_years = max_years
+        self.level = level
+        self.level_from_title = level_from_title
+
+    def __len__(self) -> int:
+        return len(self.level)
+
+    def level_names(self) -> List[str]:
+        return [LEVELS[code] for code in self.level.tolist()]
+
+    def level_counts(self) -> Dict[str, int]:
+        counts = np.bincount(self.level, minlength=len(LEVELS))
+        return {level: int(count) for level, count in zip(LEVELS, counts.tolist())}
+
+    def row(self, index: int) -> Dict:
+        """单个岗位的结果：{"min_years", "max_years", "level"}（年限缺失为 None）"""
+        low, high = float(self.min_years[index]), float(self.max_years[index])
+        return {
+            "min_years": None if np.isnan(low) else low,
+            "max_years": None if np.isnan(high) else high,
+            "level": LEVELS[self.level[index]],
+        }
+
+    def nbytes(self) -> int:
+        return self.min_years.nbytes + self.max_years.nbytes + self.level.nbytes + self.level_from_title.nbytes
+
+
+def _join(texts: Sequence[str]):
+    """拼接整列文本（小写），返回 (文本, 每段的起始偏移)"""
+    texts = [(text or "").lower() for text in texts]
+    lengths = np.fromiter((len(text) + 1 for text in texts), dtype=np.int64, count=len(texts))
+    starts = np.zeros(len(texts), dtype=np.int64)
+    np.cumsum(lengths[:-1], out=starts[1:])
+    return _SEPARATOR.join(texts), starts
+
+
+def _iter_year_matches(text: str):
+    """整列文本中的年限匹配（按单位词定位，同一匹配只产出一次）"""
+    seen = set()
+    for unit in _UNITS:
+        anchor = text.find(unit)
+        while anchor != -1:
+            for match in _YEARS_PATTERN.finditer(text, max(0, anchor - _WINDOW_BEFORE), anchor + _WINDOW_AFTER):
+                start = match.start()
+                # 只取以这个单位词结尾的匹配；数字前面紧跟数字或小数点的是被窗口截断的数字
+                if start <= anchor < match.end() and start not in seen \
+                        and not (start and text[start - 1] in _NUMBER_CHARS):
+                    seen.add(start)
+                    yield match
+            anchor = text.find(unit, anchor + 1)
+
+
+def _parse_year_match(text: str, match):
+    """
+    检查一个年限匹配，返回 (下限, 上限或NaN, 是否有经验/区间证据)；不是年限要求时返回None
+    """
+    start = match.start()
+    low, high = match.group("low", "high")
+    qualified = bool(high or match.group("experience"))
+    if not (qualified or match.group("plus") or match.group("tail")
+            or _AT_LEAST_PATTERN.search(text, max(0, start - 16), start)):
+        return None
+    low = float(low)
+    high = float(high) if high else np.nan
+    if low > MAX_YEARS or (high == high and (high > MAX_YEARS or high < low)):
+        return None
+    return low, high, qualified
+
+
+def extract_years(descriptions: Sequence[str]):
+    """
+    整列提取年限要求
+
+    同一描述提到多个年限时（如 "5+ years of Python ... 3+ years of Spark"），
+    最低年限取其中最大的下限（最严格的要求），最高年限取区间上限中的最大值。
+    带 experience/经验 或区间的年限优先：岗位中有这类年限时，忽略只有 "over"、"+"、"以上" 的年数。
+
+    Returns:
+        (min_years, max_years)：float32 数组，缺失为 NaN
+    """
+    text, starts = _join(descriptions)
+    positions, lows, highs, qualified = [], [], [], []
+    for match in _iter_year_matches(text):
+        parsed = _parse_year_match(text, match)
+        if parsed is None:
+            continue
+        positions.append(match.start())
+        lows.append(parsed[0])
+        highs.append(parsed[1])
+        qualified.append(parsed[2])
+
+    min_years = np.full(len(starts), np.nan, dtype=np.float32)
+    max_years = np.full(len(starts), np.nan, dtype=np.float32)
+    if positions:
+        rows = np.searchsorted(starts, np.array(positions, dtype=np.int64), side="right") - 1
+        qualified = np.array(qualified, dtype=bool)
+        has_qualified = np.zeros(len(starts), dtype=bool)
+        has_qualified[rows[qualified]] = True
+        keep = qualified | ~has_qualified[rows]
+        rows = rows[keep]
+        np.fmax.at(min_years, rows, np.array(lows, dtype=np.float32)[keep])
+        np.fmax.at(max_years, rows, np.array(highs, dtype=np.float32)[keep])
+        max_years[max_years < min_years] = np.nan
+    return min_years, max_years
+
+
+def extract_title_levels(titles: Sequence[str]) -> np.ndarray:
+    """整列职位名称的级别编码（int8），名称中没有级别关键词的为 -1"""
+    # 职位名称重复很多，只扫描不重复的名称，再按编码展开
+    unique: Dict[str, int] = {}
+    codes = np.fromiter((unique.setdefault(title or "", len(unique)) for title in titles),
+                        dtype=np.int64, count=len(titles))
+    text, starts = _join(list(unique))
+    positions, title_codes = [], []
+    for match in _TITLE_PATTERN.finditer(text):
+        positions.append(match.start())
+        title_codes.append(_TITLE_LEVELS[match.lastgroup])
+
+    levels = np.full(len(starts), -1, dtype=np.int8)
+    if positions:
+        rows = np.searchsorted(starts, np.array(positions, dtype=np.int64), side="right") - 1
+        np.maximum.at(levels, rows, np.array(title_codes, dtype=np.int8))
+    return levels[codes]
+
+
+def extract_seniority(titles: Sequence[str], descriptions: Sequence[str]) -> SeniorityColumns:
+    """
+    整列提取年限和级别
+
+    Args:
+        titles: 职位名称列
+        descriptions: 岗位描述列（与 titles 等长）
+    """
+    if len(titles) != len(descriptions):
+        raise ValueError("titles 和 descriptions 的长度不一致")
+    min_years, max_years = extract_years(descriptions)
+    title_levels = extract_title_levels(titles)
+
+    years_levels = np.searchsorted(np.array(YEARS_THRESHOLDS, dtype=np.float32), min_years, side="right")
+    years_levels = np.where(np.isnan(min_years), MID, years_levels).astype(np.int8)
+    from_title = title_levels >= 0
+    level = np.where(from_title, title_levels, years_levels).astype(np.int8)
+    return SeniorityColumns(min_years, max_years, level, from_title)
+
+
+def extract_job_seniority(jobs: Iterable[Dict]) -> SeniorityColumns:
+    """对岗位列表（使用 position 和 job_description）提取年限和级别"""
+    jobs = jobs if isinstance(jobs, list) else list(jobs)
+    return extract_seniority([job.get("position", "") for job in jobs],
+                             [job.get("job_description", "") for job in jobs])
+
+
+def infer_level(position: str, description: str = "") -> str:
+    """单个岗位的级别（junior / mid / senior / lead）"""
+    return LEVELS[extract_seniority([position], [description]).level[0]]
+
+
+# ======================================================================================
+# 性能测试
+# ======================================================================================
+
+def _generate_jobs(n: int, seed: int = 42) -> List[Dict]:
+    """在模拟岗位的基础上变换职位名称前缀和年限写法"""
+    import random
+    from shanghai_data_jobs_scraper import simulate_job_listings
+
+    rng = random.Random(seed)
+    samples = simulate_job_listings()
+    prefixes = ["", "Senior ", "Junior ", "Lead ", "Principal ", "Sr. ", "高级", ""]
+    suffixes = ["", " II", " III", " I", ""]
+    phrases = ["{a}+ years of experience", "{a}-{b} years of experience", "at least {a} years in data",
+               "{a}年以上数据开发经验", "{a}-{b}年相关工作经验", "no experience required"]
+    jobs = []
+    for i in range(n):
+        sample = samples[i % len(samples)]
+        a = rng.randint(1, 8)
+        phrase = rng.choice(phrases).format(a=a, b=a + rng.randint(1, 4))
+        jobs.append({
+            "position": rng.choice(prefixes) + sample["position"] + rng.choice(suffixes),
+            "job_description": f"{sample['job_description']}\n- {phrase}\nRequisition {i}",
+        })
+    return jobs
+
+
+def _extract_per_posting(jobs: Iterable[Dict]) -> List[Dict]:
+    """对照实现：同样的正则和规则，逐个岗位对整段描述 finditer，纯 Python 归并"""
+    thresholds = list(YEARS_THRESHOLDS)
+    rows = []
+    for job in jobs:
+        text = (job["job_description"] or "").lower()
+        found = []
+        for match in _YEARS_PATTERN.finditer(text):
+            if match.start() and text[match.start() - 1] in _NUMBER_CHARS:
+                continue
+            parsed = _parse_year_match(text, match)
+            if parsed is not None:
+                found.append(parsed)
+        if any(qualified for _, _, qualified in found):
+            found = [item for item in found if item[2]]
+        low = max((item[0] for item in found), default=None)
+        high = max((item[1] for item in found if item[1] == item[1]), default=None)
+        if high is not None and low is not None and high < low:
+            high = None
+
+        title = (job["position"] or "").lower()
+        title_levels = [_TITLE_LEVELS[match.lastgroup] for match in _TITLE_PATTERN.finditer(title)]
+        if title_levels:
+            level = max(title_levels)
+        elif low is None:
+            level = MID
+        else:
+            level = sum(low >= threshold for threshold in thresholds)
+        rows.append({"min_years": low, "max_years": high, "level": LEVELS[level]})
+    return rows
+
+
+def benchmark_seniority(n: int = 100_000) -> Dict:
+    """测量整列提取与逐个岗位提取的耗时，并检查两者结果一致"""
+    jobs = _generate_jobs(n)
+    result = {"postings": n}
+
+    start = time.perf_counter()
+    columns = extract_job_seniority(jobs)
+    result["batch_seconds"] = round(time.perf_counter() - start, 2)
+    result["nbytes"] = columns.nbytes()
+    result["with_years"] = int(np.count_nonzero(~np.isnan(columns.min_years)))
+    result["level_counts"] = columns.level_counts()
+
+    sample = jobs[:10_000]
+    start = time.perf_counter()
+    expected = _extract_per_posting(sample)
+    result["per_posting_seconds"] = round((time.perf_counter() - start) * n / len(sample), 2)
+    assert [columns.row(i) for i in range(len(sample))] == expected
+    return result
+
+
+def main():
+    """主函数：示例和性能测试"""
+    from shanghai_data_jobs_scraper import simulate_job_listings
+
+    jobs = simulate_job_listings()
+    columns = extract_job_seniority(jobs)
+    for i, job in enumerate(jobs):
+        row = columns.row(i)
+        years = f"{row['min_years']:g}" if row["min_years"] is not None else "-"
+        if row["max_years"] is not None:
+            years += f"-{row['max_years']:g}"
+        print(f"  {job['position']:<40} {years:>6} 年  {row['level']}")
+
+    print("\n⏱️  年限与级别提取性能测试（100,000个岗位）...")
+    result = benchmark_seniority()
+    print(f"  整列提取: {result['batch_seconds']}s（逐个岗位约 {result['per_posting_seconds']}s）")
+    print(f"  结果数组: {result['nbytes'] / 1024:.0f}KB，{result['with_years']} 个岗位提到年限")
+    print(f"  级别分布: {result['level_counts']}")
+
+
+if __name__ == "__main__":
+    main()
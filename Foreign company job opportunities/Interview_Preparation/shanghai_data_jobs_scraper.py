@@ -5,10 +5,19 @@
 """
 
 import json
-import time
+import os
 from datetime import datetime
-from typing import List, Dict, Set
-import re
+from typing import List, Dict, Set, Iterable, Iterator
+
+from analysis_report import write_analysis_report
+from report_renderer import Report, EXTENSIONS
+from salary_parser import parse_salary
+from skill_resources import get_skill_resource_catalog
+from skill_taxonomy import get_skill_taxonomy, TECHNICAL, TOOLS_PLATFORMS, SOFT
+
+
+# 默认输出目录：脚本所在目录
+OUTPUT_DIR = os.path.dirname(os.path.abspath(__file__))
 
 
 def get_target_companies() -> List[Dict]:
@@ -482,56 +491,113 @@ Bonus:
     return jobs
 
 
+def iter_job_listings_jsonl(filename: str) -> Iterator[Dict]:
+    """
+    逐行读取JSONL格式的岗位文件，每次只在内存中保留一条岗位
+
+    Args:
+        filename: JSONL文件路径（每行一个岗位JSON对象）
+
+    Yields:
+        岗位信息字典
+    """
+    with open(filename, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
 def analyze_skill_requirements(jobs: List[Dict]) -> Dict:
     """
     分析岗位技能要求，提取关键信息
+
+    jobs 也可以是 posting_db 的岗位库或查询（提供 skill_analysis_stats），
+    此时技能计数和薪资聚合直接在SQL中完成，不逐个读出岗位
     """
+    if hasattr(jobs, "skill_analysis_stats"):
+        return summarize_skill_analysis(*jobs.skill_analysis_stats())
+    return analyze_skill_requirements_stream(jobs)
+
 
-    # 统计技能出现频率
+def analyze_skill_requirements_stream(jobs: Iterable[Dict]) -> Dict:
+    """
+    流式分析岗位技能要求，只遍历一次输入
+
+    接受任意岗位迭代器（如 iter_job_listings_jsonl 的结果），边读边更新
+    技能计数和薪资聚合值，内存占用只与不同技能的数量有关，与岗位数无关。
+    返回结果与 analyze_skill_requirements 完全一致。
+
+    Args:
+        jobs: 岗位信息的可迭代对象
+
+    Returns:
+        技能分析结果
+    """
+
+    # 统计技能出现频率 + 薪资聚合（单次遍历）
+    total_jobs = 0
     skill_count = {}
+    salary_n = 0
+    salary_sum_low = 0
+    salary_sum_high = 0
+    salary_min_low = None
+    salary_max_high = None
+
     for job in jobs:
+        total_jobs += 1
         for skill in job.get("skills", []):
             skill_count[skill] = skill_count.get(skill, 0) + 1
 
-    # 按频率排序
-    sorted_skills = sorted(skill_count.items(), key=lambda x: x[1], reverse=True)
+        # 提取数字范围（统一换算为 k RMB/月）
+        parsed = parse_salary(job.get("salary_range", ""))
+        if parsed:
+            low, high, _ = parsed
+            salary_n += 1
+            salary_sum_low += low
+            salary_sum_high += high
+            if salary_min_low is None or low < salary_min_low:
+                salary_min_low = low
+            if salary_max_high is None or high > salary_max_high:
+                salary_max_high = high
+
+    return summarize_skill_analysis(
+        total_jobs, skill_count,
+        (salary_n, salary_sum_low, salary_sum_high, salary_min_low, salary_max_high)
+    )
+
+
+def summarize_skill_analysis(total_jobs: int, skill_count: Dict[str, int], salary_stats: tuple) -> Dict:
+    """
+    由技能计数和薪资聚合值生成技能分析结果
 
-    # 提取薪资信息
-    salary_ranges = []
-    for job in jobs:
-        salary = job.get("salary_range", "")
-        # 提取数字范围
-        matches = re.findall(r'(\d+)-(\d+)k', salary)
-        if matches:
-            low, high = matches[0]
-            salary_ranges.append((int(low), int(high)))
+    Args:
+        total_jobs: 岗位总数
+        skill_count: 技能 → 出现次数（按首次出现顺序插入，频率相同时保持该顺序）
+        salary_stats: (可解析薪资的岗位数, 下限之和, 上限之和, 最低下限, 最高上限)
 
-    avg_low = sum(s[0] for s in salary_ranges) / len(salary_ranges) if salary_ranges else 0
-    avg_high = sum(s[1] for s in salary_ranges) / len(salary_ranges) if salary_ranges else 0
+    Returns:
+        技能分析结果
+    """
+    salary_n, salary_sum_low, salary_sum_high, salary_min_low, salary_max_high = salary_stats
 
-    # 分类技能
-    technical_skills = {}
-    soft_skills = {}
-    tools_platforms = {}
+    # 按频率排序
+    sorted_skills = sorted(skill_count.items(), key=lambda x: x[1], reverse=True)
 
-    for skill, count in sorted_skills:
-        skill_lower = skill.lower()
+    avg_low = salary_sum_low / salary_n if salary_n else 0
+    avg_high = salary_sum_high / salary_n if salary_n else 0
 
-        # 技术技能
-        if any(tech in skill_lower for tech in ['sql', 'python', 'spark', 'etl', 'java', 'scala', 'r']):
-            technical_skills[skill] = count
-        # 工具和平台
-        elif any(tool in skill_lower for tool in ['aws', 'azure', 'gcp', 'tableau', 'power bi', 'snowflake', 'airflow', 'dbt', 'hadoop', 'kafka', 'oracle']):
-            tools_platforms[skill] = count
-        # 软技能和领域知识
-        elif any(soft in skill_lower for soft in ['english', 'presentation', 'consulting', 'communication']):
-            soft_skills[skill] = count
-        else:
-            # 其他归类为技术技能
-            technical_skills[skill] = count
+    # 分类技能（预构建的分类索引，单个技能O(长度)）
+    taxonomy = get_skill_taxonomy()
+    categorized = {TECHNICAL: {}, TOOLS_PLATFORMS: {}, SOFT: {}}
+    for skill, count in sorted_skills:
+        categorized[taxonomy.classify(skill)][skill] = count
+    technical_skills = categorized[TECHNICAL]
+    tools_platforms = categorized[TOOLS_PLATFORMS]
+    soft_skills = categorized[SOFT]
 
     return {
-        "total_jobs": len(jobs),
+        "total_jobs": total_jobs,
         "skill_frequency": dict(sorted_skills[:20]),  # Top 20
         "technical_skills": technical_skills,
         "tools_platforms": tools_platforms,
@@ -539,7 +605,7 @@ def analyze_skill_requirements(jobs: List[Dict]) -> Dict:
         "salary_analysis": {
             "average_low": f"{avg_low:.1f}k RMB/month",
             "average_high": f"{avg_high:.1f}k RMB/month",
-            "range": f"{min(s[0] for s in salary_ranges)}-{max(s[1] for s in salary_ranges)}k RMB/month" if salary_ranges else "N/A"
+            "range": f"{salary_min_low:g}-{salary_max_high:g}k RMB/month" if salary_n else "N/A"
         }
     }
 
@@ -580,6 +646,14 @@ def identify_skill_gaps(current_skills: Set[str], target_skills: Dict) -> Dict:
     }
 
 
+def get_skill_resources() -> Dict:
+    """
+    技能学习资源映射（技能关键词 → 优先级、学习时长、资源和实践项目）
+    数据保存在 skill_resources.json，首次调用时加载，之后返回同一份只读数据
+    """
+    return get_skill_resource_catalog().resources
+
+
 def generate_learning_plan(skill_gaps: Dict, timeline_months: int = 6) -> Dict:
     """
     生成个性化学习计划
@@ -594,248 +668,8 @@ def generate_learning_plan(skill_gaps: Dict, timeline_months: int = 6) -> Dict:
 
     missing_skills = skill_gaps["missing_skills"]
 
-    # 技能学习资源映射
-    skill_resources = {
-        # 编程语言
-        "python": {
-            "priority": "Critical",
-            "learning_time": "1-2 months",
-            "resources": [
-                "Python官方文档和教程",
-                "《Python Crash Course》书籍",
-                "LeetCode Python专题练习",
-                "DataCamp Python for Data Engineering课程"
-            ],
-            "practice_projects": [
-                "编写数据清洗脚本处理CSV/JSON文件",
-                "使用pandas进行数据分析",
-                "开发简单的ETL脚本",
-                "实现常见算法和数据结构"
-            ]
-        },
-        "sql": {
-            "priority": "Critical",
-            "learning_time": "2-3 weeks",
-            "resources": [
-                "Mode Analytics SQL教程",
-                "LeetCode Database专题（180+题）",
-                "《SQL Performance Explained》",
-                "HackerRank SQL练习"
-            ],
-            "practice_projects": [
-                "解决50+ SQL复杂查询题目",
-                "分析窗口函数和CTE应用场景",
-                "学习查询优化和索引策略",
-                "实践数据库设计范式"
-            ]
-        },
-
-        # 云平台
-        "aws": {
-            "priority": "High",
-            "learning_time": "1-2 months",
-            "resources": [
-                "AWS官方培训课程（免费）",
-                "A Cloud Guru AWS课程",
-                "AWS Solutions Architect Associate认证备考",
-                "AWS数据工程服务实践（Glue, EMR, Redshift）"
-            ],
-            "practice_projects": [
-                "在AWS免费套餐搭建数据管道",
-                "使用S3 + Glue + Athena构建数据湖",
-                "配置Redshift数据仓库",
-                "实现Lambda + EventBridge自动化任务"
-            ]
-        },
-        "azure": {
-            "priority": "High",
-            "learning_time": "1-2 months",
-            "resources": [
-                "Microsoft Learn Azure数据工程路径",
-                "Azure Data Engineer Associate (DP-203)认证",
-                "Pluralsight Azure课程",
-                "Azure数据服务实践（Data Factory, Synapse, Databricks）"
-            ],
-            "practice_projects": [
-                "使用Azure Data Factory创建ETL管道",
-                "在Azure Databricks运行Spark作业",
-                "配置Azure Synapse Analytics",
-                "实现Azure DevOps CI/CD"
-            ]
-        },
-        "gcp": {
-            "priority": "Medium",
-            "learning_time": "1-2 months",
-            "resources": [
-                "Google Cloud Skills Boost",
-                "Coursera GCP专项课程",
-                "《Data Engineering on Google Cloud Platform》",
-                "GCP Professional Data Engineer认证"
-            ],
-            "practice_projects": [
-                "使用BigQuery进行数据分析",
-                "构建Cloud Composer (Airflow)工作流",
-                "实现Dataflow流式处理",
-                "配置Cloud Storage数据湖"
-            ]
-        },
-
-        # 大数据技术
-        "spark": {
-            "priority": "High",
-            "learning_time": "2-3 months",
-            "resources": [
-                "《Learning Spark》第二版",
-                "Databricks Spark培训",
-                "Udemy Spark课程",
-                "Apache Spark官方文档"
-            ],
-            "practice_projects": [
-                "用PySpark处理大规模数据集",
-                "实现Spark SQL数据转换",
-                "优化Spark作业性能",
-                "学习Spark Streaming实时处理"
-            ]
-        },
-
-        # 数据仓库
-        "data warehousing": {
-            "priority": "High",
-            "learning_time": "1-2 months",
-            "resources": [
-                "《The Data Warehouse Toolkit》(Kimball)",
-                "《Building the Data Warehouse》(Inmon)",
-                "Coursera数据仓库专项课程",
-                "Modern Data Warehouse架构文章"
-            ],
-            "practice_projects": [
-                "设计Kimball维度模型（星型/雪花）",
-                "实现SCD（缓慢变化维）",
-                "构建事实表和维度表",
-                "学习Data Vault 2.0建模"
-            ]
-        },
-
-        # 现代数据栈
-        "dbt": {
-            "priority": "Medium-High",
-            "learning_time": "2-4 weeks",
-            "resources": [
-                "dbt官方文档和教程",
-                "dbt Learn免费课程",
-                "《Analytics Engineering with dbt》",
-                "dbt Discourse社区"
-            ],
-            "practice_projects": [
-                "搭建dbt项目结构",
-                "编写dbt模型和测试",
-                "实现增量模型和快照",
-                "配置dbt Cloud CI/CD"
-            ]
-        },
-        "airflow": {
-            "priority": "Medium",
-            "learning_time": "3-4 weeks",
-            "resources": [
-                "Apache Airflow官方文档",
-                "《Data Pipelines with Apache Airflow》",
-                "Astronomer Airflow教程",
-                "Airflow Summit视频"
-            ],
-            "practice_projects": [
-                "创建Airflow DAG调度任务",
-                "实现任务依赖和错误处理",
-                "配置Airflow连接和变量",
-                "学习TaskFlow API"
-            ]
-        },
-
-        # BI工具
-        "tableau": {
-            "priority": "Medium",
-            "learning_time": "2-3 weeks",
-            "resources": [
-                "Tableau Desktop Specialist认证",
-                "Tableau Public Gallery学习",
-                "《Tableau Your Data》书籍",
-                "Tableau官方培训视频"
-            ],
-            "practice_projects": [
-                "创建交互式仪表板",
-                "实现高级计算和LOD表达式",
-                "连接多数据源进行混合",
-                "发布到Tableau Server/Online"
-            ]
-        },
-        "power bi": {
-            "priority": "Medium",
-            "learning_time": "2-3 weeks",
-            "resources": [
-                "Microsoft Learn Power BI路径",
-                "《Dashboarding and Reporting with Power BI》",
-                "SQLBI网站DAX教程",
-                "Power BI Community论坛"
-            ],
-            "practice_projects": [
-                "创建Power BI报表和仪表板",
-                "学习DAX语言和数据建模",
-                "实现RLS（行级安全）",
-                "配置Power BI Service发布"
-            ]
-        },
-
-        # 英语
-        "english": {
-            "priority": "Critical",
-            "learning_time": "Ongoing (6 months)",
-            "resources": [
-                "职场英语口语课程（如Wall Street English）",
-                "技术英语阅读（Medium, Dev.to文章）",
-                "参加英语角或语言交换",
-                "看英文技术视频（YouTube, Pluralsight）"
-            ],
-            "practice_projects": [
-                "每天阅读英文技术博客",
-                "用英文写技术文档",
-                "参加英文技术分享会",
-                "模拟英文面试练习"
-            ]
-        },
-
-        # 其他重要技能
-        "git": {
-            "priority": "High",
-            "learning_time": "1-2 weeks",
-            "resources": [
-                "《Pro Git》免费电子书",
-                "GitHub Learning Lab",
-                "Learn Git Branching互动教程",
-                "Git官方文档"
-            ],
-            "practice_projects": [
-                "掌握Git基本命令和工作流",
-                "学习分支管理和合并策略",
-                "实践Pull Request流程",
-                "了解Git Hooks和CI/CD集成"
-            ]
-        },
-        "statistics": {
-            "priority": "Medium",
-            "learning_time": "1-2 months",
-            "resources": [
-                "《Statistics for Business and Economics》",
-                "Khan Academy统计学课程",
-                "Coursera统计推断专项课程",
-                "《Practical Statistics for Data Scientists》"
-            ],
-            "practice_projects": [
-                "掌握描述性统计和推断统计",
-                "学习假设检验和置信区间",
-                "理解A/B测试原理",
-                "实践回归分析和相关分析"
-            ]
-        }
-    }
+    # 技能学习资源目录（预先解析的别名表，每个技能O(1)定位资源）
+    catalog = get_skill_resource_catalog()
 
     # 构建学习计划
     learning_plan = {
@@ -856,20 +690,18 @@ def generate_learning_plan(skill_gaps: Dict, timeline_months: int = 6) -> Dict:
 
     skills_to_learn = []
     for skill, freq in missing_skills:
-        skill_key = skill.lower()
-        for key in skill_resources:
-            if key in skill_key or skill_key in key:
-                resource = skill_resources[key]
-                priority_score = priority_map.get(resource["priority"], 3)
-                # 综合考虑优先级和出现频率
-                score = priority_score - (freq / 10)  # 频率越高，分数越低（优先级越高）
-                skills_to_learn.append({
-                    "skill": skill,
-                    "details": resource,
-                    "frequency": freq,
-                    "score": score
-                })
-                break
+        resource = catalog.get(skill)
+        if resource is None:
+            continue
+        priority_score = priority_map.get(resource["priority"], 3)
+        # 综合考虑优先级和出现频率
+        score = priority_score - (freq / 10)  # 频率越高，分数越低（优先级越高）
+        skills_to_learn.append({
+            "skill": skill,
+            "details": resource,
+            "frequency": freq,
+            "score": score
+        })
 
     # 排序
     skills_to_learn.sort(key=lambda x: x["score"])
@@ -1097,128 +929,116 @@ def generate_learning_plan(skill_gaps: Dict, timeline_months: int = 6) -> Dict:
     return learning_plan
 
 
-def save_analysis_report(jobs: List[Dict], skill_analysis: Dict, learning_plan: Dict, filename: str):
-    """保存分析报告"""
-    report = {
-        "generated_at": datetime.now().isoformat(),
-        "location": "Shanghai, China",
-        "focus": "Foreign Company Data Positions",
-        "job_listings": jobs,
-        "skill_analysis": skill_analysis,
-        "learning_plan": learning_plan
-    }
+def save_analysis_report(jobs: Iterable[Dict], skill_analysis: Dict, learning_plan: Dict, filename: str):
+    """
+    保存分析报告（JSONL格式：第一行为摘要，之后每行一个岗位）
 
-    with open(filename, 'w', encoding='utf-8') as f:
-        json.dump(report, f, ensure_ascii=False, indent=2)
+    岗位逐个编码写入，jobs 可以是生成器；读取见 analysis_report.read_report_summary /
+    iter_report_postings
+    """
+    write_analysis_report(filename, jobs, skill_analysis, learning_plan)
 
     print(f"\n✅ 完整分析报告已保存到: {filename}")
 
 
-def print_analysis_summary(skill_analysis: Dict, learning_plan: Dict):
-    """打印分析摘要"""
-    print("\n" + "="*100)
-    print("📊 上海外企数据岗位分析报告")
-    print("="*100)
-    print(f"分析时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print(f"分析岗位数: {skill_analysis['total_jobs']}")
-
-    print("\n" + "-"*100)
-    print("💰 薪资水平")
-    print("-"*100)
+def build_analysis_summary(skill_analysis: Dict, learning_plan: Dict) -> Report:
+    """构建分析摘要报告（可渲染为 text / Markdown / HTML）"""
+    report = Report()
+    report.blank().rule("=")
+    report.heading("📊 上海外企数据岗位分析报告", 1)
+    report.rule("=")
+    report.text(f"分析时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    report.text(f"分析岗位数: {skill_analysis['total_jobs']}")
+
+    report.blank().rule("-")
+    report.heading("💰 薪资水平", 2)
+    report.rule("-")
     sal = skill_analysis['salary_analysis']
-    print(f"平均薪资范围: {sal['average_low']} - {sal['average_high']}")
-    print(f"总体范围: {sal['range']}")
+    report.text(f"平均薪资范围: {sal['average_low']} - {sal['average_high']}")
+    report.text(f"总体范围: {sal['range']}")
 
-    print("\n" + "-"*100)
-    print("🔑 Top 15 核心技能要求")
-    print("-"*100)
+    report.blank().rule("-")
+    report.heading("🔑 Top 15 核心技能要求", 2)
+    report.rule("-")
     for idx, (skill, count) in enumerate(list(skill_analysis['skill_frequency'].items())[:15], 1):
         percentage = (count / skill_analysis['total_jobs']) * 100
         bar = "█" * int(percentage / 5)
-        print(f"{idx:2d}. {skill:30s} {count:2d}次 ({percentage:5.1f}%) {bar}")
-
-    print("\n" + "-"*100)
-    print("💻 技术技能分类")
-    print("-"*100)
-    for skill, count in list(skill_analysis['technical_skills'].items())[:10]:
-        print(f"  • {skill}: {count}次")
-
-    print("\n" + "-"*100)
-    print("🛠️  工具和平台")
-    print("-"*100)
-    for skill, count in list(skill_analysis['tools_platforms'].items())[:10]:
-        print(f"  • {skill}: {count}次")
-
-    print("\n" + "-"*100)
-    print("🗣️  软技能和其他要求")
-    print("-"*100)
-    for skill, count in skill_analysis['soft_skills'].items():
-        print(f"  • {skill}: {count}次")
-
-    print("\n\n" + "="*100)
-    print("📚 学习计划概览")
-    print("="*100)
-    print(f"时间线: {learning_plan['overview']['timeline']}")
-    print(f"目标: {learning_plan['overview']['goal']}")
-    print(f"\n重点领域:")
+        report.pre(f"{idx:2d}. {skill:30s} {count:2d}次 ({percentage:5.1f}%) {bar}")
+
+    for title, skills in (("💻 技术技能分类", list(skill_analysis['technical_skills'].items())[:10]),
+                          ("🛠️  工具和平台", list(skill_analysis['tools_platforms'].items())[:10]),
+                          ("🗣️  软技能和其他要求", skill_analysis['soft_skills'].items())):
+        report.blank().rule("-")
+        report.heading(title, 2)
+        report.rule("-")
+        for skill, count in skills:
+            report.item(f"{skill}: {count}次")
+
+    report.blank(2).rule("=")
+    report.heading("📚 学习计划概览", 1)
+    report.rule("=")
+    report.text(f"时间线: {learning_plan['overview']['timeline']}")
+    report.text(f"目标: {learning_plan['overview']['goal']}")
+    report.blank().text("重点领域:")
     for area in learning_plan['overview']['focus_areas']:
-        print(f"  • {area}")
+        report.item(area)
 
-    print("\n" + "-"*100)
-    print("📅 月度计划")
-    print("-"*100)
+    report.blank().rule("-")
+    report.heading("📅 月度计划", 2)
+    report.rule("-")
     for phase, details in learning_plan['monthly_plan'].items():
-        print(f"\n【{phase}】- {details['focus']}")
-        print(f"每周投入: {details['weekly_hours']}")
+        report.blank().heading(f"【{phase}】- {details['focus']}", 3)
+        report.text(f"每周投入: {details['weekly_hours']}")
         if details['skills']:
-            print("学习技能:")
+            report.text("学习技能:")
             for skill_info in details['skills']:
-                print(f"  • {skill_info['skill']} (出现{skill_info['frequency']}次) - {skill_info['details']['learning_time']}")
+                report.item(f"{skill_info['skill']} (出现{skill_info['frequency']}次) - "
+                            f"{skill_info['details']['learning_time']}")
         if details.get('milestones'):
-            print("里程碑:")
+            report.text("里程碑:")
             for milestone in details['milestones']:
-                print(f"  ✓ {milestone}")
+                report.item(milestone, "✓")
 
-    print("\n" + "-"*100)
-    print("🎯 技能路线图")
-    print("-"*100)
+    report.blank().rule("-")
+    report.heading("🎯 技能路线图", 2)
+    report.rule("-")
     for roadmap in learning_plan['skill_roadmap']:
-        print(f"\n{roadmap['phase']}:")
+        report.blank().heading(f"{roadmap['phase']}:", 3)
         for goal in roadmap['goals']:
-            print(f"  • {goal}")
+            report.item(goal)
 
-    print("\n" + "-"*100)
-    print("🏆 推荐认证")
-    print("-"*100)
+    report.blank().rule("-")
+    report.heading("🏆 推荐认证", 2)
+    report.rule("-")
     for cert in learning_plan['certifications'][:3]:  # 显示前3个最重要的
-        print(f"\n{cert['name']}")
-        print(f"  难度: {cert['difficulty']} | 准备时间: {cert['prep_time']} | 价值: {cert['value']}")
+        report.blank().heading(cert['name'], 3)
+        report.text(f"  难度: {cert['difficulty']} | 准备时间: {cert['prep_time']} | 价值: {cert['value']}")
 
-    print("\n" + "-"*100)
-    print("🌍 英语提升计划")
-    print("-"*100)
-    print("每日练习:")
+    report.blank().rule("-")
+    report.heading("🌍 英语提升计划", 2)
+    report.rule("-")
+    report.text("每日练习:")
     for routine in learning_plan['english_improvement']['daily_routine']:
-        print(f"  • {routine}")
-    print("\n阶段目标:")
+        report.item(routine)
+    report.blank().text("阶段目标:")
     for month, goal in learning_plan['english_improvement']['milestone_goals'].items():
-        print(f"  • {month}: {goal}")
+        report.item(f"{month}: {goal}")
 
-    print("\n" + "-"*100)
-    print("💼 求职准备")
-    print("-"*100)
-    print("\n作品集项目:")
+    report.blank().rule("-")
+    report.heading("💼 求职准备", 2)
+    report.rule("-")
+    report.blank().text("作品集项目:")
     for project in learning_plan['job_preparation']['portfolio']:
-        print(f"  • {project}")
+        report.item(project)
 
-    print("\n目标公司:")
+    report.blank().text("目标公司:")
     for target in learning_plan['job_preparation']['target_companies']:
-        print(f"  • {target}")
+        report.item(target)
 
-    print("\n\n" + "="*100)
-    print("📈 关键建议")
-    print("="*100)
-    print("""
+    report.blank(2).rule("=")
+    report.heading("📈 关键建议", 1)
+    report.rule("=")
+    report.pre("""
 1. 英语是最大的差异化因素
    外企对英语要求高，这是国内公司转外企最大的门槛之一。
    每天至少1小时英语学习，重点是技术英语和口语。
@@ -1248,121 +1068,172 @@ def print_analysis_summary(skill_analysis: Dict, learning_plan: Dict):
    根据自己情况调整学习节奏，质量优于速度。
 """)
 
-    print("\n✨ 祝你转型成功！Start your journey today!")
+    report.blank().text("✨ 祝你转型成功！Start your journey today!")
+    return report
 
 
-def main():
-    """主函数"""
-    print("🚀 开始分析上海外企数据岗位...")
-    print("📍 目标: 从国内互联网传统数仓岗位 → 外企数据岗位")
-    print("⏱️  时间线: 3-6个月\n")
+def print_analysis_summary(skill_analysis: Dict, learning_plan: Dict):
+    """打印分析摘要"""
+    build_analysis_summary(skill_analysis, learning_plan).print()
 
-    time.sleep(1)
 
-    # 获取模拟的岗位数据
-    print("📥 正在获取岗位信息...")
-    jobs = simulate_job_listings()
-    print(f"✓ 获取到 {len(jobs)} 个相关岗位")
+def build_learning_plan_text(learning_plan: Dict, timeline: int) -> Report:
+    """构建学习计划文档（可渲染为 text / Markdown / HTML）"""
+    report = Report()
+    report.rule("=")
+    report.heading(f"从传统数仓到外企数据岗位 - {timeline}个月学习计划", 1)
+    report.rule("=").blank()
 
-    # 分析技能要求
-    print("\n🔍 分析岗位技能要求...")
-    skill_analysis = analyze_skill_requirements(jobs)
-    print("✓ 技能分析完成")
+    report.text("目标:")
+    report.text(learning_plan['overview']['goal']).blank()
 
-    # 定义当前技能（国内互联网传统数仓背景）
-    current_skills = {
-        "SQL", "Hive", "Spark", "数据建模", "ETL", "数据仓库",
-        "维度建模", "Python", "Shell", "Linux",
-        "Hadoop", "数据质量", "中文沟通"
-    }
+    report.heading("月度计划:", 2)
+    report.rule("-")
+    for phase, details in learning_plan['monthly_plan'].items():
+        report.blank().heading(f"{phase}: {details['focus']}", 3)
+        report.text(f"每周投入: {details['weekly_hours']}").blank()
+        if details['skills']:
+            report.text("学习内容:")
+            for skill_info in details['skills']:
+                skill_details = skill_info['details']
+                report.blank().heading(f"  {skill_info['skill']} ({skill_details['learning_time']})", 4)
+                report.text(f"  优先级: {skill_details['priority']}")
+                if skill_info.get('bundle'):
+                    report.text(f"  常一起要求: {', '.join(skill_info['bundle'])}")
+                report.text("  学习资源:")
+                for resource in skill_details['resources']:
+                    report.item(resource, "-", 4)
+                report.text("  实践项目:")
+                for project in skill_details['practice_projects']:
+                    report.item(project, "-", 4)
+        report.blank()
+        if details.get('milestones'):
+            report.text("  里程碑:")
+            for milestone in details['milestones']:
+                report.item(milestone, "✓", 4)
+        report.blank()
+
+    report.blank().rule("=")
+    report.heading("英语提升计划", 2)
+    report.rule("=")
+    report.blank().text("每日练习:")
+    for routine in learning_plan['english_improvement']['daily_routine']:
+        report.item(routine)
+    report.blank().text("每周实践:")
+    for practice in learning_plan['english_improvement']['weekly_practice']:
+        report.item(practice)
+
+    report.blank().rule("=")
+    report.heading("求职准备清单", 2)
+    report.rule("=")
+    for title, key in (("简历准备:", 'resume'), ("作品集项目:", 'portfolio'), ("面试准备:", 'interview_prep')):
+        report.blank().text(title)
+        for item in learning_plan['job_preparation'][key]:
+            report.item(item, "□")
+    return report
+
+
+def save_learning_plan_text(learning_plan: Dict, timeline: int, filename: str, fmt: str = "text"):
+    """保存学习计划（fmt: text / markdown / html）"""
+    build_learning_plan_text(learning_plan, timeline).save(filename, fmt)
+
+
+def main(postings_file: str = None, output_dir: str = OUTPUT_DIR, timeline: int = 6, plan_only: bool = False,
+         fmt: str = "text", metrics_file: str = None):
+    """
+    主函数
+
+    Args:
+        postings_file: 岗位JSONL文件（如 crawl_frontier 抓取输出的 postings.jsonl），默认使用模拟数据
+        output_dir: 分析报告和学习计划的输出目录
+        timeline: 学习计划月数（3或6）
+        plan_only: 只生成文本版学习计划，不保存完整报告、不打印分析摘要
+        fmt: 学习计划文件的格式（text / markdown / html）
+        metrics_file: 分阶段耗时/内存指标的JSON文件，默认不记录
+    """
+    from analysis_cache import AnalysisCache, cached_skill_analysis, cached_skill_gaps, cached_learning_plan
+    from stage_metrics import instrumented_run, stage
+
+    with instrumented_run("plan" if plan_only else "analyze", metrics_file):
+        print("🚀 开始分析上海外企数据岗位...")
+        print("📍 目标: 从国内互联网传统数仓岗位 → 外企数据岗位")
+        print("⏱️  时间线: 3-6个月\n")
+
+        # 获取模拟的岗位数据
+        print("📥 正在获取岗位信息...")
+        with stage("fetch"):
+            jobs = list(iter_job_listings_jsonl(postings_file)) if postings_file else simulate_job_listings()
+        print(f"✓ 获取到 {len(jobs)} 个相关岗位")
+
+        # 抓取的岗位可能来自多个来源（LinkedIn/公司官网），先去重再统计；
+        # 模拟数据没有重复，不必加载 NumPy
+        if postings_file:
+            with stage("dedup"):
+                from job_dedup import deduplicate_jobs
+                unique_jobs = deduplicate_jobs(jobs)
+            if len(unique_jobs) < len(jobs):
+                print(f"✓ 去除 {len(jobs) - len(unique_jobs)} 个跨来源重复岗位")
+            jobs = unique_jobs
+
+        # 分析技能要求
+        print("\n🔍 分析岗位技能要求...")
+        # 岗位和当前技能未变化时直接复用磁盘缓存中的结果
+        cache = AnalysisCache()
+        with stage("analyze"):
+            skill_analysis = cached_skill_analysis(jobs, cache)
+        print("✓ 技能分析完成")
+
+        # 定义当前技能（国内互联网传统数仓背景）
+        current_skills = {
+            "SQL", "Hive", "Spark", "数据建模", "ETL", "数据仓库",
+            "维度建模", "Python", "Shell", "Linux",
+            "Hadoop", "数据质量", "中文沟通"
+        }
 
-    # 识别技能差距
-    print("\n📊 识别技能差距...")
-    skill_gaps = identify_skill_gaps(current_skills, skill_analysis['skill_frequency'])
-    print(f"✓ 已有技能覆盖率: {skill_gaps['skill_coverage']:.1f}%")
-    print(f"✓ 需要学习的核心技能: {len(skill_gaps['missing_skills'])} 项")
-
-    # 生成学习计划（可选择3个月或6个月）
-    print("\n📚 生成个性化学习计划...")
-    timeline = 6  # 可以改成3
-    learning_plan = generate_learning_plan(skill_gaps, timeline_months=timeline)
-    print(f"✓ {timeline}个月学习计划已生成")
-
-    # 保存完整报告
-    output_file = f"/Users/boom/Desktop/my_bussiness/Foreign company job opportunities/shanghai_data_jobs_analysis_{datetime.now().strftime('%Y%m%d')}.json"
-    save_analysis_report(jobs, skill_analysis, learning_plan, output_file)
-
-    # 打印摘要
-    print_analysis_summary(skill_analysis, learning_plan)
-
-    # 生成额外的文本版学习计划
-    learning_plan_file = f"/Users/boom/Desktop/my_bussiness/Foreign company job opportunities/learning_plan_{timeline}months.txt"
-    with open(learning_plan_file, 'w', encoding='utf-8') as f:
-        f.write("="*100 + "\n")
-        f.write(f"从传统数仓到外企数据岗位 - {timeline}个月学习计划\n")
-        f.write("="*100 + "\n\n")
-
-        f.write("目标:\n")
-        f.write(f"{learning_plan['overview']['goal']}\n\n")
-
-        f.write("月度计划:\n")
-        f.write("-"*100 + "\n")
-        for phase, details in learning_plan['monthly_plan'].items():
-            f.write(f"\n{phase}: {details['focus']}\n")
-            f.write(f"每周投入: {details['weekly_hours']}\n\n")
-            if details['skills']:
-                f.write("学习内容:\n")
-                for skill_info in details['skills']:
-                    skill_name = skill_info['skill']
-                    skill_details = skill_info['details']
-                    f.write(f"\n  {skill_name} ({skill_details['learning_time']})\n")
-                    f.write(f"  优先级: {skill_details['priority']}\n")
-                    f.write(f"  学习资源:\n")
-                    for resource in skill_details['resources']:
-                        f.write(f"    - {resource}\n")
-                    f.write(f"  实践项目:\n")
-                    for project in skill_details['practice_projects']:
-                        f.write(f"    - {project}\n")
-            f.write("\n")
-            if details.get('milestones'):
-                f.write("  里程碑:\n")
-                for milestone in details['milestones']:
-                    f.write(f"    ✓ {milestone}\n")
-            f.write("\n")
-
-        f.write("\n" + "="*100 + "\n")
-        f.write("英语提升计划\n")
-        f.write("="*100 + "\n")
-        f.write("\n每日练习:\n")
-        for routine in learning_plan['english_improvement']['daily_routine']:
-            f.write(f"  • {routine}\n")
-        f.write("\n每周实践:\n")
-        for practice in learning_plan['english_improvement']['weekly_practice']:
-            f.write(f"  • {practice}\n")
-
-        f.write("\n" + "="*100 + "\n")
-        f.write("求职准备清单\n")
-        f.write("="*100 + "\n")
-        f.write("\n简历准备:\n")
-        for item in learning_plan['job_preparation']['resume']:
-            f.write(f"  □ {item}\n")
-        f.write("\n作品集项目:\n")
-        for item in learning_plan['job_preparation']['portfolio']:
-            f.write(f"  □ {item}\n")
-        f.write("\n面试准备:\n")
-        for item in learning_plan['job_preparation']['interview_prep']:
-            f.write(f"  □ {item}\n")
-
-    print(f"\n✅ 学习计划文本版已保存到: {learning_plan_file}")
-    print("\n" + "="*100)
-    print("🎯 下一步行动:")
-    print("="*100)
-    print("1. 查看完整的学习计划文件")
-    print("2. 根据自己的时间情况选择3个月或6个月计划")
-    print("3. 立即开始第一个学习任务")
-    print("4. 每周回顾进度，调��计划")
-    print("5. 3个月后开始投递简历（如果选择6个月计划则是5个月后）")
-    print("\n💪 Success favors the prepared. Let's get started!")
+        # 识别技能差距
+        print("\n📊 识别技能差距...")
+        with stage("gaps"):
+            skill_gaps = cached_skill_gaps(current_skills, skill_analysis['skill_frequency'], cache)
+        print(f"✓ 已有技能覆盖率: {skill_gaps['skill_coverage']:.1f}%")
+        print(f"✓ 需要学习的核心技能: {len(skill_gaps['missing_skills'])} 项")
+
+        # 生成学习计划（可选择3个月或6个月）
+        print("\n📚 生成个性化学习计划...")
+        with stage("plan"):
+            learning_plan = cached_learning_plan(skill_gaps, timeline, cache)
+            if postings_file:
+                # 真实岗位足够多时，把常一起要求的技能打包到学习计划中（模拟数据只有10个岗位，不统计）
+                from skill_cooccurrence import build_skill_cooccurrence, attach_skill_bundles
+                attach_skill_bundles(learning_plan, build_skill_cooccurrence(jobs))
+        print(f"✓ {timeline}个月学习计划已生成")
+
+        os.makedirs(output_dir, exist_ok=True)
+        if not plan_only:
+            # 保存完整报告
+            output_file = os.path.join(output_dir,
+                                       f"shanghai_data_jobs_analysis_{datetime.now().strftime('%Y%m%d')}.jsonl")
+            with stage("save_report"):
+                save_analysis_report(jobs, skill_analysis, learning_plan, output_file)
+
+            # 打印摘要
+            with stage("print_summary"):
+                print_analysis_summary(skill_analysis, learning_plan)
+
+        # 生成额外的文本版学习计划
+        learning_plan_file = os.path.join(output_dir, f"learning_plan_{timeline}months{EXTENSIONS[fmt]}")
+        with stage("save_plan"):
+            save_learning_plan_text(learning_plan, timeline, learning_plan_file, fmt)
+
+        print(f"\n✅ 学习计划文本版已保存到: {learning_plan_file}")
+        print("\n" + "="*100)
+        print("🎯 下一步行动:")
+        print("="*100)
+        print("1. 查看完整的学习计划文件")
+        print("2. 根据自己的时间情况选择3个月或6个月计划")
+        print("3. 立即开始第一个学习任务")
+        print("4. 每周回顾进度，调��计划")
+        print("5. 3个月后开始投递简历（如果选择6个月计划则是5个月后）")
+        print("\n💪 Success favors the prepared. Let's get started!")
 
 
 if __name__ == "__main__":
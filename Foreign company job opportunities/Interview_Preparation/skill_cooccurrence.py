@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""
+技能共现分析
+岗位技能编码为整数ID，存成 岗位 × 技能 的稀疏矩阵 X（CSR）；
+共现矩阵 C = XᵀX 按岗位分块累加每个岗位的外积得到，只保存非零元，
+lift(a, b) = C[a, b] · N / (df[a] · df[b]) 与共现次数一起算出。
+用于回答"Airflow 通常和哪些技能一起出现"，学习计划据此把常一起要求的技能打包
+"""
+
+import random
+import time
+from array import array
+from typing import List, Dict, Iterable, Tuple
+
+import numpy as np
+
+
+# 每次展开的技能对数上限（控制中间数组的内存）
+DEFAULT_CHUNK_PAIRS = 1_000_000
+
+# 推荐组合时共现次数的下限，过滤只出现过一两次的偶然组合
+DEFAULT_MIN_COUNT = 3
+
+
+def _merge_counts(keys_a: np.ndarray, counts_a: np.ndarray,
+                  keys_b: np.ndarray, counts_b: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """合并两组 (有序编码, 次数)，相同编码的次数相加"""
+    if not len(keys_a):
+        return keys_b, counts_b
+    keys = np.concatenate([keys_a, keys_b])
+    order = np.argsort(keys, kind="stable")
+    keys = keys[order]
+    counts = np.concatenate([counts_a, counts_b])[order]
+    starts = np.flatnonzero(np.concatenate([[True], keys[1:] != keys[:-1]]))
+    return keys[starts], np.add.reduceat(counts, starts)
+
+
+class SkillCooccurrence:
+    """
+    技能共现矩阵
+
+    - 岗位 × 技能：indptr / indices（同一岗位内技能ID升序、去重）
+    - 技能 × 技能：pair_ptr / pair_skills / pair_counts / pair_lift（对称CSR，不含对角线）
+    - df：每个技能出现在多少个岗位中（即共现矩阵的对角线）
+    """
+
+    def __init__(self, skill_sets: Iterable[Iterable[str]] = None, chunk_pairs: int = DEFAULT_CHUNK_PAIRS):
+        """
+        Args:
+            skill_sets: 每个岗位的技能列表（如 job["skills"]）
+            chunk_pairs: 每次展开的技能对数上限
+        """
+        self.chunk_pairs = chunk_pairs
+        self.vocabulary: Dict[str, int] = {}
+        self.skills: List[str] = []
+        self.indptr = array('q', [0])
+        self.indices = array('i')
+        self._matrix = None
+        if skill_sets is not None:
+            self.add_all(skill_sets)
+
+    def __len__(self) -> int:
+        return len(self.indptr) - 1
+
+    # ---------------------------------------------------------------- 写入
+
+    def add(self, skills: Iterable[str]) -> int:
+        """新增一个岗位的技能集合，返回岗位序号"""
+        vocabulary = self.vocabulary
+        ids = set()
+        for skill in skills:
+            skill_id = vocabulary.get(skill)
+            if skill_id is None:
+                skill_id = vocabulary[skill] = len(self.skills)
+                self.skills.append(skill)
+            ids.add(skill_id)
+        self.indices.extend(sorted(ids))
+        self.indptr.append(len(self.indices))
+        self._matrix = None
+        return len(self) - 1
+
+    def add_all(self, skill_sets: Iterable[Iterable[str]]):
+        """批量新增岗位：先把全部技能编码成一个ID数组，再用 NumPy 一次完成岗位内排序和去重"""
+        vocabulary, names = self.vocabulary, self.skills
+        flat = array('i')
+        lengths = array('q')
+        for skills in skill_sets:
+            before = len(flat)
+            for skill in skills:
+                skill_id = vocabulary.get(skill)
+                if skill_id is None:
+                    skill_id = vocabulary[skill] = len(names)
+                    names.append(skill)
+                flat.append(skill_id)
+            lengths.append(len(flat) - before)
+        if not lengths:
+            return
+
+        n_skills = max(len(names), 1)
+        rows = np.repeat(np.arange(len(lengths), dtype=np.int64), np.frombuffer(lengths, dtype=np.int64))
+        keys = np.unique(rows * n_skills + np.frombuffer(flat, dtype=np.int32)) if len(flat) else rows
+        rows, ids = np.divmod(keys, n_skills)
+        row_lengths = np.bincount(rows, minlength=len(lengths))
+        self.indices.frombytes(ids.astype(np.int32).tobytes())
+        self.indptr.frombytes((np.cumsum(row_lengths) + self.indptr[-1]).tobytes())
+        self._matrix = None
+
+    def add_jobs(self, jobs: Iterable[Dict]):
+        """批量新增岗位（使用 job["skills"]）"""
+        self.add_all(job.get("skills", []) for job in jobs)
+
+    # ---------------------------------------------------------------- 计算
+
+    def _csr(self) -> Tuple[np.ndarray, np.ndarray]:
+        indptr = np.frombuffer(self.indptr, dtype=np.int64)
+        indices = np.frombuffer(self.indices, dtype=np.int32) if len(self.indices) else np.zeros(0, np.int32)
+        return indptr, indices
+
+    def _upper_pairs(self, indptr: np.ndarray, indices: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        XᵀX 的上三角（a < b）：按岗位分块，把每个岗位内的技能对编码为 a * 技能数 + b，
+        块内排序计数后合并到累计结果中（中间数组大小只与非零元数和块大小有关），返回 (编码, 共现次数)
+        """
+        n_skills = len(self.skills)
+        lengths = np.diff(indptr)
+        # 每个非零元右侧（同一岗位内、ID更大）的技能个数
+        rows = np.repeat(np.arange(len(lengths)), lengths)
+        right = (indptr[1:][rows] - np.arange(len(indices)) - 1)
+        pairs_per_row = lengths * (lengths - 1) // 2
+        row_ends = np.cumsum(pairs_per_row)
+
+        total_keys, total_counts = np.zeros(0, np.int64), np.zeros(0, np.int64)
+        first_row = 0
+        while first_row < len(lengths):
+            budget = (row_ends[first_row - 1] if first_row else 0) + self.chunk_pairs
+            last_row = max(int(np.searchsorted(row_ends, budget, side="right")), first_row + 1)
+            start, end = int(indptr[first_row]), int(indptr[last_row])
+            counts = right[start:end]
+            total = int(counts.sum())
+            if total:
+                # 左侧技能重复 counts 次；右侧依次取同一岗位中它后面的技能
+                left = np.repeat(indices[start:end].astype(np.int64), counts)
+                offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+                partner = indices[np.repeat(np.arange(start, end) + 1, counts) + offsets]
+                keys, key_counts = np.unique(left * n_skills + partner, return_counts=True)
+                del left, offsets, partner
+                total_keys, total_counts = _merge_counts(total_keys, total_counts, keys, key_counts)
+            first_row = last_row
+        return total_keys, total_counts
+
+    def _build(self):
+        """计算 df、共现次数和 lift，存成按技能分行的对称CSR"""
+        n_skills, n_postings = len(self.skills), len(self)
+        indptr, indices = self._csr()
+        df = np.bincount(indices, minlength=n_skills).astype(np.int32)
+
+        keys, counts = self._upper_pairs(indptr, indices)
+        # 补上下三角；同一行内按技能ID升序，count() 可以二分查找
+        keys = np.concatenate([keys, (keys % n_skills) * n_skills + keys // n_skills]) if n_skills else keys
+        order = np.argsort(keys)
+        counts = np.concatenate([counts, counts]).astype(np.int32)[order]
+        keys = keys[order]
+        del order
+        rows = (keys // n_skills).astype(np.int32) if n_skills else keys.astype(np.int32)
+        cols = (keys - rows.astype(np.int64) * n_skills).astype(np.int32)
+        del keys
+
+        pair_ptr = np.zeros(n_skills + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=n_skills), out=pair_ptr[1:])
+        lift = counts.astype(np.float32) * np.float32(n_postings)
+        lift /= df[rows].astype(np.float32)
+        lift /= df[cols].astype(np.float32)
+        self._matrix = (df, pair_ptr, cols, counts, lift)
+
+    @property
+    def df(self) -> np.ndarray:
+        if self._matrix is None:
+            self._build()
+        return self._matrix[0]
+
+    def nbytes(self) -> int:
+        """岗位 × 技能矩阵和共现矩阵占用的字节数"""
+        if self._matrix is None:
+            self._build()
+        return (self.indptr.itemsize * len(self.indptr) + self.indices.itemsize * len(self.indices)
+                + sum(part.nbytes for part in self._matrix))
+
+    def count(self, skill_a: str, skill_b: str) -> int:
+        """两个技能同时出现的岗位数"""
+        a, b = self.vocabulary.get(skill_a), self.vocabulary.get(skill_b)
+        if a is None or b is None:
+            return 0
+        df = self.df
+        if a == b:
+            return int(df[a])
+        _, pair_ptr, cols, counts, _ = self._matrix
+        start, end = pair_ptr[a], pair_ptr[a + 1]
+        pos = start + np.searchsorted(cols[start:end], b)
+        return int(counts[pos]) if pos < end and cols[pos] == b else 0
+
+    def partners(self, skill: str, k: int = 5, by: str = "lift",
+                 min_count: int = DEFAULT_MIN_COUNT) -> List[Tuple[str, int, float]]:
+        """
+        与 skill 一起出现最多（by="count"）或关联最强（by="lift"）的k个技能
+
+        Returns:
+            [(技能, 共现次数, lift), ...]
+        """
+        skill_id = self.vocabulary.get(skill)
+        if skill_id is None:
+            return []
+        if self._matrix is None:
+            self._build()
+        _, pair_ptr, cols, counts, lift = self._matrix
+        start, end = pair_ptr[skill_id], pair_ptr[skill_id + 1]
+        row_cols, row_counts, row_lift = cols[start:end], counts[start:end], lift[start:end]
+        keep = row_counts >= min_count
+        row_cols, row_counts, row_lift = row_cols[keep], row_counts[keep], row_lift[keep]
+        if not len(row_cols):
+            return []
+
+        score = row_lift if by == "lift" else row_counts
+        k = min(k, len(row_cols))
+        top = np.argpartition(-score, k - 1)[:k]
+        # 分数相同时共现次数多的在前，再按技能ID（首次出现顺序）
+        top = top[np.lexsort((row_cols[top], -row_counts[top], -score[top]))]
+        return [(self.skills[row_cols[i]], int(row_counts[i]), round(float(row_lift[i]), 3)) for i in top.tolist()]
+
+    def bundle(self, skill: str, k: int = 3, min_lift: float = 1.5,
+               min_count: int = DEFAULT_MIN_COUNT) -> List[str]:
+        """推荐和 skill 一起学习的技能：lift 不低于 min_lift 的前k个伙伴技能"""
+        return [partner for partner, _, lift in self.partners(skill, k, "lift", min_count) if lift >= min_lift]
+
+
+def build_skill_cooccurrence(jobs: Iterable[Dict]) -> SkillCooccurrence:
+    """由岗位列表构建技能共现矩阵"""
+    cooccurrence = SkillCooccurrence()
+    cooccurrence.add_jobs(jobs)
+    return cooccurrence
+
+
+def attach_skill_bundles(learning_plan: Dict, cooccurrence: SkillCooccurrence, k: int = 3) -> Dict:
+    """给学习计划中每个技能加上 "bundle"（常一起要求、建议一起学习的技能）"""
+    for details in learning_plan["monthly_plan"].values():
+        for skill_info in details["skills"]:
+            bundle = cooccurrence.bundle(skill_info["skill"], k)
+            if bundle:
+                skill_info["bundle"] = bundle
+    return learning_plan
+
+
+# ======================================================================================
+# 性能测试
+# ======================================================================================
+
+def _generate_skill_sets(n: int, n_skills: int = 5000, seed: int = 42) -> List[List[str]]:
+    """
+    生成n个岗位的技能列表：技能热度服从 Zipf 分布，另外混入几组固定搭配
+    （如 Airflow + dbt + Snowflake），每个岗位约10个技能
+    """
+    rng = np.random.default_rng(seed)
+    names = [f"Skill {i}" for i in range(n_skills)]
+    weights = 1.0 / np.arange(1, n_skills + 1)
+    weights /= weights.sum()
+    bundles = [["Airflow", "dbt", "Snowflake"], ["Spark", "Databricks", "Delta Lake"], ["Power BI", "DAX"]]
+
+    sizes = rng.integers(6, 14, size=n)
+    picks = rng.choice(n_skills, size=int(sizes.sum()), p=weights)
+    py_rng = random.Random(seed)
+    skill_sets, offset = [], 0
+    for size in sizes.tolist():
+        skills = [names[i] for i in picks[offset:offset + size].tolist()]
+        offset += size
+        if py_rng.random() < 0.2:
+            bundle = py_rng.choice(bundles)
+            skills.extend(bundle[:py_rng.randint(2, len(bundle))])
+        skill_sets.append(skills)
+    return skill_sets
+
+
+def _python_pair_counts(skill_sets: Iterable[Iterable[str]]) -> Dict[Tuple[str, str], int]:
+    """逐个岗位枚举技能对、用字典计数（对照实现）"""
+    from itertools import combinations
+
+    counts = {}
+    for skills in skill_sets:
+        for pair in combinations(sorted(set(skills)), 2):
+            counts[pair] = counts.get(pair, 0) + 1
+    return counts
+
+
+def benchmark_cooccurrence(n: int = 100_000, n_skills: int = 5000) -> Dict:
+    """测量构建（编码 + XᵀX + lift）耗时、内存峰值和查询耗时，并与字典计数比较"""
+    import tracemalloc
+
+    skill_sets = _generate_skill_sets(n, n_skills)
+    result = {"postings": n, "skills": n_skills}
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    cooccurrence = SkillCooccurrence(skill_sets)
+    result["encode_seconds"] = round(time.perf_counter() - start, 2)
+    start = time.perf_counter()
+    cooccurrence.df
+    result["matrix_seconds"] = round(time.perf_counter() - start, 2)
+    result["peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 1024 / 1024, 1)
+    tracemalloc.stop()
+    result["nonzeros"] = len(cooccurrence.indices)
+    result["pairs"] = len(cooccurrence._matrix[2]) // 2
+    result["matrix_mb"] = round(cooccurrence.nbytes() / 1024 / 1024, 1)
+
+    start = time.perf_counter()
+    expected = _python_pair_counts(skill_sets)
+    result["dict_seconds"] = round(time.perf_counter() - start, 2)
+    assert len(expected) == result["pairs"]
+    for (a, b), count in list(expected.items())[:1000]:
+        assert cooccurrence.count(a, b) == count
+
+    queries = cooccurrence.skills[:1000]
+    start = time.perf_counter()
+    for skill in queries:
+        cooccurrence.partners(skill, k=10)
+    result["partners_us"] = round((time.perf_counter() - start) / len(queries) * 1e6, 1)
+    result["airflow"] = cooccurrence.partners("Airflow", k=3)
+    return result
+
+
+def main():
+    """主函数：示例和性能测试"""
+    from shanghai_data_jobs_scraper import simulate_job_listings
+
+    cooccurrence = build_skill_cooccurrence(simulate_job_listings())
+    print("与 Python 一起出现最多的技能:")
+    for skill, count, lift in cooccurrence.partners("Python", k=5, by="count", min_count=1):
+        print(f"  {skill:<20} {count} 次  lift={lift}")
+
+    print("\n⏱️  技能共现性能测试（100,000个岗位 × 5,000个技能）...")
+    result = benchmark_cooccurrence()
+    print(f"  编码: {result['encode_seconds']}s，XᵀX + lift: {result['matrix_seconds']}s"
+          f"（字典逐对计数 {result['dict_seconds']}s）")
+    print(f"  非零元: 岗位×技能 {result['nonzeros']:,}，技能对 {result['pairs']:,}；"
+          f"矩阵 {result['matrix_mb']}MB，构建内存峰值 {result['peak_mb']}MB")
+    print(f"  Top-10 伙伴技能查询: {result['partners_us']}µs/次")
+    print(f"  Airflow 常见组合: {', '.join(f'{skill}(lift={lift})' for skill, _, lift in result['airflow'])}")
+
+
+if __name__ == "__main__":
+    main()
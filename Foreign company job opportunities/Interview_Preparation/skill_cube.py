@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""
+行业 × 岗位类型 × 级别 × 技能 预聚合立方体
+四个维度都做字典编码，度量存入 NumPy 数组：
+- 岗位立方体 (行业, 岗位类型, 级别)：岗位数、可解析薪资的岗位数、薪资下限/上限之和
+- 技能立方体 (行业, 岗位类型, 级别, 技能)：同样四个度量，按要求该技能的岗位统计；
+  绝大多数 (单元格, 技能) 组合没有岗位，只按 (单元格, 技能) 键稀疏存储非零项
+任意维度组合的上卷（按维度求和）和切片（按维度取值）都直接在立方体上计算，不再遍历岗位；
+新岗位只在对应单元格上累加
+"""
+
+import random
+import time
+from typing import List, Dict, Iterable, Sequence, Tuple, Union
+
+import numpy as np
+
+from job_index import build_industry_map
+from job_store import StringPool
+from salary_parser import parse_salary
+from seniority_extractor import LEVELS, extract_seniority
+from shanghai_data_jobs_scraper import get_data_job_positions
+from skill_taxonomy import normalize_text
+
+
+DIMENSIONS = ("industry", "role", "level", "skill")
+
+UNKNOWN_INDUSTRY = "Other"
+OTHER_ROLE = "Other"
+
+# 度量：岗位数、可解析薪资的岗位数、薪资下限之和、薪资上限之和
+_MEASURES = ("count", "salary_n", "salary_low", "salary_high")
+
+
+def infer_role(position: str, roles: List[Dict] = None) -> str:
+    """按 get_data_job_positions 的关键词把职位名称归到岗位类型，都不匹配时为 Other"""
+    title = normalize_text(position)
+    for role in roles if roles is not None else get_data_job_positions():
+        if any(keyword in title for keyword in role["keywords"]):
+            return role["title"]
+    return OTHER_ROLE
+
+
+Selector = Union[str, Sequence[str]]
+
+
+def _dtype(measure: str):
+    """薪资之和为 float64，计数为 int64"""
+    return np.float64 if measure in ("salary_low", "salary_high") else np.int64
+
+
+class SkillCube:
+    """
+    预聚合立方体
+
+    维度编码：行业、岗位类型、级别、技能各一个 StringPool；
+    岗位类型和级别预先按 get_data_job_positions / LEVELS 的顺序编码，
+    级别由 seniority_extractor 按职位名称和描述中的年限要求整批推断。
+
+    岗位立方体是稠密数组，行业维度按倍数预留容量，新增行业时不必每次重新分配。
+    技能立方体按 (单元格, 技能) 稀疏存储：skill_keys 为升序的键（单元格编号 << 32 | 技能编码），
+    skills[度量] 为与之对齐的一维数组，内存随非零项数增长，与技能数无关。
+    """
+
+    def __init__(self, jobs: Iterable[Dict] = None):
+        self.pools = {dimension: StringPool() for dimension in DIMENSIONS}
+        self._roles = get_data_job_positions()
+        for role in self._roles:
+            self.pools["role"].encode(role["title"])
+        self.pools["role"].encode(OTHER_ROLE)
+        for level in LEVELS:
+            self.pools["level"].encode(level)
+        self._industry_map = build_industry_map()
+        self._role_cache: Dict[str, int] = {}
+
+        self.total_postings = 0
+        self.postings = {measure: None for measure in _MEASURES}
+        self._allocate((8, len(self.pools["role"]), len(LEVELS)))
+        self.skill_keys = np.zeros(0, dtype=np.int64)
+        self.skills = {measure: np.zeros(0, dtype=_dtype(measure)) for measure in _MEASURES}
+
+        if jobs is not None:
+            self.add(jobs)
+
+    # ---------------------------------------------------------------- 写入
+
+    def _allocate(self, shape: Tuple[int, int, int]):
+        """按 shape（行业, 岗位类型, 级别）分配岗位立方体，并复制已有数据"""
+        for measure in _MEASURES:
+            array = np.zeros(shape, dtype=_dtype(measure))
+            old = self.postings[measure]
+            if old is not None:
+                array[:old.shape[0]] = old
+            self.postings[measure] = array
+
+    def _ensure_capacity(self):
+        shape = self.postings["count"].shape
+        if len(self.pools["industry"]) > shape[0]:
+            self._allocate((max(len(self.pools["industry"]), shape[0] * 2), shape[1], shape[2]))
+
+    def _cell_ids(self, cells: np.ndarray) -> np.ndarray:
+        """(行业, 岗位类型, 级别) 编码 → 单元格编号（岗位类型和级别的取值数固定，行业在最高位）"""
+        _, roles, levels = self.postings["count"].shape
+        return (cells[:, 0] * roles + cells[:, 1]) * levels + cells[:, 2]
+
+    def _add_skill_cells(self, keys: np.ndarray, values: Sequence[np.ndarray]):
+        """把 (单元格, 技能) 键上的度量累加到稀疏技能立方体：已有的键原地累加，新键按序插入"""
+        keys, inverse = np.unique(keys, return_inverse=True)
+        sums = [np.bincount(inverse, weights=value, minlength=len(keys)).astype(_dtype(measure))
+                for measure, value in zip(_MEASURES, values)]
+        positions = np.searchsorted(self.skill_keys, keys)
+        found = positions < len(self.skill_keys)
+        found[found] = self.skill_keys[positions[found]] == keys[found]
+        for measure, total in zip(_MEASURES, sums):
+            self.skills[measure][positions[found]] += total[found]
+        if not found.all():
+            new = ~found
+            self.skill_keys = np.insert(self.skill_keys, positions[new], keys[new])
+            for measure, total in zip(_MEASURES, sums):
+                self.skills[measure] = np.insert(self.skills[measure], positions[new], total[new])
+
+    def industry_of(self, job: Dict) -> str:
+        """根据公司英文名或中文名查找行业，不在目标公司列表中的记为 Other"""
+        return (self._industry_map.get(normalize_text(job.get("company", "")))
+                or self._industry_map.get(normalize_text(job.get("cn_company", "")))
+                or UNKNOWN_INDUSTRY)
+
+    def _role(self, position: str) -> int:
+        """职位名称 → 岗位类型编码；同一职位名称只推断一次"""
+        code = self._role_cache.get(position)
+        if code is None:
+            code = self._role_cache[position] = self.pools["role"].encode(infer_role(position, self._roles))
+        return code
+
+    def add(self, jobs: Iterable[Dict]) -> int:
+        """
+        增量添加岗位：只在这些岗位对应的单元格上累加，不重新统计已有岗位
+
+        Returns:
+            新增的岗位数
+        """
+        industries, skill_pool = self.pools["industry"], self.pools["skill"]
+        cells, salaries = [], []            # 每个岗位一行：(行业, 岗位类型)、(是否有薪资, 下限, 上限)
+        skill_rows, skill_codes = [], []    # 岗位-技能 非零元：岗位行号、技能编码
+        positions, descriptions = [], []
+        for job in jobs:
+            row = len(cells)
+            position = job.get("position", "")
+            positions.append(position)
+            descriptions.append(job.get("job_description", ""))
+            cells.append((industries.encode(self.industry_of(job)), self._role(position)))
+            parsed = parse_salary(job.get("salary_range", ""))
+            salaries.append((1, parsed[0], parsed[1]) if parsed else (0, 0.0, 0.0))
+            for skill in dict.fromkeys(job.get("skills", [])):
+                skill_rows.append(row)
+                skill_codes.append(skill_pool.encode(skill))
+        if not cells:
+            return 0
+        self._ensure_capacity()
+
+        # LEVELS 与级别维度的编码顺序一致
+        levels = extract_seniority(positions, descriptions).level.astype(np.int64)
+        cells = np.column_stack([np.array(cells, dtype=np.int64), levels])
+        salaries = np.array(salaries, dtype=np.float64)
+        values = (np.ones(len(cells), dtype=np.int64), salaries[:, 0].astype(np.int64), salaries[:, 1], salaries[:, 2])
+        index = (cells[:, 0], cells[:, 1], cells[:, 2])
+        for measure, value in zip(_MEASURES, values):
+            np.add.at(self.postings[measure], index, value)
+
+        if skill_rows:
+            skill_rows = np.array(skill_rows, dtype=np.int64)
+            keys = (self._cell_ids(cells)[skill_rows] << 32) | np.array(skill_codes, dtype=np.int64)
+            self._add_skill_cells(keys, [value[skill_rows] for value in values])
+
+        self.total_postings += len(cells)
+        return len(cells)
+
+    # ---------------------------------------------------------------- 查询
+
+    def values(self, dimension: str) -> List[str]:
+        """某个维度的全部取值（编码顺序）"""
+        return list(self.pools[dimension].values)
+
+    def _positions(self, dimension: str, filters: Dict[str, Selector]) -> np.ndarray:
+        """某个维度参与统计的编码（有过滤条件时按给定取值的顺序，否则为全部编码）"""
+        pool = self.pools[dimension]
+        selector = filters.get(dimension)
+        if selector is None:
+            return np.arange(len(pool))
+        wanted = [selector] if isinstance(selector, str) else selector
+        return np.array([pool.codes[value] for value in wanted if value in pool.codes], dtype=np.int64)
+
+    def _posting_groups(self, group_by: Sequence[str], filters: Dict[str, Selector]):
+        """岗位立方体：切片后对不在 group_by 中的维度求和，返回 (各组的编码元组, 各度量的一维合计)"""
+        dimensions = DIMENSIONS[:3]
+        slices = [self._positions(dimension, filters) for dimension in dimensions]
+        grid = np.ix_(*slices)
+        axes = tuple(i for i, dimension in enumerate(dimensions) if dimension not in group_by)
+        totals = {measure: array[grid].sum(axis=axes) for measure, array in self.postings.items()}
+
+        order = [dimensions.index(dimension) for dimension in group_by]
+        kept = [i for i in range(len(dimensions)) if i not in axes]
+        totals = {measure: np.transpose(array, [kept.index(i) for i in order]).reshape(-1)
+                  for measure, array in totals.items()}
+        cells = (np.indices([len(slices[i]) for i in order]).reshape(len(order), -1) if order
+                 else np.zeros((0, 1), dtype=np.int64))
+        groups = [slices[i][cells[k]] for k, i in enumerate(order)]
+        return groups, totals
+
+    def _skill_groups(self, group_by: Sequence[str], filters: Dict[str, Selector]):
+        """稀疏技能立方体：按过滤条件筛选非零项，再按 group_by 维度分组求和"""
+        cells, skill_codes = self.skill_keys >> 32, self.skill_keys & 0xFFFFFFFF
+        _, roles, levels = self.postings["count"].shape
+        codes = {"industry": cells // (roles * levels), "role": cells // levels % roles,
+                 "level": cells % levels, "skill": skill_codes}
+
+        # 编码 → 在过滤取值中的位置，分组顺序与岗位立方体一致（过滤取值按给定顺序）
+        slices, columns = {}, {}
+        mask = np.ones(len(self.skill_keys), dtype=bool)
+        for dimension in DIMENSIONS:
+            slices[dimension] = self._positions(dimension, filters)
+            position_of = np.full(len(self.pools[dimension]), -1, dtype=np.int64)
+            position_of[slices[dimension]] = np.arange(len(slices[dimension]))
+            columns[dimension] = position_of[codes[dimension]]
+            mask &= columns[dimension] >= 0
+
+        if group_by:
+            stacked = np.stack([columns[dimension][mask] for dimension in group_by])
+            cells, inverse = np.unique(stacked, axis=1, return_inverse=True)
+            inverse = inverse.reshape(-1)
+        else:
+            cells, inverse = np.zeros((0, 1), dtype=np.int64), np.zeros(int(mask.sum()), dtype=np.int64)
+        size = cells.shape[1]
+        totals = {measure: np.bincount(inverse, weights=array[mask], minlength=size).astype(_dtype(measure))
+                  for measure, array in self.skills.items()}
+        groups = [slices[dimension][cells[k]] for k, dimension in enumerate(group_by)]
+        return groups, totals
+
+    def aggregate(self, group_by: Sequence[str] = (), **filters: Selector) -> Dict:
+        """
+        上卷 + 切片
+
+        Args:
+            group_by: 分组维度（industry / role / level / skill 的任意组合，可以为空）
+            **filters: 维度 = 取值 或 取值列表，如 industry="Technology", level=["senior", "lead"]
+
+        Returns:
+            {分组键: {"postings", "salary_postings", "avg_salary_low", "avg_salary_high"}}，
+            分组键为取值元组（只按一个维度分组时为字符串），按岗位数从多到少排列；
+            group_by 包含 skill 或按 skill 过滤时，postings 为要求该技能的岗位数
+        """
+        unknown = set(group_by) | set(filters)
+        unknown -= set(DIMENSIONS)
+        if unknown:
+            raise ValueError(f"未知维度: {', '.join(sorted(unknown))}（可选: {', '.join(DIMENSIONS)}）")
+
+        if "skill" in group_by or "skill" in filters:
+            groups, totals = self._skill_groups(group_by, filters)
+        else:
+            groups, totals = self._posting_groups(group_by, filters)
+
+        counts = totals["count"]
+        result = []
+        for g in np.flatnonzero(counts > 0).tolist():
+            key = tuple(self.pools[dimension].values[groups[k][g]] for k, dimension in enumerate(group_by))
+            salary_n = int(totals["salary_n"][g])
+            result.append((key[0] if len(key) == 1 else key, {
+                "postings": int(counts[g]),
+                "salary_postings": salary_n,
+                "avg_salary_low": round(float(totals["salary_low"][g]) / salary_n, 1) if salary_n else None,
+                "avg_salary_high": round(float(totals["salary_high"][g]) / salary_n, 1) if salary_n else None,
+            }))
+        result.sort(key=lambda item: item[1]["postings"], reverse=True)
+        return dict(result)
+
+    def rollup(self, *dimensions: str) -> Dict:
+        """按给定维度上卷（其余维度求和），如 rollup("industry", "level")"""
+        return self.aggregate(dimensions)
+
+    def slice(self, **filters: Selector) -> Dict:
+        """
+        切片内的技能需求：{技能: 要求该技能的岗位数}（按岗位数从多到少），
+        如 slice(industry="Technology", level="senior")
+        """
+        return {skill: stats["postings"] for skill, stats in self.aggregate(("skill",), **filters).items()}
+
+    def top_skills(self, k: int = 10, **filters: Selector) -> Dict[str, int]:
+        return dict(list(self.slice(**filters).items())[:k])
+
+    def nbytes(self) -> int:
+        return (sum(array.nbytes for cube in (self.postings, self.skills) for array in cube.values())
+                + self.skill_keys.nbytes)
+
+
+def build_skill_cube(jobs: Iterable[Dict]) -> SkillCube:
+    """由岗位列表构建立方体"""
+    return SkillCube(jobs)
+
+
+# ======================================================================================
+# 性能测试
+# ======================================================================================
+
+def _generate_jobs(n: int, seed: int = 42) -> List[Dict]:
+    """在 job_index 的随机岗位基础上加入职位名称（不同岗位类型和级别）"""
+    from job_index import generate_benchmark_jobs
+
+    rng = random.Random(seed)
+    prefixes = ["", "", "Senior ", "Junior ", "Lead ", "Principal ", "Sr. ", "高级"]
+    titles = [keywords[0].title() for keywords in (role["keywords"] for role in get_data_job_positions())]
+    titles += ["Machine Learning Engineer", "Product Manager", "数据分析师"]
+    jobs = generate_benchmark_jobs(n, seed)
+    for job in jobs:
+        job["position"] = rng.choice(prefixes) + rng.choice(titles)
+    return jobs
+
+
+def _breakdown_by_loop(jobs: List[Dict], levels: List[str], industry: str, level: str) -> Dict[str, int]:
+    """手写循环：某行业某级别岗位的技能计数（原来每个新分析维度都要写一遍的做法）"""
+    industry_map = build_industry_map()
+    counts = {}
+    for job, job_level in zip(jobs, levels):
+        job_industry = industry_map.get(normalize_text(job["company"])) or UNKNOWN_INDUSTRY
+        if job_industry != industry or job_level != level:
+            continue
+        for skill in dict.fromkeys(job["skills"]):
+            counts[skill] = counts.get(skill, 0) + 1
+    return dict(sorted(counts.items(), key=lambda item: item[1], reverse=True))
+
+
+def benchmark_cube(n: int = 100_000, queries: int = 100) -> Dict:
+    """测量构建、增量更新以及上卷/切片查询（对比每次重新遍历岗位）的耗时"""
+    jobs = _generate_jobs(n)
+    result = {"postings": n}
+
+    start = time.perf_counter()
+    cube = SkillCube(jobs[:-1000])
+    result["build_seconds"] = round(time.perf_counter() - start, 2)
+    start = time.perf_counter()
+    cube.add(jobs[-1000:])
+    result["add_1000_ms"] = round((time.perf_counter() - start) * 1000, 1)
+    result["cube_mb"] = round(cube.nbytes() / 1024 / 1024, 1)
+
+    from seniority_extractor import extract_job_seniority
+
+    levels = extract_job_seniority(jobs).level_names()
+    start = time.perf_counter()
+    expected = _breakdown_by_loop(jobs, levels, "Technology", "senior")
+    result["loop_ms"] = round((time.perf_counter() - start) * 1000, 1)
+    sliced = cube.slice(industry="Technology", level="senior")
+    assert sliced == expected
+
+    start = time.perf_counter()
+    for _ in range(queries):
+        cube.slice(industry="Technology", level="senior")
+    result["slice_ms"] = round((time.perf_counter() - start) / queries * 1000, 2)
+
+    start = time.perf_counter()
+    for _ in range(queries):
+        cube.rollup("industry", "role", "level")
+    result["rollup_ms"] = round((time.perf_counter() - start) / queries * 1000, 2)
+    return result
+
+
+def main():
+    """主函数：示例和性能测试"""
+    from shanghai_data_jobs_scraper import simulate_job_listings
+
+    cube = build_skill_cube(simulate_job_listings())
+    print("按行业上卷:")
+    for industry, stats in cube.rollup("industry").items():
+        print(f"  {industry:<25} {stats['postings']} 个岗位  平均 {stats['avg_salary_low']}-{stats['avg_salary_high']}k")
+    print("\nTechnology 行业 senior 岗位的技能需求:")
+    print("  " + ", ".join(f"{skill}({count})" for skill, count in cube.top_skills(5, industry="Technology",
+                                                                                    level="senior").items()))
+
+    print("\n⏱️  技能立方体性能测试（100,000个岗位）...")
+    result = benchmark_cube()
+    print(f"  构建: {result['build_seconds']}s，增量添加1000个岗位: {result['add_1000_ms']}ms，"
+          f"立方体 {result['cube_mb']}MB")
+    print(f"  行业+级别切片的技能计数: 遍历岗位 {result['loop_ms']}ms，立方体 {result['slice_ms']}ms")
+    print(f"  行业 × 岗位类型 × 级别 上卷: {result['rollup_ms']}ms")
+
+
+if __name__ == "__main__":
+    main()
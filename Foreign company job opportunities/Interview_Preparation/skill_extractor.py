@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+岗位描述技能提取
+对每条 job_description 只扫描一次，按关键词词典提取标准化的技能集合，
+使技能频率分析可以基于真实抓取的文本，而不是手工标注的 skills 列表
+"""
+
+import re
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Iterable, Iterator, Optional
+
+from shanghai_data_jobs_scraper import get_data_job_positions, get_skill_resources, simulate_job_listings
+from skill_taxonomy import get_skill_taxonomy, normalize_text
+
+
+# 岗位关键词中描述"职位名称"而非技能的词，不纳入技能词典
+ROLE_WORDS = ("engineer", "analyst", "scientist", "developer", "architect", "师", "家", "员")
+
+# 每批提取的岗位描述数
+DEFAULT_BATCH_SIZE = 2000
+
+
+def build_skill_dictionary() -> Dict[str, str]:
+    """
+    构建技能关键词词典：关键词（小写） → 标准技能名称
+
+    来源：
+    1. get_data_job_positions() 中的岗位关键词（去掉职位名称类关键词）
+    2. get_skill_resources() 的技能键
+    3. 技能分类索引中的别名，用于把同义写法归一到同一个标准名称
+    """
+    taxonomy = get_skill_taxonomy()
+    dictionary = {}
+
+    keywords = []
+    for position in get_data_job_positions():
+        for keyword in position["keywords"]:
+            if not any(word in keyword for word in ROLE_WORDS):
+                keywords.append(keyword)
+    keywords.extend(get_skill_resources().keys())
+
+    for keyword in keywords:
+        key = normalize_text(keyword)
+        dictionary[key] = taxonomy.canonical_name(key)
+
+    for alias, (canonical, _) in taxonomy.alias_index.items():
+        dictionary.setdefault(alias, canonical)
+
+    return dictionary
+
+
+def _trie_regex(keywords: Iterable[str]) -> str:
+    """
+    把关键词列表编译成前缀树形式的正则（公共前缀只匹配一次）
+
+    例如 ['spark', 'spark sql', 'sql'] → s(?:park(?:\\s+sql)?|ql)
+    关键词中的空格匹配任意空白，因此描述文本无需预先规整空白。
+    """
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for ch in keyword:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: Dict) -> str:
+        branches = []
+        for ch in sorted(k for k in node if k):
+            token = r"\s+" if ch == " " else re.escape(ch)
+            branches.append(token + build(node[ch]))
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            # 已是完整关键词：更长的匹配可选（贪婪，优先最长匹配）
+            return "(?:" + body + ")?" if len(branches) == 1 else body + "?"
+        return body
+
+    return build(trie)
+
+
+class SkillExtractor:
+    """
+    基于预编译正则的技能提取器
+
+    所有关键词编译成一个前缀树正则，由 re 引擎在C层一次扫描完成，优先最长匹配；
+    ASCII关键词两侧要求非字母数字边界，避免 'r' 命中 'spark'；
+    单个字母的关键词两侧还不能是 '&'，避免 'r' 命中 'R&D'。
+    """
+
+    def __init__(self, dictionary: Dict[str, str] = None):
+        self.dictionary = dictionary if dictionary is not None else build_skill_dictionary()
+        self.pattern = re.compile(
+            r"(?<![a-z0-9])(?!(?<=&)[a-z](?![a-z0-9]))(?![a-z]&)"
+            rf"(?:{_trie_regex(self.dictionary)})(?![a-z0-9])"
+        )
+
+    def extract(self, text: str) -> List[str]:
+        """提取单条描述中的技能标准名称（去重，保持首次出现顺序）"""
+        if not text:
+            return []
+        dictionary = self.dictionary
+        found = self.pattern.findall(text.lower())
+        return list(dict.fromkeys(dictionary[" ".join(k.split())] for k in found))
+
+    def extract_batch(self, texts: Iterable[str]) -> List[List[str]]:
+        """批量提取，返回与输入顺序一致的技能列表"""
+        return [self.extract(text) for text in texts]
+
+
+_default_extractor: Optional[SkillExtractor] = None
+
+
+def get_skill_extractor() -> SkillExtractor:
+    """获取进程内共享的技能提取器（首次调用时编译）"""
+    global _default_extractor
+    if _default_extractor is None:
+        _default_extractor = SkillExtractor()
+    return _default_extractor
+
+
+def _extract_batch_worker(texts: List[str]) -> List[List[str]]:
+    """进程池任务：每个工作进程只编译一次提取器"""
+    return get_skill_extractor().extract_batch(texts)
+
+
+def _batched(items: Iterable, batch_size: int) -> Iterator[List]:
+    """把可迭代对象切分为固定大小的批次"""
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _map_batches(batches: Iterable[List[str]], workers: int) -> Iterator[List[List[str]]]:
+    """逐批提取技能；workers > 1 时把批次分发到进程池，结果顺序与输入一致"""
+    if workers <= 1:
+        extractor = get_skill_extractor()
+        for batch in batches:
+            yield extractor.extract_batch(batch)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(_extract_batch_worker, batches)
+
+
+def extract_skills_from_descriptions(descriptions: Iterable[str],
+                                     batch_size: int = DEFAULT_BATCH_SIZE,
+                                     workers: int = 1) -> Iterator[List[str]]:
+    """
+    对岗位描述批量提取技能
+
+    Args:
+        descriptions: 岗位描述文本的可迭代对象
+        batch_size: 每批描述数
+        workers: 工作进程数，1 表示在当前进程内执行
+
+    Yields:
+        每条描述对应的标准化技能列表（顺序与输入一致）
+    """
+    for result in _map_batches(_batched(descriptions, batch_size), workers):
+        yield from result
+
+
+def extract_job_skills(jobs: Iterable[Dict], merge: bool = False,
+                       batch_size: int = DEFAULT_BATCH_SIZE, workers: int = 1) -> Iterator[Dict]:
+    """
+    用描述中提取的技能填充每个岗位的 skills 字段
+
+    输出仍是岗位迭代器，可以直接交给 analyze_skill_requirements_stream。
+
+    Args:
+        jobs: 岗位信息的可迭代对象
+        merge: True 时与原有手工标注的 skills 合并，False 时直接替换
+        batch_size: 每批岗位数
+        workers: 工作进程数
+
+    Yields:
+        skills 字段已更新的岗位信息
+    """
+    pending = deque()
+
+    def description_batches():
+        for batch in _batched(jobs, batch_size):
+            pending.append(batch)
+            yield [job.get("job_description", "") for job in batch]
+
+    for extracted in _map_batches(description_batches(), workers):
+        batch = pending.popleft()
+        for job, skills in zip(batch, extracted):
+            if merge:
+                skills = list(dict.fromkeys(job.get("skills", []) + skills))
+            yield {**job, "skills": skills}
+
+
+# ======================================================================================
+# 性能测试
+# ======================================================================================
+
+def benchmark_extraction(n: int = 100_000, workers: int = 1) -> Dict:
+    """在n条岗位描述（由模拟数据循环生成）上测量提取耗时"""
+    samples = [job["job_description"] for job in simulate_job_listings()]
+    descriptions = [samples[i % len(samples)] for i in range(n)]
+
+    get_skill_extractor()
+    start = time.perf_counter()
+    total_skills = sum(len(skills) for skills in extract_skills_from_descriptions(descriptions, workers=workers))
+    seconds = time.perf_counter() - start
+
+    return {
+        "descriptions": n,
+        "workers": workers,
+        "seconds": round(seconds, 3),
+        "skills_found": total_skills,
+    }
+
+
+def main():
+    """主函数：展示提取结果并运行性能测试"""
+    for job in extract_job_skills(simulate_job_listings()[:3]):
+        print(f"{job['company']:20s} {job['position']:30s} {', '.join(job['skills'])}")
+
+    print("\n⏱️  技能提取性能测试（100,000条描述）...")
+    for workers in (1, 4):
+        result = benchmark_extraction(workers=workers)
+        print(f"  {workers}个进程: {result['seconds']}s，共提取 {result['skills_found']} 个技能")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+批量技能差距分析
+对N个候选人技能画像 × M个目标岗位技能表，一次性计算覆盖率矩阵和每人的缺失技能列表。
+技能先编码到统一词表，字符串包含关系只在词表之间计算一次，
+之后每个候选人的比较都是 NumPy 布尔矩阵运算
+"""
+
+import random
+import time
+from typing import List, Dict, Set, Tuple
+
+import numpy as np
+
+from shanghai_data_jobs_scraper import identify_skill_gaps
+from skill_taxonomy import get_skill_taxonomy, normalize_text
+
+
+def canonical_skill(skill: str) -> str:
+    """技能的标准名称（小写），用于把别名归到同一技能"""
+    return normalize_text(get_skill_taxonomy().canonical_name(skill))
+
+
+class SkillGapMatrix:
+    """
+    候选人 × 目标岗位的技能覆盖矩阵
+
+    匹配规则与 identify_skill_gaps 一致：已有技能与目标技能（小写）互为子串即视为具备；
+    另外两者在技能分类索引中是同一技能的别名时也视为具备（如 "数据仓库" 与 "Data Warehousing"）。
+    """
+
+    def __init__(self, profiles: Dict[str, Set[str]], targets: Dict[str, Dict[str, int]]):
+        """
+        Args:
+            profiles: 候选人名称 → 当前技能集合
+            targets: 目标岗位名称 → {技能: 出现频率}（如 skill_frequency）
+        """
+        self.profile_names = list(profiles)
+        self.target_names = list(targets)
+        self.targets = targets
+
+        # 目标技能词表（小写去重）及每个原始技能名对应的列
+        self.target_vocab: List[str] = []
+        target_column = {}
+        for skills in targets.values():
+            for skill in skills:
+                key = normalize_text(skill)
+                if key not in target_column:
+                    target_column[key] = len(self.target_vocab)
+                    self.target_vocab.append(key)
+
+        # 候选人技能词表
+        profile_vocab: List[str] = []
+        profile_column = {}
+        for skills in profiles.values():
+            for skill in skills:
+                key = normalize_text(skill)
+                if key not in profile_column:
+                    profile_column[key] = len(profile_vocab)
+                    profile_vocab.append(key)
+
+        # 词表之间的匹配关系只计算一次：covers[p, t] = 互为子串或为同一技能的别名
+        target_canonical = [canonical_skill(ts) for ts in self.target_vocab]
+        covers = np.zeros((len(profile_vocab), len(self.target_vocab)), dtype=bool)
+        for p, ps in enumerate(profile_vocab):
+            pc = canonical_skill(ps)
+            for t, ts in enumerate(self.target_vocab):
+                covers[p, t] = ps in ts or ts in ps or pc == target_canonical[t]
+
+        # 候选人 × 候选人词表
+        profile_matrix = np.zeros((len(self.profile_names), len(profile_vocab)), dtype=bool)
+        for i, skills in enumerate(profiles.values()):
+            profile_matrix[i, [profile_column[normalize_text(s)] for s in skills]] = True
+
+        # 目标岗位 × 目标词表：每个目标技能出现的次数（大小写不同的同名技能分别计数）
+        self._target_columns = [[target_column[normalize_text(s)] for s in skills] for skills in targets.values()]
+        target_counts = np.zeros((len(self.target_names), len(self.target_vocab)), dtype=np.int32)
+        for j, columns in enumerate(self._target_columns):
+            np.add.at(target_counts[j], columns, 1)
+
+        # has[i, t]：候选人i是否具备目标词表中的技能t
+        self.has = (profile_matrix.astype(np.int32) @ covers.astype(np.int32)) > 0
+
+        # 覆盖率 = 具备的目标技能数 / 目标技能总数
+        required_counts = target_counts.sum(axis=1)
+        covered = self.has.astype(np.int32) @ target_counts.T
+        self.coverage = np.divide(covered, required_counts,
+                                  out=np.zeros(covered.shape), where=required_counts > 0) * 100
+
+    def missing(self, profile: int, target: int) -> List[Tuple[str, int]]:
+        """候选人在某个目标岗位上缺失的技能，按频率降序"""
+        skills = list(self.targets[self.target_names[target]].items())
+        has = self.has[profile, self._target_columns[target]]
+        missing = [item for item, ok in zip(skills, has) if not ok]
+        missing.sort(key=lambda x: x[1], reverse=True)
+        return missing
+
+    def skill_gaps(self, profile: int, target: int) -> Dict:
+        """返回与 identify_skill_gaps 格式相同的结果，可直接交给 generate_learning_plan"""
+        skills = list(self.targets[self.target_names[target]].items())
+        has = self.has[profile, self._target_columns[target]]
+        return {
+            "have_skills": [item for item, ok in zip(skills, has) if ok],
+            "missing_skills": self.missing(profile, target),
+            "skill_coverage": float(self.coverage[profile, target]),
+        }
+
+    def to_dict(self) -> Dict:
+        """导出覆盖率矩阵和每人每个目标岗位的缺失技能"""
+        return {
+            "profiles": self.profile_names,
+            "targets": self.target_names,
+            "coverage": np.round(self.coverage, 1).tolist(),
+            "missing_skills": {
+                name: {target: self.missing(i, j) for j, target in enumerate(self.target_names)}
+                for i, name in enumerate(self.profile_names)
+            },
+        }
+
+
+def batch_skill_gaps(profiles: Dict[str, Set[str]], targets: Dict[str, Dict[str, int]]) -> Dict:
+    """
+    批量识别技能差距
+
+    Args:
+        profiles: 候选人名称 → 当前技能集合
+        targets: 目标岗位名称 → {技能: 出现频率}
+
+    Returns:
+        覆盖率矩阵（N×M，百分比）和每人每个目标岗位的缺失技能列表
+    """
+    return SkillGapMatrix(profiles, targets).to_dict()
+
+
+# ======================================================================================
+# 性能测试
+# ======================================================================================
+
+def benchmark_gap_matrix(n_profiles: int = 2000, n_targets: int = 10, seed: int = 42) -> Dict:
+    """对比逐个调用 identify_skill_gaps 和批量矩阵计算的耗时"""
+    rng = random.Random(seed)
+    vocabulary = list(get_skill_taxonomy().alias_index) + [f"domain skill {k}" for k in range(300)]
+    profiles = {f"candidate_{i}": set(rng.sample(vocabulary, 15)) for i in range(n_profiles)}
+    targets = {f"role_{j}": {skill: rng.randint(1, 20) for skill in rng.sample(vocabulary, 40)}
+               for j in range(n_targets)}
+
+    start = time.perf_counter()
+    for skills in profiles.values():
+        for target in targets.values():
+            identify_skill_gaps(skills, target)
+    loop_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    matrix = SkillGapMatrix(profiles, targets)
+    matrix_seconds = time.perf_counter() - start
+
+    return {
+        "profiles": n_profiles,
+        "targets": n_targets,
+        "loop_seconds": round(loop_seconds, 3),
+        "matrix_seconds": round(matrix_seconds, 3),
+        "mean_coverage": round(float(matrix.coverage.mean()), 1),
+    }
+
+
+def main():
+    """主函数：示例和性能测试"""
+    from shanghai_data_jobs_scraper import simulate_job_listings, analyze_skill_requirements
+
+    target = analyze_skill_requirements(simulate_job_listings())["skill_frequency"]
+    profiles = {
+        "传统数仓": {"SQL", "Hive", "Spark", "ETL", "Python", "Hadoop"},
+        "BI分析师": {"SQL", "Excel", "Tableau", "English", "Statistics"},
+    }
+    matrix = SkillGapMatrix(profiles, {"上海外企数据岗": target})
+    for i, name in enumerate(matrix.profile_names):
+        missing = ", ".join(skill for skill, _ in matrix.missing(i, 0)[:5])
+        print(f"  {name}: 覆盖率 {matrix.coverage[i, 0]:.1f}%，优先补齐: {missing}")
+
+    print("\n⏱️  批量技能差距性能测试（2,000人 × 10个目标岗位）...")
+    result = benchmark_gap_matrix()
+    print(f"  逐个比较: {result['loop_seconds']}s")
+    print(f"  矩阵计算: {result['matrix_seconds']}s")
+
+
+if __name__ == "__main__":
+    main()
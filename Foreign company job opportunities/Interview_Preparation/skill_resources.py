@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+技能学习资源目录
+资源目录保存在 skill_resources.json 中，首次使用时加载一次；
+加载时预先为资源键和技能分类索引中的所有别名算好对应的资源键，每个缺失技能O(1)定位到学习资源
+"""
+
+import json
+import os
+import time
+from typing import Dict, Optional
+
+from skill_taxonomy import get_skill_taxonomy
+
+
+SKILL_RESOURCES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "skill_resources.json")
+
+
+class SkillResourceCatalog:
+    """
+    技能学习资源目录
+
+    resolve 只有一条匹配规则（与原先每次调用逐个键扫描的结果相同）：资源键与技能名（小写）互为子串，
+    多个键满足时取目录中靠前的键；不做别名归并（如 pandas 不会解析到 python）。
+    资源键本身和技能分类索引中的所有别名在加载时按该规则预先解析，
+    其他技能名第一次解析后记入同一张表。
+    """
+
+    def __init__(self, resources: Dict[str, Dict]):
+        self.resources = resources
+
+        # 技能名（小写） → 资源键（None 表示没有对应资源）
+        self.alias_index: Dict[str, Optional[str]] = {}
+        for name in list(resources) + list(get_skill_taxonomy().alias_index):
+            if name not in self.alias_index:
+                self.alias_index[name] = self._scan(name)
+
+    def _scan(self, skill_key: str) -> Optional[str]:
+        """按目录顺序线性查找第一个与技能名互为子串的资源键"""
+        for key in self.resources:
+            if key in skill_key or skill_key in key:
+                return key
+        return None
+
+    def resolve(self, skill: str) -> Optional[str]:
+        """返回技能对应的资源键，没有对应资源时返回None"""
+        skill_key = skill.lower()
+        try:
+            return self.alias_index[skill_key]
+        except KeyError:
+            key = self.alias_index[skill_key] = self._scan(skill_key)
+            return key
+
+    def get(self, skill: str) -> Optional[Dict]:
+        """返回技能对应的学习资源，没有对应资源时返回None"""
+        key = self.resolve(skill)
+        return self.resources[key] if key is not None else None
+
+
+_catalog: Optional[SkillResourceCatalog] = None
+
+
+def get_skill_resource_catalog() -> SkillResourceCatalog:
+    """获取进程内共享的资源目录（首次调用时从 skill_resources.json 加载）"""
+    global _catalog
+    if _catalog is None:
+        with open(SKILL_RESOURCES_FILE, 'r', encoding='utf-8') as f:
+            _catalog = SkillResourceCatalog(json.load(f))
+    return _catalog
+
+
+# ======================================================================================
+# 性能测试
+# ======================================================================================
+
+def benchmark_learning_plan(rounds: int = 2000) -> Dict:
+    """
+    测量 generate_learning_plan 的单次调用耗时，并对比其中资源查找部分：
+    scan: 原实现的匹配规则——每个缺失技能按目录顺序逐个键线性匹配（即 _scan）
+    resolve: 预先解析的别名表查找
+    原实现每次调用还要重新执行资源字典字面量，这部分已移到 skill_resources.json，不在对比之列。
+    """
+    from shanghai_data_jobs_scraper import (
+        simulate_job_listings, analyze_skill_requirements, identify_skill_gaps, generate_learning_plan
+    )
+
+    target = analyze_skill_requirements(simulate_job_listings())["skill_frequency"]
+    skill_gaps = identify_skill_gaps({"Hive", "Shell"}, target)
+    catalog = get_skill_resource_catalog()
+    missing = [skill for skill, _ in skill_gaps["missing_skills"]]
+
+    def timed(call) -> float:
+        start = time.perf_counter()
+        for _ in range(rounds):
+            call()
+        return round((time.perf_counter() - start) / rounds * 1e6, 1)
+
+    return {
+        "missing_skills": len(missing),
+        "plan_us_per_call": timed(lambda: generate_learning_plan(skill_gaps)),
+        "scan_us_per_call": timed(lambda: [catalog._scan(skill.lower()) for skill in missing]),
+        "resolve_us_per_call": timed(lambda: [catalog.resolve(skill) for skill in missing]),
+    }
+
+
+def main():
+    """主函数：运行单次调用耗时测试"""
+    print("⏱️  generate_learning_plan 单次调用耗时...")
+    result = benchmark_learning_plan()
+    print(f"  生成学习计划: {result['plan_us_per_call']}µs")
+    print(f"  查找 {result['missing_skills']} 个缺失技能的资源: 逐键扫描 {result['scan_us_per_call']}µs，"
+          f"别名表 {result['resolve_us_per_call']}µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+技能分类索引
+预先构建技能 → 分类的精确/别名查找表，以及基于 Aho-Corasick 的多模式匹配器，
+替代 analyze_skill_requirements 中逐个关键词的子串扫描
+"""
+
+import random
+import time
+from typing import List, Dict, Tuple, Optional, Iterable
+
+
+# 分类名称（与 analyze_skill_requirements 返回结果中的键一致）
+TECHNICAL = "technical_skills"
+TOOLS_PLATFORMS = "tools_platforms"
+SOFT = "soft_skills"
+
+# 多个分类同时命中时的优先顺序（与原有 if/elif 顺序一致）
+CATEGORY_PRIORITY = [TECHNICAL, TOOLS_PLATFORMS, SOFT]
+
+# classify 结果缓存的最大条目数
+CLASSIFY_CACHE_SIZE = 100_000
+
+
+# 技能分类表：分类 → {标准名称: [别名...]}
+# 别名统一小写；标准名称本身也会作为别名加入索引
+SKILL_TAXONOMY = {
+    TECHNICAL: {
+        "SQL": ["t-sql", "tsql", "pl/sql", "spark sql", "sql server"],
+        "Python": ["python3", "pandas", "numpy", "scikit-learn"],
+        "Spark": ["apache spark", "pyspark", "spark streaming"],
+        "ETL": ["elt", "data pipeline", "data pipelines", "数据管道"],
+        "Java": [],
+        "Scala": [],
+        "R": ["r语言", "r programming"],
+        "Shell": ["bash", "shell scripting"],
+        "Machine Learning": ["ml", "机器学习"],
+        "Statistics": ["统计", "统计学"],
+        "Data Warehousing": ["data warehouse", "数据仓库", "数仓"],
+        "Data Modeling": ["dimensional modeling", "数据建模", "维度建模"],
+    },
+    TOOLS_PLATFORMS: {
+        "AWS": ["amazon web services", "redshift", "glue", "emr", "athena", "sagemaker"],
+        "Azure": ["microsoft azure", "azure data factory", "synapse"],
+        "GCP": ["google cloud", "bigquery", "dataflow"],
+        "Tableau": [],
+        "Power BI": ["powerbi"],
+        "Snowflake": [],
+        "Airflow": ["apache airflow"],
+        "dbt": ["data build tool"],
+        "Hadoop": ["hdfs", "hive"],
+        "Kafka": ["apache kafka"],
+        "Oracle": [],
+        "Databricks": [],
+        "Looker": [],
+        "Informatica": [],
+        "Git": ["github", "gitlab"],
+    },
+    SOFT: {
+        "English": ["英语", "english communication"],
+        "Presentation": ["presentations", "storytelling"],
+        "Consulting": ["咨询"],
+        "Communication": ["沟通", "中文沟通"],
+        "Stakeholder Management": ["stakeholder"],
+    },
+}
+
+
+def normalize_text(text: str) -> str:
+    """统一大小写和空白，用作查找键"""
+    return " ".join(text.lower().split())
+
+
+def _is_word_char(ch: str) -> bool:
+    """ASCII字母数字视为单词字符；中文等字符不做单词边界检查"""
+    return ch.isascii() and ch.isalnum()
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick 多模式匹配器
+
+    一次扫描文本即可找出所有关键词，耗时与文本长度成正比，与关键词数量无关。
+    以ASCII字母数字开头/结尾的关键词要求单词边界，避免 'r' 命中 'spark'；
+    单个字符的关键词两侧还不能是 '&'，避免 'r' 命中 'r&d'。
+    """
+
+    def __init__(self, keywords: Dict[str, object]):
+        """
+        Args:
+            keywords: 关键词（会被normalize） → 命中时返回的值
+        """
+        # goto表、失败指针、每个状态的输出（关键词长度, 值）
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[int, object, bool, bool]]] = [[]]
+
+        for keyword, value in keywords.items():
+            keyword = normalize_text(keyword)
+            if not keyword:
+                continue
+            state = 0
+            for ch in keyword:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = nxt
+            self._out[state].append((
+                len(keyword), value,
+                _is_word_char(keyword[0]), _is_word_char(keyword[-1])
+            ))
+
+        self._build_fail_links()
+
+    def _build_fail_links(self):
+        """BFS构建失败指针，并合并后缀状态的输出"""
+        queue = list(self._goto[0].values())
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                target = self._goto[f].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def iter_matches(self, text: str, normalized: bool = False) -> Iterable[Tuple[int, int, object]]:
+        """
+        扫描文本，产出 (起始位置, 结束位置, 值)
+
+        Args:
+            text: 待匹配文本
+            normalized: 文本是否已经过 normalize_text 处理
+        """
+        if not normalized:
+            text = normalize_text(text)
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+        n = len(text)
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if not out[state]:
+                continue
+            end = i + 1
+            for length, value, check_left, check_right in out[state]:
+                start = end - length
+                if check_left and start > 0 and _is_word_char(text[start - 1]):
+                    continue
+                if check_right and end < n and _is_word_char(text[end]):
+                    continue
+                if length == 1 and check_left and ((start > 0 and text[start - 1] == "&")
+                                                   or (end < n and text[end] == "&")):
+                    continue
+                yield start, end, value
+
+    def find_all(self, text: str) -> List[object]:
+        """返回文本中命中的所有值（去重，保持首次出现顺序）"""
+        seen = {}
+        for _, _, value in self.iter_matches(text):
+            if value not in seen:
+                seen[value] = None
+        return list(seen)
+
+
+class SkillTaxonomy:
+    """
+    技能分类索引：精确/别名查找 + 自由文本多模式匹配
+    """
+
+    def __init__(self, taxonomy: Dict[str, Dict[str, List[str]]] = None):
+        taxonomy = taxonomy if taxonomy is not None else SKILL_TAXONOMY
+
+        # 别名 → (标准名称, 分类)；同一别名出现在多个分类时保留优先级高的
+        self.alias_index: Dict[str, Tuple[str, str]] = {}
+        for category in CATEGORY_PRIORITY:
+            for canonical, aliases in taxonomy.get(category, {}).items():
+                for alias in [canonical] + aliases:
+                    self.alias_index.setdefault(normalize_text(alias), (canonical, category))
+
+        self.matcher = KeywordMatcher(self.alias_index)
+        self._category_rank = {c: i for i, c in enumerate(CATEGORY_PRIORITY)}
+
+        # 原始技能字符串 → 分类 的结果缓存（技能词表通常很小，命中后无需再normalize）
+        self._classify_cache: Dict[str, str] = {}
+
+    def lookup(self, skill: str) -> Optional[Tuple[str, str]]:
+        """精确/别名查找，返回 (标准名称, 分类)，未收录返回None"""
+        return self.alias_index.get(normalize_text(skill))
+
+    def canonical_name(self, skill: str) -> str:
+        """返回技能的标准名称，未收录则原样返回"""
+        hit = self.lookup(skill)
+        return hit[0] if hit else skill
+
+    def classify(self, skill: str, default: str = TECHNICAL) -> str:
+        """
+        将技能归入 technical / tools_platforms / soft 三类之一
+
+        先做O(1)别名查找；未命中时对技能文本做一次多模式扫描，
+        多个分类命中时按 CATEGORY_PRIORITY 取优先级最高的；都未命中返回default。
+        """
+        category = self._classify_cache.get(skill)
+        if category is None:
+            category = self._classify_uncached(skill)
+            if len(self._classify_cache) < CLASSIFY_CACHE_SIZE:
+                self._classify_cache[skill] = category
+        return category or default
+
+    def _classify_uncached(self, skill: str) -> str:
+        """分类逻辑本体；未命中任何分类时返回空字符串"""
+        key = normalize_text(skill)
+        hit = self.alias_index.get(key)
+        if hit:
+            return hit[1]
+
+        best = None
+        for _, _, (_, category) in self.matcher.iter_matches(key, normalized=True):
+            rank = self._category_rank[category]
+            if best is None or rank < best:
+                best = rank
+                if rank == 0:
+                    break
+        return CATEGORY_PRIORITY[best] if best is not None else ""
+
+    def extract(self, text: str) -> List[str]:
+        """从自由文本中提取出现的技能标准名称（去重，保持出现顺序）"""
+        return [canonical for canonical, _ in self.matcher.find_all(text)]
+
+
+_default_taxonomy: Optional[SkillTaxonomy] = None
+
+
+def get_skill_taxonomy() -> SkillTaxonomy:
+    """获取进程内共享的技能分类索引（首次调用时构建）"""
+    global _default_taxonomy
+    if _default_taxonomy is None:
+        _default_taxonomy = SkillTaxonomy()
+    return _default_taxonomy
+
+
+def classify_skill(skill: str) -> str:
+    """使用默认分类索引对单个技能分类"""
+    return get_skill_taxonomy().classify(skill)
+
+
+# ======================================================================================
+# 性能测试
+# ======================================================================================
+
+def _classify_skill_substring(skill: str) -> str:
+    """原有的子串扫描分类逻辑，仅用于性能对比"""
+    skill_lower = skill.lower()
+    if any(tech in skill_lower for tech in ['sql', 'python', 'spark', 'etl', 'java', 'scala', 'r']):
+        return TECHNICAL
+    elif any(tool in skill_lower for tool in ['aws', 'azure', 'gcp', 'tableau', 'power bi', 'snowflake',
+                                              'airflow', 'dbt', 'hadoop', 'kafka', 'oracle']):
+        return TOOLS_PLATFORMS
+    elif any(soft in skill_lower for soft in ['english', 'presentation', 'consulting', 'communication']):
+        return SOFT
+    return TECHNICAL
+
+
+def benchmark_classify(n: int = 1_000_000, seed: int = 42) -> Dict:
+    """
+    对比子串扫描与分类索引在n个技能字符串上的耗时
+
+    样本一半是已收录技能的随机大小写写法（走别名查找），
+    一半是带修饰词和编号的变体（走多模式扫描），几乎每个字符串都不相同；
+    分类索引直接调用 _classify_uncached，测的是分类本身而不是结果缓存。
+    另外单独测量在少量不同写法上反复调用 classify（命中结果缓存）的耗时。
+    """
+    rng = random.Random(seed)
+    known = [alias for alias in get_skill_taxonomy().alias_index]
+    modifiers = ["Advanced", "Hands-on", "Production", "Modern", "Enterprise"]
+
+    def random_case(text: str) -> str:
+        return "".join(ch.upper() if rng.random() < 0.3 else ch for ch in text)
+
+    skills = [random_case(rng.choice(known)) if i % 2
+              else f"{rng.choice(modifiers)} {rng.choice(known).title()} {i}"
+              for i in range(n)]
+    repeated = [rng.choice(known) if i % 2 else f"Advanced {rng.choice(known).title()}" for i in range(n)]
+
+    taxonomy = SkillTaxonomy()
+
+    start = time.perf_counter()
+    for skill in skills:
+        _classify_skill_substring(skill)
+    substring_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for skill in skills:
+        taxonomy._classify_uncached(skill)
+    index_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for skill in repeated:
+        taxonomy.classify(skill)
+    cached_seconds = time.perf_counter() - start
+
+    return {
+        "skills": n,
+        "distinct_skills": len(set(skills)),
+        "substring_scan_seconds": round(substring_seconds, 3),
+        "taxonomy_index_seconds": round(index_seconds, 3),
+        "cached_classify_seconds": round(cached_seconds, 3),
+    }
+
+
+def main():
+    """主函数：运行性能测试"""
+    print("⏱️  技能分类性能测试（1,000,000个技能字符串）...")
+    result = benchmark_classify()
+    print(f"  子串扫描: {result['substring_scan_seconds']}s")
+    print(f"  分类索引（不使用结果缓存，{result['distinct_skills']} 个不同写法）: "
+          f"{result['taxonomy_index_seconds']}s")
+    print(f"  分类索引（少量写法反复出现，命中结果缓存）: {result['cached_classify_seconds']}s")
+
+    print("\n分类示例:")
+    for skill in ["Spark", "Presentation", "Power BI", "Oracle", "Data Warehousing", "Spark SQL", "R"]:
+        print(f"  {skill:20s} 原逻辑: {_classify_skill_substring(skill):16s} 新逻辑: {classify_skill(skill)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+按时间窗口的技能趋势分析
+岗位按 posted_date 计入 日期 × 技能 计数矩阵（NumPy int32），
+提供每日/每周计数、滚动7天/30天窗口合计和环比增长率；
+最近窗口的合计随新岗位增量更新，追加一天的岗位只需 O(新岗位数)，不必重算历史
+"""
+
+import random
+import time
+from datetime import date, timedelta
+from typing import List, Dict, Iterable, Tuple
+
+import numpy as np
+
+
+DEFAULT_WINDOWS = (7, 30)
+
+
+class SkillTrends:
+    """
+    日期 × 技能 计数矩阵
+
+    - counts[d, s]：第 start + d 天发布、要求技能s的岗位数
+    - postings[d]：第 start + d 天发布的岗位数
+    - 对每个窗口长度w维护 (最近w天合计, 再往前w天合计)，用于滚动窗口和增长率
+    """
+
+    def __init__(self, windows: Iterable[int] = DEFAULT_WINDOWS):
+        self.windows = tuple(windows)
+        self.skill_index: Dict[str, int] = {}
+        self.skills: List[str] = []
+
+        self.start = None          # 第0行对应日期的序数（date.toordinal）
+        self.latest = None         # 已有岗位中最新日期的序数
+        self.counts = np.zeros((0, 0), dtype=np.int32)
+        self.postings = np.zeros(0, dtype=np.int32)
+
+        # 窗口长度 → [最近w天合计, 前一个w天合计]（技能维度）及对应的岗位数
+        self._window_counts = {w: [np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)] for w in self.windows}
+        self._window_postings = {w: [0, 0] for w in self.windows}
+
+    @property
+    def days(self) -> int:
+        return 0 if self.start is None else self.latest - self.start + 1
+
+    # ---------------------------------------------------------------- 写入
+
+    def _ensure_capacity(self, first: int, last: int, n_skills: int):
+        """扩展矩阵以容纳 [first, last] 日期区间和 n_skills 个技能（按倍数预留空间）"""
+        if self.start is None:
+            self.start = first
+        if first < self.start:
+            # 早于现有起始日期的岗位：在矩阵前部补行
+            pad = self.start - first
+            self.counts = np.pad(self.counts, ((pad, 0), (0, 0)))
+            self.postings = np.pad(self.postings, (pad, 0))
+            self.start = first
+
+        rows, cols = self.counts.shape
+        need_rows, need_cols = last - self.start + 1, n_skills
+        if need_rows > rows or need_cols > cols:
+            new_rows = max(need_rows, rows * 2 if need_rows > rows else rows, 32)
+            new_cols = max(need_cols, cols * 2 if need_cols > cols else cols, 64)
+            counts = np.zeros((new_rows, new_cols), dtype=np.int32)
+            counts[:rows, :cols] = self.counts
+            self.counts = counts
+            self.postings = np.pad(self.postings, (0, new_rows - len(self.postings)))
+        for pair in self._window_counts.values():
+            for k in range(2):
+                if len(pair[k]) < self.counts.shape[1]:
+                    pair[k] = np.pad(pair[k], (0, self.counts.shape[1] - len(pair[k])))
+
+    def _advance(self, new_latest: int):
+        """最新日期前移：离开最近窗口的行转入前一窗口，离开前一窗口的行减掉"""
+        if self.latest is None:
+            self.latest = new_latest
+            return
+        for day in range(self.latest + 1, new_latest + 1):
+            for w in self.windows:
+                current, previous = self._window_counts[w]
+                leaving, expiring = day - w - self.start, day - 2 * w - self.start
+                if leaving >= 0:
+                    current -= self.counts[leaving]
+                    previous += self.counts[leaving]
+                    self._window_postings[w][0] -= int(self.postings[leaving])
+                    self._window_postings[w][1] += int(self.postings[leaving])
+                if expiring >= 0:
+                    previous -= self.counts[expiring]
+                    self._window_postings[w][1] -= int(self.postings[expiring])
+            if day - self.latest > 2 * max(self.windows):
+                # 跨越的空白天数超过所有窗口，后续的天不会再影响窗口
+                break
+        self.latest = new_latest
+
+    def add(self, jobs: Iterable[Dict]):
+        """
+        追加岗位（可以是新一天的岗位，也可以是补录的历史岗位）
+
+        只在矩阵中累加这些岗位的计数，并更新受影响的窗口合计，不重新统计已有岗位。
+        posted_date 只取前10位（兼容完整的 ISO 日期时间），缺失或无法解析的岗位跳过。
+        """
+        rows, cols, job_days = [], [], []
+        for job in jobs:
+            try:
+                day = date.fromisoformat((job.get("posted_date") or "")[:10]).toordinal()
+            except ValueError:
+                continue
+            job_days.append(day)
+            for skill in dict.fromkeys(job.get("skills", [])):
+                column = self.skill_index.get(skill)
+                if column is None:
+                    column = self.skill_index[skill] = len(self.skills)
+                    self.skills.append(skill)
+                rows.append(day)
+                cols.append(column)
+        if not job_days:
+            return
+
+        first, last = min(job_days), max(job_days)
+        self._ensure_capacity(first, max(last, self.latest or last), len(self.skills))
+        if self.latest is None or last > self.latest:
+            self._advance(last)
+
+        rows = np.array(rows, dtype=np.int64)
+        cols = np.array(cols, dtype=np.int64)
+        job_days = np.array(job_days, dtype=np.int64)
+        np.add.at(self.counts, (rows - self.start, cols), 1)
+        np.add.at(self.postings, job_days - self.start, 1)
+
+        # 窗口合计：只累加落在窗口内的新岗位
+        for w in self.windows:
+            age, job_age = self.latest - rows, self.latest - job_days
+            current, previous = self._window_counts[w]
+            np.add.at(current, cols[age < w], 1)
+            np.add.at(previous, cols[(age >= w) & (age < 2 * w)], 1)
+            self._window_postings[w][0] += int(np.count_nonzero(job_age < w))
+            self._window_postings[w][1] += int(np.count_nonzero((job_age >= w) & (job_age < 2 * w)))
+
+    # ---------------------------------------------------------------- 查询
+
+    def _date(self, row: int) -> str:
+        return date.fromordinal(self.start + row).isoformat()
+
+    def daily(self, skill: str) -> Dict[str, int]:
+        """某个技能的每日计数"""
+        column = self.skill_index[skill]
+        return {self._date(d): int(c) for d, c in enumerate(self.counts[:self.days, column])}
+
+    def weekly(self) -> Tuple[List[str], np.ndarray]:
+        """
+        按周（周一开始）汇总
+
+        Returns:
+            (每周周一的日期列表, 周 × 技能 计数矩阵)
+        """
+        if not self.days:
+            return [], np.zeros((0, len(self.skills)), dtype=np.int64)
+        weekdays = date.fromordinal(self.start).weekday()
+        week_starts = list(range(-weekdays, self.days, 7))
+        boundaries = [max(start, 0) for start in week_starts]
+        weekly = np.add.reduceat(self.counts[:self.days, :len(self.skills)].astype(np.int64), boundaries, axis=0)
+        return [self._date(start) for start in week_starts], weekly
+
+    def rolling(self, window: int) -> np.ndarray:
+        """整个历史上每天的滚动窗口合计（天 × 技能），由累计和一次算出"""
+        cumulative = np.cumsum(self.counts[:self.days, :len(self.skills)], axis=0, dtype=np.int64)
+        rolling = cumulative.copy()
+        rolling[window:] -= cumulative[:-window]
+        return rolling
+
+    def window(self, window: int) -> Dict:
+        """
+        最近一个窗口的技能计数、占比和环比增长率（与再往前一个同长度窗口相比）
+
+        Returns:
+            {"window_days", "end_date", "postings", "skills": {技能: {count, share, growth}}}
+            growth 为 None 表示前一窗口内没有该技能
+        """
+        current, previous = self._window_counts[window]
+        postings, previous_postings = self._window_postings[window]
+        skills = {}
+        for column in np.flatnonzero(current[:len(self.skills)]).tolist():
+            count, before = int(current[column]), int(previous[column])
+            skills[self.skills[column]] = {
+                "count": count,
+                "share": round(count / postings * 100, 1) if postings else 0.0,
+                "growth": round((count - before) / before * 100, 1) if before else None,
+            }
+        skills = dict(sorted(skills.items(), key=lambda item: item[1]["count"], reverse=True))
+        return {
+            "window_days": window,
+            "end_date": date.fromordinal(self.latest).isoformat() if self.latest is not None else None,
+            "postings": postings,
+            "previous_postings": previous_postings,
+            "skills": skills,
+        }
+
+    def top_growing(self, window: int = 7, k: int = 10, min_count: int = 5) -> List[Tuple[str, float]]:
+        """最近窗口内增长最快的技能（至少出现 min_count 次，且前一窗口出现过）"""
+        current, previous = self._window_counts[window]
+        n = len(self.skills)
+        current, previous = current[:n], previous[:n]
+        eligible = (current >= min_count) & (previous > 0)
+        growth = np.zeros(n)
+        np.divide(current - previous, previous, out=growth, where=eligible)
+        columns = np.flatnonzero(eligible)
+        columns = columns[np.argsort(-growth[columns], kind="stable")][:k]
+        return [(self.skills[c], round(float(growth[c]) * 100, 1)) for c in columns.tolist()]
+
+
+def build_skill_trends(jobs: Iterable[Dict], windows: Iterable[int] = DEFAULT_WINDOWS) -> SkillTrends:
+    """由岗位列表构建技能趋势"""
+    trends = SkillTrends(windows)
+    trends.add(jobs)
+    return trends
+
+
+# ======================================================================================
+# 性能测试
+# ======================================================================================
+
+def _generate_days(n_days: int, per_day: int, seed: int = 42) -> List[List[Dict]]:
+    """生成 n_days 天、每天 per_day 个岗位（技能热度随时间缓慢变化）"""
+    rng = random.Random(seed)
+    skills = [f"Skill {i}" for i in range(2000)]
+    first = date(2025, 1, 1)
+    days = []
+    for d in range(n_days):
+        posted = (first + timedelta(days=d)).isoformat()
+        hot = skills[d % 100: d % 100 + 50]
+        days.append([{"posted_date": posted, "skills": rng.sample(hot, 4) + rng.sample(skills, 6)}
+                     for _ in range(per_day)])
+    return days
+
+
+def benchmark_trends(n_days: int = 365, per_day: int = 1000) -> Dict:
+    """对比 追加一天的岗位（增量更新）与 用全部历史重新构建 的耗时"""
+    days = _generate_days(n_days + 1, per_day)
+    history = [job for day in days[:-1] for job in day]
+
+    start = time.perf_counter()
+    trends = build_skill_trends(history)
+    build_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    trends.add(days[-1])
+    trends.window(7)
+    trends.window(30)
+    append_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    rebuilt = build_skill_trends(history + days[-1])
+    rebuilt.window(7)
+    rebuilt.window(30)
+    rebuild_seconds = time.perf_counter() - start
+
+    assert trends.window(30) == rebuilt.window(30)
+    assert np.array_equal(trends.rolling(7)[-1], np.asarray(trends._window_counts[7][0][:len(trends.skills)]))
+
+    return {
+        "postings": len(history),
+        "build_seconds": round(build_seconds, 2),
+        "append_day_ms": round(append_seconds * 1000, 1),
+        "rebuild_seconds": round(rebuild_seconds, 2),
+    }
+
+
+def main():
+    """主函数：示例和性能测试"""
+    from shanghai_data_jobs_scraper import simulate_job_listings
+
+    trends = build_skill_trends(simulate_job_listings())
+    result = trends.window(7)
+    print(f"📈 截至 {result['end_date']} 的7天窗口（{result['postings']} 个岗位）:")
+    for skill, stats in list(result["skills"].items())[:8]:
+        print(f"  {skill}: {stats['count']} 次（{stats['share']}%）")
+
+    print("\n⏱️  技能趋势增量更新性能测试（365天 × 每天1,000个岗位）...")
+    result = benchmark_trends()
+    print(f"  构建全部历史: {result['build_seconds']}s")
+    print(f"  追加一天岗位: {result['append_day_ms']}ms")
+    print(f"  重新构建: {result['rebuild_seconds']}s")
+
+
+if __name__ == "__main__":
+    main()
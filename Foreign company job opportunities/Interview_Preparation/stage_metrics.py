@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+流水线分阶段计时与内存统计
+用 with stage("analyze"): ... 或 @timed("analyze") 标记阶段，记录每个阶段的
+墙钟时间、CPU时间和 tracemalloc 峰值（阶段开始后新增的内存峰值），支持嵌套；
+每次运行输出一个 JSON 指标文件。
+未启用时 stage() 直接返回共享的空上下文，@timed 只多一次属性判断，几乎没有开销；
+tracemalloc 只在启用且需要内存统计时才导入和启动
+"""
+
+import functools
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import List, Dict, Optional
+
+
+# 设置该环境变量（目录）时，没有显式指定指标文件的运行也会输出指标，
+# 文件名为 <脚本>_metrics_<时间>.json
+METRICS_DIR_ENV = "STAGE_METRICS_DIR"
+
+
+class _NullStage:
+    """未启用时 stage() 返回的空上下文（共享一个实例）"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    """一个正在执行的阶段"""
+
+    __slots__ = ("recorder", "record", "wall", "cpu", "memory", "peak")
+
+    def __init__(self, recorder: "StageRecorder", name: str):
+        self.recorder = recorder
+        self.record = {"name": name, "depth": len(recorder._stack)}
+
+    def __enter__(self):
+        recorder = self.recorder
+        recorder.stages.append(self.record)   # 按开始顺序记录，嵌套阶段排在外层阶段之后
+        if recorder.trace_memory:
+            self.memory = recorder._fold_peak()
+            self.peak = self.memory
+        recorder._stack.append(self)
+        self.cpu = time.process_time()
+        self.wall = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        wall = time.perf_counter() - self.wall
+        cpu = time.process_time() - self.cpu
+        recorder = self.recorder
+        if recorder.trace_memory:
+            current = recorder._fold_peak()
+            self.record["peak_kb"] = round((self.peak - self.memory) / 1024, 1)
+            self.record["net_kb"] = round((current - self.memory) / 1024, 1)
+        recorder._stack.pop()
+        self.record["wall_ms"] = round(wall * 1000, 3)
+        self.record["cpu_ms"] = round(cpu * 1000, 3)
+        if exc[0] is not None:
+            self.record["error"] = exc[0].__name__
+        return False
+
+
+class StageRecorder:
+    """
+    阶段记录器
+
+    - stages：按开始顺序的阶段记录 {"name", "depth", "wall_ms", "cpu_ms", "peak_kb", "net_kb"}
+    - tracemalloc 峰值在每个阶段开始/结束时折算到所有未结束的阶段后重置，
+      因此嵌套阶段和外层阶段的峰值都是准确的
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.trace_memory = False
+        self.stages: List[Dict] = []
+        self._stack: List[_Stage] = []
+        self._started_tracemalloc = False
+
+    def enable(self, trace_memory: bool = True):
+        """开始记录（trace_memory 为 True 时启动 tracemalloc，会让被测代码变慢）"""
+        self.enabled = True
+        self.trace_memory = trace_memory
+        if trace_memory:
+            import tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracemalloc = True
+
+    def disable(self):
+        """停止记录（只停止由本记录器启动的 tracemalloc）"""
+        if self._started_tracemalloc:
+            import tracemalloc
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        self.enabled = False
+        self.trace_memory = False
+
+    def reset(self):
+        self.stages = []
+        self._stack = []
+
+    def _fold_peak(self) -> int:
+        """把上次重置以来的峰值计入所有未结束的阶段，重置峰值，返回当前内存"""
+        import tracemalloc
+        current, peak = tracemalloc.get_traced_memory()
+        for stage in self._stack:
+            if peak > stage.peak:
+                stage.peak = peak
+        tracemalloc.reset_peak()
+        return current
+
+    def stage(self, name: str):
+        """标记一个阶段：with recorder.stage("analyze"): ..."""
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name)
+
+    def timed(self, name: str = None):
+        """装饰器：把函数的每次调用记录为一个阶段（默认用函数名）"""
+        def decorator(func):
+            stage_name = name or func.__name__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with _Stage(self, stage_name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def to_dict(self) -> Dict:
+        """顶层阶段的合计和全部阶段记录"""
+        top = [stage for stage in self.stages if stage["depth"] == 0 and "wall_ms" in stage]
+        total = {
+            "wall_ms": round(sum(stage["wall_ms"] for stage in top), 3),
+            "cpu_ms": round(sum(stage["cpu_ms"] for stage in top), 3),
+        }
+        if self.trace_memory and top:
+            total["peak_kb"] = max(stage["peak_kb"] for stage in top)
+        return {"trace_memory": self.trace_memory, "total": total, "stages": self.stages}
+
+    def save(self, filename: str, **meta) -> Dict:
+        """写入 JSON 指标文件（meta 中的字段放在最前面）"""
+        metrics = {**meta, **self.to_dict()}
+        directory = os.path.dirname(filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(metrics, f, ensure_ascii=False, indent=2)
+        return metrics
+
+
+_default_recorder: Optional[StageRecorder] = None
+
+
+def get_stage_recorder() -> StageRecorder:
+    """获取进程内共享的阶段记录器"""
+    global _default_recorder
+    if _default_recorder is None:
+        _default_recorder = StageRecorder()
+    return _default_recorder
+
+
+def stage(name: str):
+    """在共享记录器上标记一个阶段"""
+    return get_stage_recorder().stage(name)
+
+
+def timed(name: str = None):
+    """在共享记录器上把函数调用记录为阶段的装饰器"""
+    return get_stage_recorder().timed(name)
+
+
+def _metrics_file_for(script: str, metrics_file: Optional[str]) -> Optional[str]:
+    if metrics_file:
+        return metrics_file
+    directory = os.environ.get(METRICS_DIR_ENV)
+    if directory:
+        return os.path.join(directory, f"{script}_metrics_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    return None
+
+
+@contextmanager
+def instrumented_run(script: str, metrics_file: str = None, trace_memory: bool = True):
+    """
+    一次带指标的运行：指定了 metrics_file（或设置了 STAGE_METRICS_DIR）时启用共享记录器，
+    结束时（包括异常退出）写入指标文件并停用；否则什么都不做
+
+    Args:
+        script: 脚本/命令名称，写入指标文件
+        metrics_file: 指标文件路径
+        trace_memory: 是否用 tracemalloc 统计内存峰值
+    """
+    metrics_file = _metrics_file_for(script, metrics_file)
+    recorder = get_stage_recorder()
+    if metrics_file is None or recorder.enabled:
+        # 未启用，或已经在外层运行中（如 cli 调用的 main 内部再调用其他 main）
+        yield recorder
+        return
+
+    recorder.reset()
+    recorder.enable(trace_memory)
+    started_at = datetime.now().isoformat(timespec="seconds")
+    try:
+        yield recorder
+    finally:
+        recorder.save(metrics_file, script=script, started_at=started_at,
+                      python=sys.version.split()[0], argv=sys.argv)
+        recorder.disable()
+        print(f"\n📈 阶段指标已保存到: {metrics_file}")
+
+
+# ======================================================================================
+# 性能测试
+# ======================================================================================
+
+def benchmark_overhead(calls: int = 200_000) -> Dict:
+    """
+    测量每次 stage() 进入/退出的开销：
+    未启用、启用（不统计内存）、启用（统计内存）
+    """
+    recorder = StageRecorder()
+    result = {"calls": calls}
+
+    def loop() -> float:
+        start = time.perf_counter()
+        for _ in range(calls):
+            with recorder.stage("noop"):
+                pass
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(calls):
+        pass
+    baseline = time.perf_counter() - start
+
+    result["disabled_ns"] = round((loop() - baseline) / calls * 1e9, 1)
+    recorder.enable(trace_memory=False)
+    result["enabled_us"] = round((loop() - baseline) / calls * 1e6, 2)
+    recorder.disable()
+    recorder.reset()
+    recorder.enable(trace_memory=True)
+    result["enabled_memory_us"] = round((loop() - baseline) / calls * 1e6, 2)
+    recorder.disable()
+    return result
+
+
+def benchmark_pipeline(repeat: int = 5) -> Dict:
+    """
+    对岗位分析流水线（plan 模式，输出到临时目录）
+    比较不启用 / 启用计时 / 启用计时+内存 的耗时
+    """
+    import contextlib
+    import io
+    import tempfile
+    from shanghai_data_jobs_scraper import main as analysis_main
+
+    def run(tmp: str, metrics_file: str = None):
+        with contextlib.redirect_stdout(io.StringIO()):
+            analysis_main(output_dir=tmp, plan_only=True, metrics_file=metrics_file)
+
+    def best(metrics: bool) -> float:
+        timings = []
+        with tempfile.TemporaryDirectory() as tmp:
+            metrics_file = os.path.join(tmp, "metrics.json") if metrics else None
+            for _ in range(repeat):
+                start = time.perf_counter()
+                run(tmp, metrics_file)
+                timings.append(time.perf_counter() - start)
+        return round(min(timings) * 1000, 1)
+
+    result = {"disabled_ms": best(metrics=False), "enabled_ms": best(metrics=True)}
+    recorder = get_stage_recorder()
+    with tempfile.TemporaryDirectory() as tmp:
+        metrics_file = os.path.join(tmp, "metrics.json")
+        run(tmp, metrics_file)
+        with open(metrics_file, 'r', encoding='utf-8') as f:
+            result["stages"] = [(entry["name"], entry["wall_ms"], entry.get("peak_kb"))
+                                for entry in json.load(f)["stages"]]
+    assert not recorder.enabled
+    return result
+
+
+def main():
+    """主函数：运行开销测试，并展示岗位分析流水线的阶段指标"""
+    print("⏱️  阶段记录开销（每次进入+退出）...")
+    result = benchmark_overhead()
+    print(f"  未启用: {result['disabled_ns']}ns，启用: {result['enabled_us']}µs，"
+          f"启用+tracemalloc: {result['enabled_memory_us']}µs")
+
+    print("\n⏱️  岗位分析流水线（plan 模式）...")
+    result = benchmark_pipeline()
+    print(f"  不记录: {result['disabled_ms']}ms，记录（含 tracemalloc）: {result['enabled_ms']}ms")
+    for name, wall_ms, peak_kb in result["stages"]:
+        print(f"    {name:<20} {wall_ms:8.2f}ms  峰值 {peak_kb}KB")
+
+
+if __name__ == "__main__":
+    main()
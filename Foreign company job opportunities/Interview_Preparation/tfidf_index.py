@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+岗位描述的 TF-IDF 相似度检索
+英文按词、中文按单字和相邻双字切分，词频以 CSR 格式存入 array，倒排索引为 NumPy 数组；
+支持"与这个岗位最相似的岗位"和"与我的简历最相似的岗位" top-k 余弦查询，
+可以保存到磁盘，新增岗位不需要重建整个索引
+"""
+
+import json
+import math
+import os
+import random
+import re
+import time
+from array import array
+from collections import Counter
+from typing import List, Dict, Iterable, Tuple
+
+import numpy as np
+
+
+_ENGLISH_PATTERN = re.compile(r'[a-z][a-z0-9+#]*')
+_CHINESE_PATTERN = re.compile(r'[一-鿿]+')
+
+STOP_WORDS = frozenset("""
+a an and are as at be by for from has have in is it its of on or our that the this to we will with you your
+""".split())
+
+# 出现在超过该比例文档中的词不参与打分（与 sklearn TfidfVectorizer 的 max_df 含义相同）
+DEFAULT_MAX_DF = 0.5
+
+# 倒排索引之外的新增文档超过该比例时合并进倒排索引
+MERGE_RATIO = 0.1
+MIN_MERGE_DOCS = 1000
+
+
+def tokenize(text: str) -> List[str]:
+    """切词：英文小写单词（去停用词），中文单字 + 相邻双字"""
+    text = text.lower()
+    terms = [word for word in _ENGLISH_PATTERN.findall(text) if word not in STOP_WORDS]
+    for run in _CHINESE_PATTERN.findall(text):
+        terms.extend(run)
+        terms.extend(run[i:i + 2] for i in range(len(run) - 1))
+    return terms
+
+
+class TfidfIndex:
+    """
+    增量 TF-IDF 索引
+
+    - 正排（CSR）：indptr / indices / tf，tf 为 1 + log(词频)
+    - 倒排：已合并部分是按词排序的 NumPy 数组（postings_ptr / postings_docs / postings_tf），
+      之后新增的文档在查询前单独建一份小倒排，新增部分达到 MERGE_RATIO 时整体合并
+    - df、idf 和文档向量长度在新增文档后的第一次查询时按需更新（不需要重新切词）
+    - df 超过 max_df 比例的词（如 data、experience）视为停用词，idf 记为0，
+      既不计入文档向量长度也不参与打分，避免每次查询都扫描几乎覆盖全部文档的倒排列表
+    """
+
+    def __init__(self, max_df: float = DEFAULT_MAX_DF):
+        self.max_df = max_df
+        self.vocabulary: Dict[str, int] = {}
+        self.terms: List[str] = []
+        self.keys: List[str] = []
+
+        self.indptr = array('q', [0])
+        self.indices = array('i')
+        self.tf = array('f')
+
+        self.df = np.zeros(0, dtype=np.int64)
+        self._df_docs = 0
+
+        self._merged_docs = 0
+        self.postings_ptr = np.zeros(1, dtype=np.int64)
+        self.postings_docs = np.zeros(0, dtype=np.int32)
+        self.postings_tf = np.zeros(0, dtype=np.float32)
+        self._tail = None
+
+        self._idf = None
+        self._norms = None
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def _csr(self, first_doc: int = 0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """正排数据（从 first_doc 开始）的 NumPy 视图：(每个非零元所属文档, 词ID, tf)"""
+        indptr = np.frombuffer(self.indptr, dtype=np.int64)
+        start = int(indptr[first_doc])
+        indices = np.frombuffer(self.indices, dtype=np.int32)[start:] if len(self.indices) else np.zeros(0, np.int32)
+        tf = np.frombuffer(self.tf, dtype=np.float32)[start:] if len(self.tf) else np.zeros(0, np.float32)
+        docs = np.repeat(np.arange(first_doc, len(self), dtype=np.int32), np.diff(indptr[first_doc:]))
+        return docs, indices, tf
+
+    # ---------------------------------------------------------------- 写入
+
+    def _vectorize(self, text: str, grow: bool) -> Dict[int, float]:
+        """文本 → {词ID: tf}；grow 为 False 时忽略词表外的词"""
+        vector = {}
+        for term, count in Counter(tokenize(text)).items():
+            term_id = self.vocabulary.get(term)
+            if term_id is None:
+                if not grow:
+                    continue
+                term_id = self.vocabulary[term] = len(self.terms)
+                self.terms.append(term)
+            vector[term_id] = 1.0 + math.log(count)
+        return vector
+
+    def add(self, text: str, key: str = None) -> int:
+        """
+        新增一个文档，返回文档ID
+
+        Args:
+            text: 岗位描述或其他文本
+            key: 文档标识（如岗位链接），默认为文档ID
+        """
+        doc_id = len(self.keys)
+        vector = self._vectorize(text, grow=True)
+        term_ids = sorted(vector)
+        self.indices.extend(term_ids)
+        self.tf.extend(vector[term_id] for term_id in term_ids)
+        self.indptr.append(len(self.indices))
+        self.keys.append(key if key is not None else str(doc_id))
+
+        self._idf = self._norms = self._tail = None
+        if len(self) - self._merged_docs > max(MIN_MERGE_DOCS, MERGE_RATIO * self._merged_docs):
+            self._merge()
+        return doc_id
+
+    def add_jobs(self, jobs: Iterable[Dict]) -> List[int]:
+        """批量新增岗位（使用 job_description，key 为 "公司 | 职位"）"""
+        return [self.add(job.get("job_description", ""), f"{job.get('company', '')} | {job.get('position', '')}")
+                for job in jobs]
+
+    @staticmethod
+    def _invert(docs: np.ndarray, indices: np.ndarray, tf: np.ndarray, n_terms: int):
+        """按词分组（同一词内文档ID保持升序）：返回 (每个词的起止偏移, 文档ID, tf)"""
+        order = np.argsort(indices, kind="stable")
+        ptr = np.zeros(n_terms + 1, dtype=np.int64)
+        np.cumsum(np.bincount(indices, minlength=n_terms), out=ptr[1:])
+        return ptr, docs[order], tf[order]
+
+    def _merge(self):
+        """由正排数据重建倒排数组"""
+        self.postings_ptr, self.postings_docs, self.postings_tf = self._invert(*self._csr(), len(self.terms))
+        self._merged_docs = len(self)
+        if self._norms is not None:
+            self._tail = self._invert(*self._csr(self._merged_docs), len(self.terms))
+
+    # ---------------------------------------------------------------- 查询
+
+    def _refresh(self):
+        """更新 df、idf、文档向量长度和新增文档的倒排"""
+        if self._norms is not None:
+            return
+        _, new_indices, _ = self._csr(self._df_docs)
+        self.df = np.pad(self.df, (0, len(self.terms) - len(self.df)))
+        self.df += np.bincount(new_indices, minlength=len(self.terms))
+        self._df_docs = len(self)
+
+        self._idf = (np.log((1 + len(self)) / (1 + self.df)) + 1).astype(np.float32)
+        self._idf[self.df > self.max_df * len(self)] = 0
+        docs, indices, tf = self._csr()
+        weighted = tf * self._idf[indices]
+        self._norms = np.sqrt(np.bincount(docs, weights=weighted * weighted, minlength=len(self)))
+        self._tail = self._invert(*self._csr(self._merged_docs), len(self.terms))
+
+    def _postings(self, term_id: int) -> Tuple[np.ndarray, np.ndarray]:
+        """某个词的 (文档ID数组, tf数组)：已合并部分 + 新增部分"""
+        parts = []
+        for ptr, docs, tf in [(self.postings_ptr, self.postings_docs, self.postings_tf), self._tail]:
+            if term_id + 1 < len(ptr) and ptr[term_id] < ptr[term_id + 1]:
+                parts.append((docs[ptr[term_id]:ptr[term_id + 1]], tf[ptr[term_id]:ptr[term_id + 1]]))
+        if len(parts) == 1:
+            return parts[0]
+        if not parts:
+            return self.postings_docs[:0], self.postings_tf[:0]
+        return np.concatenate([parts[0][0], parts[1][0]]), np.concatenate([parts[0][1], parts[1][1]])
+
+    def _search(self, vector: Dict[int, float], k: int, exclude: int = None) -> List[Tuple[str, float]]:
+        self._refresh()
+        if not vector or not len(self):
+            return []
+        term_ids = np.fromiter(vector, dtype=np.int64, count=len(vector))
+        query = np.fromiter(vector.values(), dtype=np.float32, count=len(vector)) * self._idf[term_ids]
+        query_norm = np.linalg.norm(query)
+        if query_norm == 0:
+            return []
+        query /= query_norm
+
+        doc_parts, weight_parts = [], []
+        for term_id, q in zip(term_ids.tolist(), query.tolist()):
+            if q == 0:
+                continue
+            docs, tf = self._postings(term_id)
+            doc_parts.append(docs)
+            weight_parts.append(tf * (q * self._idf[term_id]))
+        docs = np.concatenate(doc_parts)
+        scores = np.bincount(docs, weights=np.concatenate(weight_parts), minlength=len(self))
+        np.divide(scores, self._norms, out=scores, where=self._norms > 0)
+        if exclude is not None:
+            scores[exclude] = -1
+
+        k = min(k, len(self))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(self.keys[i], float(scores[i])) for i in top.tolist() if scores[i] > 0]
+
+    def query(self, text: str, k: int = 10) -> List[Tuple[str, float]]:
+        """返回与文本（如简历）余弦相似度最高的k个文档 [(key, 相似度), ...]"""
+        return self._search(self._vectorize(text, grow=False), k)
+
+    def similar_to(self, doc_id: int, k: int = 10) -> List[Tuple[str, float]]:
+        """返回与第 doc_id 个文档最相似的k个其他文档"""
+        start, end = self.indptr[doc_id], self.indptr[doc_id + 1]
+        vector = dict(zip(self.indices[start:end], self.tf[start:end]))
+        return self._search(vector, k, exclude=doc_id)
+
+    # ---------------------------------------------------------------- 持久化
+
+    def save(self, path: str):
+        """保存到 .npz 文件（保存前合并新增部分，加载后无需重建）"""
+        if self._merged_docs < len(self):
+            self._merge()
+        self._refresh()
+        meta = json.dumps({"max_df": self.max_df, "terms": self.terms, "keys": self.keys}, ensure_ascii=False)
+        np.savez(
+            path,
+            meta=np.frombuffer(meta.encode("utf-8"), dtype=np.uint8),
+            df=self.df,
+            indptr=np.frombuffer(self.indptr, dtype=np.int64),
+            indices=np.frombuffer(self.indices, dtype=np.int32) if len(self.indices) else np.zeros(0, np.int32),
+            tf=np.frombuffer(self.tf, dtype=np.float32) if len(self.tf) else np.zeros(0, np.float32),
+            postings_ptr=self.postings_ptr,
+            postings_docs=self.postings_docs,
+            postings_tf=self.postings_tf,
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "TfidfIndex":
+        """从 save() 保存的文件加载"""
+        with np.load(path) as data:
+            meta = json.loads(data["meta"].tobytes().decode("utf-8"))
+            index = cls(max_df=meta["max_df"])
+            index.terms = meta["terms"]
+            index.keys = meta["keys"]
+            index.vocabulary = {term: i for i, term in enumerate(index.terms)}
+            index.df = data["df"]
+            index.indptr = array('q', data["indptr"].tobytes())
+            index.indices = array('i', data["indices"].tobytes())
+            index.tf = array('f', data["tf"].tobytes())
+            index.postings_ptr = data["postings_ptr"]
+            index.postings_docs = data["postings_docs"]
+            index.postings_tf = data["postings_tf"]
+        index._merged_docs = index._df_docs = len(index)
+        return index
+
+
+def build_job_index(jobs: Iterable[Dict]) -> TfidfIndex:
+    """由岗位列表构建索引"""
+    index = TfidfIndex()
+    index.add_jobs(jobs)
+    return index
+
+
+# ======================================================================================
+# 性能测试
+# ======================================================================================
+
+def _generate_descriptions(n: int, seed: int = 42) -> Iterable[str]:
+    """在模拟岗位描述的基础上混入随机词，生成n个不同的描述"""
+    from shanghai_data_jobs_scraper import simulate_job_listings
+
+    rng = random.Random(seed)
+    samples = [job["job_description"] for job in simulate_job_listings()]
+    vocabulary = [f"term{i}" for i in range(20000)] + list("数据仓库建模分析平台治理实时计算")
+    for i in range(n):
+        yield samples[i % len(samples)] + " " + " ".join(rng.choices(vocabulary, k=60))
+
+
+def benchmark_index(n: int = 100_000, queries: int = 200, path: str = None) -> Dict:
+    """测量构建、查询、增量新增和保存/加载的耗时"""
+    import tempfile
+
+    resume_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "resume", "resume_template.md")
+    with open(resume_file, 'r', encoding='utf-8') as f:
+        resume = f.read()
+
+    result = {"documents": n}
+    start = time.perf_counter()
+    index = TfidfIndex()
+    for text in _generate_descriptions(n):
+        index.add(text)
+    result["build_seconds"] = round(time.perf_counter() - start, 2)
+
+    index.query(resume)
+    start = time.perf_counter()
+    for doc_id in range(queries):
+        index.similar_to(doc_id * (n // queries))
+    result["similar_to_ms"] = round((time.perf_counter() - start) / queries * 1000, 2)
+
+    start = time.perf_counter()
+    for _ in range(queries):
+        index.query(resume)
+    result["resume_query_ms"] = round((time.perf_counter() - start) / queries * 1000, 2)
+
+    start = time.perf_counter()
+    for text in _generate_descriptions(100, seed=7):
+        index.add(text)
+    index.query(resume)
+    result["add_100_then_query_ms"] = round((time.perf_counter() - start) * 1000, 1)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = path or os.path.join(tmp, "tfidf_index.npz")
+        start = time.perf_counter()
+        index.save(path)
+        loaded = TfidfIndex.load(path)
+        result["save_load_seconds"] = round(time.perf_counter() - start, 2)
+        assert loaded.query(resume) == index.query(resume)
+
+    return result
+
+
+def main():
+    """主函数：示例和性能测试"""
+    from shanghai_data_jobs_scraper import simulate_job_listings
+
+    jobs = simulate_job_listings()
+    index = build_job_index(jobs)
+    print(f"与「{index.keys[0]}」最相似的岗位:")
+    for key, score in index.similar_to(0, k=3):
+        print(f"  {score:.3f}  {key}")
+
+    print("\n⏱️  TF-IDF 索引性能测试（100,000个岗位）...")
+    result = benchmark_index()
+    print(f"  构建: {result['build_seconds']}s")
+    print(f"  相似岗位查询: {result['similar_to_ms']}ms/次")
+    print(f"  简历查询: {result['resume_query_ms']}ms/次")
+    print(f"  新增100个岗位后查询: {result['add_100_then_query_ms']}ms")
+    print(f"  保存+加载: {result['save_load_seconds']}s")
+
+
+if __name__ == "__main__":
+    main()
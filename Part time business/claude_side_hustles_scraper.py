@@ -5,10 +5,20 @@ Claude副业信息爬虫脚本
 """
 
 import json
-import time
+import os
+import sys
 from datetime import datetime
 from typing import List, Dict
 
+# 默认输出目录：脚本所在目录
+OUTPUT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# 共用的报告渲染模块 report_renderer 位于面试准备目录
+sys.path.append(os.path.join(OUTPUT_DIR, "..", "Foreign company job opportunities", "Interview_Preparation"))
+from report_renderer import Report
+from stage_metrics import instrumented_run, stage
+
+
 def search_claude_side_hustles() -> List[Dict]:
     """
     搜索Claude副业相关信息
@@ -539,69 +549,86 @@ def save_results(data: Dict, filename: str = "claude_side_hustles_report.json"):
     print(f"\n✅ 报告已保存到: {filename}")
 
 
-def print_report(side_hustles: List[Dict], action_plan: List[str], tips: List[str]):
-    """打印格式化的报告"""
-    print("\n" + "="*80)
-    print("🤖 Claude AI 副业机会分析报告")
-    print("="*80)
-    print(f"生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+def build_report(side_hustles: List[Dict], action_plan: List[str], tips: List[str]) -> Report:
+    """构建格式化的报告（可渲染为 text / Markdown / HTML）"""
+    report = Report()
+    report.blank().rule("=", 80)
+    report.heading("🤖 Claude AI 副业机会分析报告", 1)
+    report.rule("=", 80)
+    report.text(f"生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}").blank()
 
     for category_data in side_hustles:
-        print(f"\n📂 【{category_data['category']}】")
-        print("-" * 80)
+        report.blank().heading(f"📂 【{category_data['category']}】", 2)
+        report.rule("-", 80)
 
         for idx, opp in enumerate(category_data['opportunities'], 1):
-            print(f"\n  {idx}. {opp['name']}")
-            print(f"     描述: {opp['description']}")
-            print(f"     所需技能: {', '.join(opp['skills_needed'])}")
-            print(f"     收入潜力: {opp['potential_income']}")
-            print(f"     推荐平台: {', '.join(opp['platforms'])}")
-
-    print("\n\n" + "="*80)
-    print("📋 行动计划")
-    print("="*80)
+            report.blank().heading(f"  {idx}. {opp['name']}", 3)
+            report.text(f"     描述: {opp['description']}")
+            report.text(f"     所需技能: {', '.join(opp['skills_needed'])}")
+            report.text(f"     收入潜力: {opp['potential_income']}")
+            report.text(f"     推荐平台: {', '.join(opp['platforms'])}")
+
+    report.blank(2).rule("=", 80)
+    report.heading("📋 行动计划", 2)
+    report.rule("=", 80)
     for step in action_plan:
-        print(f"  {step}")
+        report.text(f"  {step}")
 
-    print("\n\n" + "="*80)
-    print("💡 重要提示")
-    print("="*80)
+    report.blank(2).rule("=", 80)
+    report.heading("💡 重要提示", 2)
+    report.rule("=", 80)
     for tip in tips:
-        print(f"  {tip}")
+        report.text(f"  {tip}")
 
-    print("\n\n" + "="*80)
-    print("📊 总结")
-    print("="*80)
+    report.blank(2).rule("=", 80)
+    report.heading("📊 总结", 2)
+    report.rule("=", 80)
     total_opportunities = sum(len(cat['opportunities']) for cat in side_hustles)
-    print(f"  • 共发现 {len(side_hustles)} 个副业大类")
-    print(f"  • 共计 {total_opportunities} 个具体副业机会")
-    print(f"  • 收入范围: $200 - $10,000/月（取决于技能和投入时间）")
-    print(f"  • 建议: 从1-2个方向开始，逐步扩展\n")
-
-
-def main():
-    """主函数"""
-    print("🚀 开始搜索Claude副业机会...")
-    time.sleep(1)
-
-    # 获取副业数据
-    side_hustles = search_claude_side_hustles()
-    action_plan = generate_action_plan()
-    tips = get_important_tips()
-
-    # 打印报告
-    print_report(side_hustles, action_plan, tips)
-
-    # 保存结果
-    report_data = {
-        "generated_at": datetime.now().isoformat(),
-        "side_hustles": side_hustles,
-        "action_plan": action_plan,
-        "important_tips": tips
-    }
-    save_results(report_data, "/Users/boom/Desktop/my_bussiness/test/claude_side_hustles_report.json")
+    report.item(f"共发现 {len(side_hustles)} 个副业大类")
+    report.item(f"共计 {total_opportunities} 个具体副业机会")
+    report.item("收入范围: $200 - $10,000/月（取决于技能和投入时间）")
+    report.item("建议: 从1-2个方向开始，逐步扩展").blank()
+    return report
+
+
+def print_report(side_hustles: List[Dict], action_plan: List[str], tips: List[str]):
+    """打印格式化的报告"""
+    build_report(side_hustles, action_plan, tips).print()
+
+
+def main(output_dir: str = OUTPUT_DIR, metrics_file: str = None):
+    """
+    主函数
+
+    Args:
+        output_dir: claude_side_hustles_report.json 的输出目录
+        metrics_file: 分阶段耗时/内存指标的JSON文件，默认不记录
+    """
+    with instrumented_run("side-hustles", metrics_file):
+        print("🚀 开始搜索Claude副业机会...")
+
+        # 获取副业数据
+        with stage("search"):
+            side_hustles = search_claude_side_hustles()
+            action_plan = generate_action_plan()
+            tips = get_important_tips()
+
+        # 打印报告
+        with stage("print_report"):
+            print_report(side_hustles, action_plan, tips)
+
+        # 保存结果
+        report_data = {
+            "generated_at": datetime.now().isoformat(),
+            "side_hustles": side_hustles,
+            "action_plan": action_plan,
+            "important_tips": tips
+        }
+        os.makedirs(output_dir, exist_ok=True)
+        with stage("save"):
+            save_results(report_data, os.path.join(output_dir, "claude_side_hustles_report.json"))
 
-    print("\n✨ 分析完成！祝你副业成功！")
+        print("\n✨ 分析完成！祝你副业成功！")
 
 
 if __name__ == "__main__":